@@ -1,31 +1,96 @@
-from Vectorizer.v1 import vectorizer
+from vectorizer.v1 import vectorizer
 
 
-def momentum_based_sentiment(sentiment_vectors, alpha=0.5, beta=0.5):
+def momentum_based_sentiment(sentiment_vectors, alpha=0.5, beta=0.5, backend=None):
     """
     Calculates sentiment using a momentum-based approach.
 
     :param sentiment_vectors: List of sentiment vectors representing past sentiment.
     :param alpha: Immediate weight for the current sentiment (short-term impact).
     :param beta: Momentum factor for the previous sentiment (long-term influence).
+    :param backend: Vectorizer backend that produced the vectors. Defaults to the
+                    module-level vectorizer backend.
     :return: Adjusted sentiment score considering momentum.
     """
-    if not sentiment_vectors:
-        return 0  # Default value if no input
+    v2s = (backend or vectorizer).v2s
 
-    prev_score = vectorizer.v2s(sentiment_vectors[0])  # Start with the first sentiment score
-    momentum = 0  # Initialize momentum
+    scorer = MomentumScorer(alpha, beta)
+    for vector in sentiment_vectors:
+        scorer.update(v2s(vector))
 
-    for vector in sentiment_vectors[1:]:
-        current_score = vectorizer.v2s(vector)
-        sentiment_change = current_score - prev_score  # Track sentiment shift
+    return scorer.score
 
-        # Update momentum based on sentiment shift direction
-        momentum = beta * momentum + (1 - beta) * sentiment_change
 
-        # Adjust sentiment considering momentum
-        adjusted_sentiment = alpha * current_score + (1 - alpha) * (prev_score + momentum)
+class MomentumScorer:
+    """
+    Incremental form of momentum_based_sentiment.
+
+    Holds the previous score and momentum so that scores can be fed in one at
+    a time, each in O(1). After feeding the v2s of every vector, score equals
+    momentum_based_sentiment of the same vectors. The state is a plain dict
+    (see to_dict), so it can be persisted between requests and resumed.
+    """
+
+    def __init__(self, alpha=0.5, beta=0.5, prev_score=None, momentum=0, count=0):
+        """
+        :param alpha: Immediate weight for the current sentiment (short-term impact).
+        :param beta: Momentum factor for the previous sentiment (long-term influence).
+        """
+        self.alpha = alpha
+        self.beta = beta
+        self.prev_score = prev_score
+        self.momentum = momentum
+        self.count = count
+
+    @property
+    def score(self):
+        if self.count == 0:
+            return 0  # Default value if no input
+        return self.prev_score
+
+    def update(self, current_score):
+        """
+        Feeds the next sentiment score and returns the adjusted score.
+        """
+        if self.count == 0:
+            self.prev_score = current_score  # Start with the first sentiment score
+        else:
+            sentiment_change = current_score - self.prev_score  # Track sentiment shift
+
+            # Update momentum based on sentiment shift direction
+            self.momentum = self.beta * self.momentum + (1 - self.beta) * sentiment_change
+
+            # Adjust sentiment considering momentum
+            self.prev_score = (self.alpha * current_score
+                               + (1 - self.alpha) * (self.prev_score + self.momentum))
+
+        self.count += 1
+        return self.prev_score
 
-        prev_score = adjusted_sentiment  # Update previous score
+    def to_dict(self):
+        return {"alpha": self.alpha, "beta": self.beta, "prev_score": self.prev_score,
+                "momentum": self.momentum, "count": self.count}
 
-    return prev_score
+    @classmethod
+    def from_dict(cls, state):
+        return cls(state["alpha"], state["beta"], state["prev_score"],
+                   state["momentum"], state["count"])
+
+
+def momentum_based_sentiment_batch(scores, offsets, alpha=0.5, beta=0.5, backend=None):
+    """
+    Applies momentum_based_sentiment to many messages at once.
+
+    The scores of all messages are stored back to back; message k owns
+    scores[offsets[k]:offsets[k + 1]]. The reduction runs in the vectorizer
+    backend in a single call.
+
+    :param scores: Flat array of clause scores (v2s of each sentiment vector).
+    :param offsets: Array of len(messages) + 1 segment boundaries into scores.
+    :param alpha: Immediate weight for the current sentiment (short-term impact).
+    :param beta: Momentum factor for the previous sentiment (long-term influence).
+    :param backend: Vectorizer backend to run the reduction on. Defaults to the
+                    module-level vectorizer backend.
+    :return: NumPy array with one adjusted sentiment score per message.
+    """
+    return (backend or vectorizer).momentum_batch(scores, offsets, alpha, beta)
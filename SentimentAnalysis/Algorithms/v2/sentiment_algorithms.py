@@ -0,0 +1,179 @@
+import threading
+import weakref
+from itertools import repeat
+
+import numpy as np
+
+from SentimentAnalysis.lexicon import (POSITIVE, NEGATIVE, NEGATION, QUANTIFIER,
+                                       DIMINISHER, CONJUNCTION)
+from vectorizer.v1 import vectorizer
+
+# Token table of every lexicon index in use, built on first use
+_tables = weakref.WeakKeyDictionary()
+_lock = threading.Lock()
+
+
+class TokenTable:
+    """
+    Dense integer IDs of the tokens of a lexicon index, with the flags and
+    weights of every ID in columnar arrays. ID 0 stands for every token that
+    belongs to no lexicon, so a tokenized text is scored from its ID array
+    alone.
+    """
+
+    def __init__(self, index):
+        """
+        :param index: LexiconIndex or OverlayIndex.
+        """
+        entries = sorted(index.items())
+        self.ids = {token: i for i, (token, _) in enumerate(entries, 1)}
+
+        codes = [(0, 1, 1)] + [code for _, code in entries]
+        self.flags = np.array([code[0] for code in codes], dtype=np.int32)
+        self.quantifiers = np.array([code[1] for code in codes], dtype=np.float64)
+        self.diminishers = np.array([code[2] for code in codes], dtype=np.float64)
+
+        # Addresses of the columns, for the native v2 vectorizer
+        self.pointers = (self.flags.ctypes.data, self.quantifiers.ctypes.data,
+                         self.diminishers.ctypes.data)
+
+    def __len__(self):
+        return len(self.flags)
+
+    def encode(self, tokens):
+        """
+        Returns the int32 ID array of a list of tokens.
+        """
+        return np.fromiter(map(self.ids.get, tokens, repeat(0)), dtype=np.int32,
+                           count=len(tokens))
+
+
+def token_table(index):
+    """
+    Returns the shared TokenTable of a lexicon index.
+    """
+    with _lock:
+        table = _tables.get(index)
+    if table is None:
+        table = TokenTable(index)
+        with _lock:
+            table = _tables.setdefault(index, table)
+    return table
+
+
+def adjust_for_negations(base_sentiments, negation_counts):
+    """
+    Array form of the v1 negation adjustment: the polarity of every clause
+    given its base sentiment and number of negations.
+    """
+    odd = negation_counts % 2 == 1
+    return np.where(negation_counts == 0, 1,
+                    np.where(odd & (base_sentiments > 0), -1,
+                             np.where(odd & (base_sentiments < 0), 0,
+                                      np.where(odd & (base_sentiments == 0), -1, 1))))
+
+
+def clause_features(table, token_ids, sentence_offsets):
+    """
+    Computes the (magnitude, polarity, intensity) features of every clause of
+    every sentence with array operations, as SentimentAnalyzerV1 does clause
+    by clause. A sentence has one clause more than it has conjunctions.
+
+    :param table: TokenTable the token IDs were encoded with.
+    :param token_ids: int32 array of the token IDs of every sentence, back to back.
+    :param sentence_offsets: Array of n_sentences + 1 boundaries into token_ids,
+                             starting at 0.
+    :return: (magnitudes, polarities, intensities, clause_offsets), where
+             sentence k owns clauses clause_offsets[k] .. clause_offsets[k + 1] - 1.
+    """
+    token_ids = np.asarray(token_ids)
+    sentence_offsets = np.asarray(sentence_offsets, dtype=np.int64)
+    n_tokens = len(token_ids)
+    n_sentences = len(sentence_offsets) - 1
+
+    token_ids = np.where((token_ids > 0) & (token_ids < len(table)), token_ids, 0)
+    flags = table.flags[token_ids]
+    sentences = np.repeat(np.arange(n_sentences), np.diff(sentence_offsets))
+
+    # A clause starts at every sentence start and after every conjunction
+    conjunctions = np.flatnonzero(flags & CONJUNCTION)
+    starts = np.concatenate((sentence_offsets[:-1], conjunctions + 1))
+    owners = np.concatenate((np.arange(n_sentences), sentences[conjunctions]))
+    order = np.lexsort((starts, owners))
+    starts, owners = starts[order], owners[order]
+
+    clause_offsets = np.zeros(n_sentences + 1, dtype=np.int64)
+    np.cumsum(np.bincount(owners, minlength=n_sentences), out=clause_offsets[1:])
+    ends = np.empty_like(starts)
+    ends[:-1] = starts[1:]
+    ends[clause_offsets[1:] - 1] = sentence_offsets[1:]
+
+    def clause_sums(mask):
+        totals = np.zeros(n_tokens + 1, dtype=np.int64)
+        np.cumsum(mask, out=totals[1:])
+        return totals[ends] - totals[starts]
+
+    positive_counts = clause_sums(flags & POSITIVE != 0)
+    negative_counts = clause_sums(flags & NEGATIVE != 0)
+    negation_counts = clause_sums(flags & NEGATION != 0)
+
+    # Modifiers are reversed by a negation right before them in their clause
+    negated = flags & NEGATION != 0
+    previous_negated = np.zeros(n_tokens, dtype=bool)
+    previous_negated[1:] = negated[:-1]
+    previous_negated[starts[starts < n_tokens]] = False
+
+    quantifiers = table.quantifiers[token_ids]
+    quantifiers = np.where(flags & QUANTIFIER == 0, 1.0,
+                           np.where(previous_negated, 1 - (quantifiers - 1), quantifiers))
+    diminishers = table.diminishers[token_ids]
+    diminishers = np.where(flags & DIMINISHER == 0, 1.0,
+                           np.where(previous_negated, 1 + (1 - diminishers), diminishers))
+
+    base_sentiments = positive_counts - negative_counts
+    intensities = (_clause_products(quantifiers, starts, ends)
+                   * _clause_products(diminishers, starts, ends))
+
+    return (base_sentiments.astype(np.intc),
+            adjust_for_negations(base_sentiments, negation_counts).astype(np.intc),
+            intensities, clause_offsets)
+
+
+def score_documents(table, token_ids, sentence_offsets, document_offsets,
+                    alpha=0.5, beta=0.5, sentence_scores=False, backend=None):
+    """
+    NumPy form of vectorizer.v2 DocumentVectorizer.score_documents, used when
+    the compiled library is not available: clause features are computed with
+    clause_features and reduced with the batch functions of a v1 vectorizer
+    backend.
+
+    :param backend: v1 vectorizer backend name or object.
+    """
+    backend = vectorizer.get_backend(backend)
+    magnitudes, polarities, intensities, clause_offsets = clause_features(
+        table, token_ids, sentence_offsets)
+
+    magnitudes, polarities, intensities = backend.combine_reduce_batch(
+        magnitudes, polarities, intensities, clause_offsets)
+    per_sentence = backend.v2s_batch(magnitudes, polarities, intensities)
+    scores = backend.momentum_batch(per_sentence, np.asarray(document_offsets, dtype=np.int64),
+                                    alpha, beta)
+
+    if sentence_scores:
+        return scores, per_sentence
+    return scores
+
+
+# ---- HELPER FUNCTIONS ----
+
+def _clause_products(factors, starts, ends):
+    """
+    Multiplies the factors of every clause from left to right, so products
+    match a sequential loop exactly. Empty clauses get 1.
+    """
+    if not len(starts):
+        return np.ones(0)
+
+    # Padded so that an empty last clause still has a valid start index
+    products = np.multiply.reduceat(np.append(factors, 1.0), starts)
+    return np.where(ends > starts, products, 1.0)
@@ -0,0 +1,67 @@
+import argparse
+import os
+import sys
+
+from SentimentAnalysis.CorpusScorer.offline import score_offline
+from SentimentAnalysis.CorpusScorer.scorer import (DEFAULT_CSV_COLUMN, DEFAULT_JSON_FIELD,
+                                                   score_file)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m SentimentAnalysis.CorpusScorer",
+        description="Scores a CSV, JSONL or plain text corpus on every core.")
+    parser.add_argument("input", help="input file, or - for stdin")
+    parser.add_argument("-o", "--output", default="-", help="output file (default: stdout)")
+    parser.add_argument("--input-format", choices=("csv", "jsonl", "text"),
+                        help="default: detected from the file extension")
+    parser.add_argument("--output-format", choices=("text", "csv", "jsonl"), default="text")
+    parser.add_argument("--column", default=DEFAULT_CSV_COLUMN, help="CSV column to score")
+    parser.add_argument("--field", default=DEFAULT_JSON_FIELD, help="JSONL field to score")
+    parser.add_argument("--wordset", default="standard", choices=("standard", "extended", "custom"))
+    parser.add_argument("--positive-words-file")
+    parser.add_argument("--negative-words-file")
+    parser.add_argument("--lexicon-file")
+    parser.add_argument("--base-wordset", choices=("standard", "extended"),
+                        help="store the custom wordset as an overlay on this wordset")
+    parser.add_argument("--weights-file", help="trained quantifier/diminisher weights")
+    parser.add_argument("--backend", help="vectorizer backend")
+    parser.add_argument("-j", "--processes", type=int, help="default: CPU count")
+    parser.add_argument("--chunk-size", type=int, default=1000)
+
+    offline = parser.add_argument_group(
+        "offline mode", "memory-map a newline-delimited text input and write the scores "
+                        "into a preallocated float64 .npy (or raw float64) output, "
+                        "checkpointing after every chunk")
+    offline.add_argument("--offline", action="store_true")
+    offline.add_argument("--resume", action="store_true",
+                         help="continue from the checkpoint of a crashed run")
+    offline.add_argument("--start-offset", type=int, metavar="BYTES",
+                         help="score from this byte offset, the start of a line")
+    args = parser.parse_args(argv)
+
+    analyzer_options = dict(wordset=args.wordset,
+                            positive_words_file=args.positive_words_file,
+                            negative_words_file=args.negative_words_file,
+                            lexicon_file=args.lexicon_file, weights_file=args.weights_file,
+                            base_wordset=args.base_wordset, backend=args.backend)
+
+    if args.offline:
+        if args.input == "-" or args.output == "-":
+            parser.error("--offline needs an input file and an output file (-o)")
+        stats = score_offline(args.input, args.output, chunk_size=args.chunk_size,
+                              processes=args.processes or os.cpu_count() or 1,
+                              resume=args.resume, start_offset=args.start_offset,
+                              **analyzer_options)
+    elif args.resume or args.start_offset is not None:
+        parser.error("--resume and --start-offset need --offline")
+    else:
+        stats = score_file(args.input, args.output, args.input_format, args.output_format,
+                           args.column, args.field, processes=args.processes,
+                           chunk_size=args.chunk_size, **analyzer_options)
+
+    print(stats, file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,212 @@
+import json
+import mmap
+import os
+import time
+from collections import deque
+
+import numpy as np
+
+from SentimentAnalysis.CorpusScorer.scorer import CorpusStats, score_chunks
+
+# Bytes of input scanned at a time when counting lines
+_SCAN_WINDOW = 1 << 24
+
+# Suffix of the checkpoint written next to the output
+CHECKPOINT_SUFFIX = ".checkpoint"
+
+
+def count_lines(buffer, start=0, end=None):
+    """
+    Returns the number of newline-delimited lines in buffer[start:end]. A
+    last line without a trailing newline counts as a line. The buffer is
+    scanned in fixed windows, so memory stays constant.
+    """
+    end = len(buffer) if end is None else end
+    lines = 0
+    for window in range(start, end, _SCAN_WINDOW):
+        lines += buffer[window:min(window + _SCAN_WINDOW, end)].count(b"\n")
+    if end > start and buffer[end - 1:end] != b"\n":
+        lines += 1
+    return lines
+
+
+def iter_chunks(buffer, start, chunk_size):
+    """
+    Yields the lines of buffer from byte offset start, decoded and without
+    their line ending, as (messages, end offset) chunks of at most
+    chunk_size messages. Only one line is copied out of the buffer at a time.
+    """
+    find = buffer.find
+    end = len(buffer)
+    position = start
+    messages = []
+
+    while position < end:
+        newline = find(b"\n", position)
+        stop = end if newline < 0 else newline
+        messages.append(buffer[position:stop].decode("utf-8", "replace").rstrip("\r"))
+        position = stop + 1
+
+        if len(messages) == chunk_size:
+            yield messages, min(position, end)
+            messages = []
+
+    if messages:
+        yield messages, end
+
+
+def open_scores(path, count, resume=False):
+    """
+    Opens the preallocated float64 output of count scores: a .npy file, or
+    a raw memory-mapped array for any other extension. Unscored entries of a
+    new output are NaN. An existing output is reopened when resuming, unless
+    it is empty: a run killed before it preallocated the output left nothing
+    to keep, so it is created anew.
+    """
+    npy = path.endswith(".npy")
+    if resume and os.path.exists(path) and os.path.getsize(path):
+        scores = (np.lib.format.open_memmap(path, mode="r+") if npy
+                  else np.memmap(path, dtype=np.float64, mode="r+"))
+        if scores.dtype != np.float64 or scores.shape != (count,):
+            raise ValueError(f"{path} does not hold {count} float64 scores")
+        return scores
+
+    if npy:
+        scores = np.lib.format.open_memmap(path, mode="w+", dtype=np.float64, shape=(count,))
+    elif count:
+        scores = np.memmap(path, dtype=np.float64, mode="w+", shape=(count,))
+    else:
+        # An empty file cannot be memory-mapped
+        open(path, "wb").close()
+        return np.empty(0, dtype=np.float64)
+
+    scores[:] = np.nan
+    return scores
+
+
+def read_checkpoint(path, input_stat):
+    """
+    Returns the (byte offset, line index) saved in a checkpoint file, or None
+    if there is none.
+
+    :raises ValueError: If the checkpoint was written for a different input.
+    """
+    try:
+        with open(path, "r") as file:
+            checkpoint = json.load(file)
+    except FileNotFoundError:
+        return None
+    except (IOError, ValueError):
+        raise ValueError(f"Not a checkpoint file: {path}")
+
+    written_for = (checkpoint.get("input_size"), checkpoint.get("input_mtime_ns"))
+    if written_for != (input_stat.st_size, input_stat.st_mtime_ns):
+        raise ValueError(f"Checkpoint {path} was written for a different input")
+    return checkpoint["offset"], checkpoint["index"]
+
+
+def write_checkpoint(path, input_stat, offset, index):
+    """
+    Atomically records that every line before byte offset (index lines) is
+    scored and flushed.
+    """
+    temporary = path + ".tmp"
+    with open(temporary, "w") as file:
+        json.dump({"input_size": input_stat.st_size, "input_mtime_ns": input_stat.st_mtime_ns,
+                   "offset": offset, "index": index}, file)
+    os.replace(temporary, path)
+
+
+def score_offline(input_path, output_path, chunk_size=10000, processes=1, resume=False,
+                  start_offset=None, max_pending=None, **analyzer_options):
+    """
+    Scores a newline-delimited text file into a preallocated float64 array
+    on disk, one score per line, in input order.
+
+    The input is memory-mapped and read one line at a time, and scores are
+    written straight into the memory-mapped output, so memory stays
+    constant however large the input is. After every chunk the output is
+    flushed and a checkpoint (output_path + ".checkpoint") records the byte
+    offset reached, so a crashed run can be resumed.
+
+    :param output_path: .npy file, or a raw float64 file for any other
+                        extension.
+    :param processes: Number of worker processes. With 1, lines are scored
+                      in the calling process.
+    :param resume: Continue from the checkpoint of a previous run, if any.
+    :param start_offset: Byte offset of the first line to score, which must
+                         be at the start of a line; lines before it keep
+                         their scores. Overrides the checkpoint.
+    :param max_pending: Chunks in flight at once with several processes
+                        (default: two per process).
+    :param analyzer_options: Passed to SentimentAnalyzerV1.
+    :return: CorpusStats of the lines scored by this run.
+    """
+    start = time.perf_counter()
+    checkpoint_path = output_path + CHECKPOINT_SUFFIX
+
+    with open(input_path, "rb") as file:
+        input_stat = os.fstat(file.fileno())
+        buffer = (mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+                  if input_stat.st_size else b"")
+
+    try:
+        if hasattr(buffer, "madvise") and hasattr(mmap, "MADV_SEQUENTIAL"):
+            buffer.madvise(mmap.MADV_SEQUENTIAL)
+
+        offset, index = 0, 0
+        if start_offset is not None:
+            at_line_start = start_offset == 0 or buffer[start_offset - 1:start_offset] == b"\n"
+            if not 0 <= start_offset <= len(buffer) or not at_line_start:
+                raise ValueError(f"Offset {start_offset} is not at the start of a line")
+            offset, index = start_offset, count_lines(buffer, 0, start_offset)
+        elif resume:
+            checkpoint = read_checkpoint(checkpoint_path, input_stat)
+            if checkpoint is not None:
+                if not os.path.exists(output_path):
+                    raise ValueError(f"Cannot resume: {output_path} is missing")
+                # An empty output holds no scores: start from offset 0
+                if os.path.getsize(output_path):
+                    offset, index = checkpoint
+
+        scores = open_scores(output_path, count_lines(buffer),
+                             resume or start_offset is not None)
+        scored = 0
+        for offset, count in _score_chunks(iter_chunks(buffer, offset, chunk_size), scores,
+                                           index, processes, max_pending, analyzer_options):
+            index += count
+            scored += count
+            if isinstance(scores, np.memmap):
+                scores.flush()
+            write_checkpoint(checkpoint_path, input_stat, offset, index)
+
+        if not scored:
+            write_checkpoint(checkpoint_path, input_stat, offset, index)
+        del scores
+    finally:
+        if isinstance(buffer, mmap.mmap):
+            buffer.close()
+
+    return CorpusStats(scored, time.perf_counter() - start)
+
+
+# ---- HELPER FUNCTIONS ----
+
+def _score_chunks(chunks, scores, index, processes, max_pending, analyzer_options):
+    """
+    Scores every chunk into scores from line index on, in order, and yields
+    the (end offset, message count) of every chunk once it is stored.
+    """
+    # End offsets of the chunks handed to score_chunks and not stored yet
+    ends = deque()
+
+    def messages_of(chunks):
+        for messages, end in chunks:
+            ends.append(end)
+            yield messages
+
+    for messages, chunk_scores in score_chunks(messages_of(chunks), processes, max_pending,
+                                               analyzer_options):
+        scores[index:index + len(messages)] = chunk_scores
+        index += len(messages)
+        yield ends.popleft(), len(messages)
@@ -0,0 +1,193 @@
+import csv
+import json
+import os
+import sys
+import time
+from itertools import islice
+
+from SentimentAnalysis.parallel import imap_bounded
+from SentimentAnalysis.v1.analyzer import SentimentAnalyzerV1
+
+# Input formats by file extension; anything else is read as plain text
+FORMATS = {".csv": "csv", ".jsonl": "jsonl", ".ndjson": "jsonl", ".txt": "text"}
+
+DEFAULT_CSV_COLUMN = "review"
+DEFAULT_JSON_FIELD = "text"
+
+# Analyzer of the current worker process, built once by init_worker
+_worker_analyzer = None
+
+
+def detect_format(path):
+    return FORMATS.get(os.path.splitext(path)[1].lower(), "text")
+
+
+def _open_input(path):
+    if path == "-":
+        return sys.stdin
+    return open(path, "r", encoding="utf-8", newline="")
+
+
+def read_messages(path, fmt=None, column=DEFAULT_CSV_COLUMN, field=DEFAULT_JSON_FIELD):
+    """
+    Streams messages from a CSV, JSONL or plain text file ("-" for stdin),
+    one message at a time. Cells missing from short CSV rows and null JSONL
+    fields are read as empty messages, so every row still gets a score.
+
+    :param fmt: "csv", "jsonl" or "text". Detected from the extension if None.
+    :param column: CSV column holding the message.
+    :param field: JSONL field holding the message.
+    """
+    fmt = fmt or detect_format(path)
+    if fmt not in ("csv", "jsonl", "text"):
+        raise ValueError(f"Invalid format: {fmt}. Choose from csv, jsonl or text")
+
+    file = _open_input(path)
+    try:
+        if fmt == "csv":
+            reader = csv.DictReader(file, restval="")
+            if reader.fieldnames is not None and column not in reader.fieldnames:
+                raise ValueError(f"Column {column!r} not found in {path}")
+            for row in reader:
+                yield row[column]
+        elif fmt == "jsonl":
+            for line in file:
+                if line.strip():
+                    message = json.loads(line)[field]
+                    yield "" if message is None else message
+        else:
+            for line in file:
+                yield line.rstrip("\r\n")
+    finally:
+        if file is not sys.stdin:
+            file.close()
+
+
+def chunked(iterable, chunk_size):
+    """
+    Splits an iterable into lists of at most chunk_size items.
+    """
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def init_worker(analyzer_options):
+    """
+    Process pool initializer: loads the lexicon and vectorizer library once
+    per worker process.
+    """
+    global _worker_analyzer
+    _worker_analyzer = SentimentAnalyzerV1(**analyzer_options)
+
+
+def score_chunk(chunk):
+    """
+    Scores a list of messages with the analyzer of the current worker process.
+    """
+    return _worker_analyzer.evaluate_many(chunk).tolist()
+
+
+def score_corpus(messages, processes=None, chunk_size=1000, max_pending=None,
+                 **analyzer_options):
+    """
+    Scores a stream of messages on a pool of worker processes and yields the
+    scores in input order.
+
+    Messages are read in chunks of chunk_size and at most max_pending chunks
+    (default: two per process) are in flight at once, so memory stays bounded
+    however long the input is.
+
+    :param messages: Iterable of messages.
+    :param processes: Number of worker processes (default: CPU count). With 1,
+                      messages are scored in the calling process.
+    :param analyzer_options: Passed to SentimentAnalyzerV1 in every worker.
+    """
+    processes = processes or os.cpu_count() or 1
+    for _, scores in score_chunks(chunked(messages, chunk_size), processes, max_pending,
+                                  analyzer_options):
+        yield from scores
+
+
+def score_chunks(chunks, processes, max_pending, analyzer_options):
+    """
+    Scores an iterable of message lists and yields the (chunk, scores) pairs
+    in input order: in the calling process with processes=1, otherwise on a
+    pool with at most max_pending chunks in flight (see imap_bounded).
+    """
+    # Built here first, so that invalid options raise in the calling process
+    # instead of failing init_worker in workers the pool restarts forever
+    analyzer = SentimentAnalyzerV1(**analyzer_options)
+
+    if processes == 1:
+        for chunk in chunks:
+            yield chunk, analyzer.evaluate_many(chunk).tolist()
+        return
+
+    yield from imap_bounded(score_chunk, chunks, processes, max_pending,
+                            initializer=init_worker, initargs=(analyzer_options,))
+
+
+class CorpusStats:
+    """
+    Throughput of a corpus scoring run.
+    """
+
+    def __init__(self, messages, seconds):
+        self.messages = messages
+        self.seconds = seconds
+
+    @property
+    def messages_per_second(self):
+        return self.messages / self.seconds if self.seconds else 0.0
+
+    def __str__(self):
+        return (f"Scored {self.messages:,} messages in {self.seconds:.2f}s "
+                f"({self.messages_per_second:,.0f} messages/s)")
+
+
+def write_scores(scores, output, fmt="text"):
+    """
+    Writes scores to an open text file as they arrive and returns how many
+    were written.
+
+    :param fmt: "text" (one score per line), "csv" (index,score) or "jsonl".
+    """
+    count = 0
+    if fmt == "csv":
+        output.write("index,score\n")
+
+    for count, score in enumerate(scores, 1):
+        if fmt == "csv":
+            output.write(f"{count - 1},{score!r}\n")
+        elif fmt == "jsonl":
+            output.write(json.dumps({"index": count - 1, "score": score}) + "\n")
+        else:
+            output.write(f"{score!r}\n")
+
+    return count
+
+
+def score_file(input_path, output_path="-", input_format=None, output_format="text",
+               column=DEFAULT_CSV_COLUMN, field=DEFAULT_JSON_FIELD, **options):
+    """
+    Scores every message of an input file and streams the scores to
+    output_path ("-" for stdout).
+
+    :param options: Passed to score_corpus.
+    :return: CorpusStats of the run.
+    """
+    start = time.perf_counter()
+    messages = read_messages(input_path, input_format, column, field)
+
+    output = sys.stdout if output_path == "-" else open(output_path, "w", encoding="utf-8")
+    try:
+        count = write_scores(score_corpus(messages, **options), output, output_format)
+    finally:
+        if output is not sys.stdout:
+            output.close()
+
+    return CorpusStats(count, time.perf_counter() - start)
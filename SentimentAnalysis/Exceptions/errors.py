@@ -34,4 +34,10 @@ class ModelNotSupportedError(Exception):
             f"Please upgrade your model to {self._models[index:]}."
         )
 
-        super().__init__(message)
\ No newline at end of file
+        super().__init__(message)
+
+class ServiceOverloadedError(Exception):
+    """Raised when the sentiment service has too many pending requests."""
+    def __init__(self, max_pending):
+        self.max_pending = max_pending
+        super().__init__(f"Too many pending requests (limit: {max_pending}). Retry later.")
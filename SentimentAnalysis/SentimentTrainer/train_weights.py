@@ -1,71 +1,172 @@
-import pandas as pd
-from collections import defaultdict
+import argparse
+import json
+
 import numpy as np
-from scipy.stats import ttest_ind
 
-# Load IMDb dataset
-df = pd.read_csv("IMDB Dataset.csv")
+# The trainer's dependencies are optional for the rest of the package
+try:
+    import pandas as pd
+    from scipy.stats import ttest_ind_from_stats
+except ImportError as e:
+    raise ImportError(f"The weight trainer needs pandas and scipy; install them with "
+                      f"pip install -r requirements-trainer.txt ({e})") from e
+
+from SentimentAnalysis.model import SentimentAnalyzerModel
+from SentimentAnalysis.parallel import imap_bounded
+from SentimentAnalysis.tokenizer import GUARD_PHRASES, PhraseMatcher, canonical_phrase, tokenize
 
-# Convert sentiment labels to numerical values
-df['sentiment'] = df['sentiment'].map({'positive': 1, 'negative': 0})
+# Label column values mapped to numerical sentiment
+LABELS = {'positive': 1, 'negative': 0}
 
 # Define quantifiers and diminishers
-quantifiers = [
-    "really", "at-all", "absolutely", "totally", "very", "entirely", "quite",
-    "extremely", "highly", "definitely", "too", "completely", "a lot", "more", "much"
-]
+quantifiers = [canonical_phrase(term) for term in SentimentAnalyzerModel.QUANTIFIERS]
+diminishers = [canonical_phrase(term) for term in SentimentAnalyzerModel.DIMINISHERS]
+
+
+def iter_dataset(path, chunksize=10000, text_column='review', label_column='sentiment'):
+    """
+    Streams an IMDB-style CSV in chunks of (reviews, labels) lists, mapping the
+    labels to 1 (positive) and 0 (negative). Rows with other labels are skipped
+    and missing reviews are read as empty ones.
+    """
+    for chunk in pd.read_csv(path, usecols=[text_column, label_column], chunksize=chunksize):
+        labels = chunk[label_column].map(LABELS)
+        known = labels.notna()
+        yield (chunk[text_column][known].fillna("").astype(str).tolist(),
+               labels[known].astype(np.int64).tolist())
+
+
+def count_terms(reviews, labels, term_ids, phrases=None):
+    """
+    Counts the occurrences of every term in negative and positive reviews.
+
+    :param term_ids: Mapping of canonical term -> row index.
+    :param phrases: PhraseMatcher merging the multi-word terms. Built from
+                    term_ids if None.
+    :return: Array of shape (len(term_ids), 2); column 0 counts occurrences in
+             negative reviews and column 1 in positive reviews.
+    """
+    if phrases is None:
+        phrases = PhraseMatcher([*term_ids, *GUARD_PHRASES])
+
+    # Added to review by review, so memory does not grow with the reviews
+    counts = np.zeros((len(term_ids), 2), dtype=np.int64)
+    for review, label in zip(reviews, labels):
+        found = [term_ids[token] for token in tokenize(review, phrases) if token in term_ids]
+        if found:
+            np.add.at(counts[:, label], found, 1)
+
+    return counts
+
 
-diminishers = [
-    "somewhat", "kind-of", "a bit", "slightly", "partially", "mildly", "a-little",
-    "fairly", "moderately", "sort-of", "not-really", "sometimes"
-]
+def _count_chunk(args):
+    reviews, labels, term_ids, phrases = args
+    return count_terms(reviews, labels, term_ids, phrases)
 
-def calculate_weights(dataframe, qnts, dims, min_freq=10, alpha=0.05):
+
+def accumulate_counts(chunks, terms, shards=1, max_pending=None):
     """
-    Calculate weights for quantifiers and diminishers based on their weighted sentiment impact.
+    Sums the term/label co-occurrence counts of a stream of (reviews, labels)
+    chunks, optionally sharded over a pool of worker processes.
+
+    :return: Array of shape (len(terms), 2), see count_terms.
     """
-    quantifier_scores = defaultdict(lambda: [[], []])  # [positive_sentiments, negative_sentiments]
-    diminisher_scores = defaultdict(lambda: [[], []])  # [positive_sentiments, negative_sentiments]
+    term_ids = {term: i for i, term in enumerate(terms)}
+    phrases = PhraseMatcher([*terms, *GUARD_PHRASES])
+    counts = np.zeros((len(terms), 2), dtype=np.int64)
 
-    for _, row in dataframe.iterrows():
-        text = row['review']
-        sentiment = row['sentiment']
-        words = text.lower().split()
+    if shards <= 1:
+        for reviews, labels in chunks:
+            counts += count_terms(reviews, labels, term_ids, phrases)
+        return counts
 
-        for word in words:
-            if word in qnts:
-                quantifier_scores[word][0 if sentiment == 1 else 1].append(sentiment)
-            if word in dims:
-                diminisher_scores[word][0 if sentiment == 1 else 1].append(sentiment)
+    # A bounded number of chunks is in flight, so the dataset is never fully
+    # in memory
+    tasks = ((reviews, labels, term_ids, phrases) for reviews, labels in chunks)
+    for _, chunk_counts in imap_bounded(_count_chunk, tasks, shards, max_pending):
+        counts += chunk_counts
 
-    def weighted_impact(scores, freq_min, alph):
-        pos_sentiments, neg_sentiments = scores
-        total_count = len(pos_sentiments) + len(neg_sentiments)
+    return counts
 
-        if total_count < freq_min:
+
+def weighted_impact(negative_count, positive_count, min_freq, alpha):
+    """
+    Returns the mean sentiment of the reviews a term occurs in, or None if the
+    term is too rare or its positive and negative occurrences are not
+    significantly different.
+
+    Every occurrence carries its review's label, so the sufficient statistics
+    of each group are its count, its mean (1 or 0) and a zero variance.
+    """
+    total_count = negative_count + positive_count
+    if total_count < min_freq:
+        return None
+
+    if positive_count and negative_count:
+        with np.errstate(divide='ignore', invalid='ignore'):
+            _, p_value = ttest_ind_from_stats(1.0, 0.0, positive_count,
+                                              0.0, 0.0, negative_count,
+                                              equal_var=False)
+        if p_value > alpha:
             return None
 
-        if pos_sentiments and neg_sentiments:
-            _, p_value = ttest_ind(pos_sentiments, neg_sentiments, equal_var=False)
-            if p_value > alph:
-                return None
+    return float(positive_count / total_count)
+
 
-        mean_sentiment = (np.sum(pos_sentiments) + np.sum(neg_sentiments)) / total_count
-        return float(mean_sentiment)
+def calculate_weights(counts, terms, min_freq=10, alpha=0.05):
+    """
+    Calculates the sentiment impact of every term from its counts, dropping
+    terms for which weighted_impact returns None.
+    """
+    weights = {term: weighted_impact(int(negative), int(positive), min_freq, alpha)
+               for term, (negative, positive) in zip(terms, counts)}
+    return {term: weight for term, weight in weights.items() if weight is not None}
 
-    qnts_weights = {word: weighted_impact(scores, min_freq, alpha) for word, scores in quantifier_scores.items()}
-    dims_weight = {word: weighted_impact(scores, min_freq, alpha) for word, scores in diminisher_scores.items()}
 
-    qnts_weights = {k: v for k, v in qnts_weights.items() if v is not None}
-    dims_weight = {k: v for k, v in dims_weight.items() if v is not None}
+def train(path, qnts=None, dims=None, min_freq=5, alpha=0.06, chunksize=10000, shards=1):
+    """
+    Streams an IMDB-style CSV and returns normalized (quantifier, diminisher)
+    weights in the form SentimentAnalyzerModel uses.
+    """
+    qnts = [canonical_phrase(term) for term in (qnts or quantifiers)]
+    dims = [canonical_phrase(term) for term in (dims or diminishers)]
+    terms = list(dict.fromkeys(qnts + dims))
 
-    return qnts_weights, dims_weight
+    counts = accumulate_counts(iter_dataset(path, chunksize), terms, shards)
+    impacts = calculate_weights(counts, terms, min_freq, alpha)
 
-# Calculate weights
-quantifier_weights, diminisher_weights = calculate_weights(df, quantifiers, diminishers, min_freq=5, alpha=0.06)
+    # Normalize weights
+    q = {word: round(float(1 + (1 - impacts[word])), 2) for word in qnts if word in impacts}
+    d = {word: round(float(1 - impacts[word]), 2) for word in dims if word in impacts}
+    return q, d
 
-# Normalize weights
-q = {word: round(float(1 + (1 - score)), 2) for word, score in
-     quantifier_weights.items()}
-d = {word: round(float(1 - score), 2) for word, score in
-     diminisher_weights.items()}
\ No newline at end of file
+
+def save_weights(path, quantifier_weights, diminisher_weights):
+    """
+    Writes a weights file that SentimentAnalyzerModel loads via weights_file.
+    """
+    with open(path, 'w') as file:
+        json.dump({"quantifiers": quantifier_weights,
+                   "diminishers": diminisher_weights}, file, indent=2, sort_keys=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m SentimentAnalysis.SentimentTrainer.train_weights",
+        description="Trains quantifier and diminisher weights on an IMDB-style CSV.")
+    parser.add_argument("dataset", nargs="?", default="IMDB Dataset.csv")
+    parser.add_argument("-o", "--output", default="weights.json")
+    parser.add_argument("--min-freq", type=int, default=5)
+    parser.add_argument("--alpha", type=float, default=0.06)
+    parser.add_argument("--chunksize", type=int, default=10000)
+    parser.add_argument("--shards", type=int, default=1, help="worker processes")
+    args = parser.parse_args(argv)
+
+    q, d = train(args.dataset, min_freq=args.min_freq, alpha=args.alpha,
+                 chunksize=args.chunksize, shards=args.shards)
+    save_weights(args.output, q, d)
+    print(f"Wrote {len(q)} quantifier and {len(d)} diminisher weights to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
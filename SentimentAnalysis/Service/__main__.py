@@ -0,0 +1,129 @@
+import argparse
+import asyncio
+import json
+import sys
+import time
+
+from SentimentAnalysis.Exceptions.errors import ServiceOverloadedError
+from SentimentAnalysis.Service.service import AsyncSentimentService
+
+_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 503: "Service Unavailable"}
+
+
+async def serve_stdin(service):
+    """
+    Scores every line of stdin concurrently and prints the scores in order.
+    """
+    loop = asyncio.get_running_loop()
+    start = time.perf_counter()
+
+    lines = await loop.run_in_executor(None, sys.stdin.readlines)
+    scores = await asyncio.gather(*(service.evaluate(line.rstrip("\r\n")) for line in lines))
+    for score in scores:
+        print(repr(score))
+
+    elapsed = time.perf_counter() - start
+    print(f"Scored {len(scores):,} messages in {elapsed:.2f}s "
+          f"({len(scores) / elapsed if elapsed else 0:,.0f} messages/s), {service.stats()}",
+          file=sys.stderr)
+
+
+async def _respond(writer, status, body, keep_alive):
+    payload = json.dumps(body).encode("utf-8")
+    writer.write(f"HTTP/1.1 {status} {_REASONS[status]}\r\n"
+                 f"Content-Type: application/json\r\n"
+                 f"Content-Length: {len(payload)}\r\n"
+                 f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+                 .encode("ascii") + payload)
+    await writer.drain()
+
+
+async def _handle_connection(service, reader, writer):
+    try:
+        while True:
+            request_line = await reader.readline()
+            if not request_line:
+                break
+
+            headers = {}
+            while True:
+                line = await reader.readline()
+                if line in (b"\r\n", b"\n", b""):
+                    break
+                name, _, value = line.decode("latin-1").partition(":")
+                headers[name.strip().lower()] = value.strip()
+
+            body = await reader.readexactly(int(headers.get("content-length", 0)))
+            method, path, version = request_line.decode("latin-1").split()
+            keep_alive = headers.get("connection", "").lower() != "close" and version == "HTTP/1.1"
+
+            if path == "/stats":
+                await _respond(writer, 200, service.stats(), keep_alive)
+            elif method != "POST" or path != "/":
+                await _respond(writer, 404, {"error": "POST a message to /"}, keep_alive)
+            else:
+                try:
+                    score = await service.evaluate(body.decode("utf-8"))
+                except ServiceOverloadedError as e:
+                    await _respond(writer, 503, {"error": str(e)}, keep_alive)
+                except UnicodeDecodeError:
+                    await _respond(writer, 400, {"error": "body must be UTF-8"}, keep_alive)
+                else:
+                    await _respond(writer, 200, {"score": score}, keep_alive)
+
+            if not keep_alive:
+                break
+    except (ValueError, asyncio.IncompleteReadError, ConnectionError):
+        pass
+    finally:
+        writer.close()
+
+
+async def serve_http(service, host, port):
+    """
+    Minimal HTTP stand-in: POST / with the message as the body returns
+    {"score": ...}; GET /stats returns the batching statistics.
+    """
+    server = await asyncio.start_server(
+        lambda reader, writer: _handle_connection(service, reader, writer), host, port)
+    print(f"Listening on http://{host}:{port}", file=sys.stderr)
+    async with server:
+        await server.serve_forever()
+
+
+async def run(args):
+    async with AsyncSentimentService(max_batch_size=args.max_batch_size,
+                                     max_wait=args.max_wait_ms / 1000,
+                                     max_pending=args.max_pending,
+                                     reject_when_full=args.http is not None,
+                                     processes=args.processes, wordset=args.wordset,
+                                     backend=args.backend) as service:
+        if args.http is None:
+            await serve_stdin(service)
+        else:
+            host, _, port = args.http.rpartition(":")
+            await serve_http(service, host or "127.0.0.1", int(port))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m SentimentAnalysis.Service",
+        description="Local stand-in server for load testing the async sentiment service.")
+    parser.add_argument("--http", metavar="[HOST:]PORT",
+                        help="serve HTTP instead of scoring stdin")
+    parser.add_argument("--max-batch-size", type=int, default=64)
+    parser.add_argument("--max-wait-ms", type=float, default=5.0)
+    parser.add_argument("--max-pending", type=int, default=10000)
+    parser.add_argument("-j", "--processes", type=int, default=1)
+    parser.add_argument("--wordset", default="standard", choices=("standard", "extended"))
+    parser.add_argument("--backend", help="vectorizer backend")
+    args = parser.parse_args(argv)
+
+    try:
+        asyncio.run(run(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,206 @@
+import asyncio
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from SentimentAnalysis.CorpusScorer.scorer import init_worker, score_chunk
+from SentimentAnalysis.Exceptions.errors import ServiceOverloadedError
+from SentimentAnalysis.v1.analyzer import SentimentAnalyzerV1
+
+
+class AsyncSentimentService:
+    """
+    Asyncio front end to SentimentAnalyzerV1.
+
+    Concurrent evaluate() calls are collected into micro-batches: a batch is
+    dispatched once it holds max_batch_size messages or max_wait seconds after
+    its first message arrived, whichever comes first. Batches are scored with
+    evaluate_many on an executor, so the event loop never runs analyzer code.
+    Only the analyzer's prefilter runs on the loop: messages without any
+    lexicon or modifier token are answered at once, without joining a batch.
+
+    With processes > 1 batches are scored on a process pool whose workers each
+    build their own analyzer from analyzer_options; otherwise they are scored
+    on a single worker thread. An analyzer object cannot be sent to the
+    workers, so it may only be passed with processes=1. If a batch fails, its messages are retried one
+    at a time, so a message that cannot be scored only fails its own call.
+
+    Backpressure: at most max_pending messages may be queued or in flight.
+    Beyond that, evaluate() waits for room, or raises ServiceOverloadedError
+    if the service was created with reject_when_full=True.
+    """
+
+    def __init__(self, analyzer=None, max_batch_size=64, max_wait=0.005,
+                 max_pending=10000, reject_when_full=False, processes=1,
+                 **analyzer_options):
+        if analyzer is not None and processes > 1:
+            raise ValueError("An analyzer cannot be shared with worker processes; "
+                             "pass analyzer_options instead")
+
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self.max_pending = max_pending
+        self.reject_when_full = reject_when_full
+        self.processes = processes
+        self.analyzer_options = analyzer_options
+        self.analyzer = analyzer
+
+        self.batches = 0
+        self.messages = 0
+        self.prefiltered = 0
+
+        self.__prefilter = None
+        self.__queue = None
+        self.__slots = None
+        self.__executor = None
+        self.__batcher = None
+        self.__running = set()
+        self.__outstanding = 0
+        self.__idle = None
+        self.__closing = False
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def start(self):
+        if self.__batcher is not None:
+            return
+
+        if self.processes > 1:
+            # The workers' analyzers are out of reach; build one for its
+            # prefilter, before the pool so that invalid options raise here
+            analyzer = SentimentAnalyzerV1(**self.analyzer_options)
+            self.__executor = ProcessPoolExecutor(self.processes, initializer=init_worker,
+                                                  initargs=(self.analyzer_options,))
+        else:
+            if self.analyzer is None:
+                self.analyzer = SentimentAnalyzerV1(**self.analyzer_options)
+            self.__executor = ThreadPoolExecutor(1, thread_name_prefix="sentiment")
+            analyzer = self.analyzer
+        self.__prefilter = analyzer.prefilter
+
+        self.__queue = asyncio.Queue()
+        self.__idle = asyncio.Event()
+        self.__idle.set()
+        self.__closing = False
+        self.__slots = asyncio.Semaphore(self.max_pending)
+        self.__batcher = asyncio.create_task(self.__collect_batches())
+
+    async def close(self):
+        """
+        Scores every message already submitted, then stops the service.
+        """
+        if self.__batcher is None:
+            return
+
+        self.__closing = True
+        await self.__idle.wait()
+        self.__batcher.cancel()
+        try:
+            await self.__batcher
+        except asyncio.CancelledError:
+            pass
+        if self.__running:
+            await asyncio.gather(*self.__running, return_exceptions=True)
+
+        self.__executor.shutdown()
+        self.__batcher = None
+
+    async def evaluate(self, message):
+        """
+        Evaluates the sentiment of a message as part of the next micro-batch.
+        """
+        if self.__batcher is None or self.__closing:
+            raise RuntimeError("The service is not running; call start() first")
+
+        if self.__prefilter is not None and self.__prefilter.skips(message):
+            self.prefiltered += 1
+            return 0.0  # As evaluate_many scores it
+
+        if self.reject_when_full and self.__slots.locked():
+            raise ServiceOverloadedError(self.max_pending)
+
+        self.__outstanding += 1
+        self.__idle.clear()
+        try:
+            await self.__slots.acquire()
+            future = asyncio.get_running_loop().create_future()
+            self.__queue.put_nowait((message, future))
+            return await future
+        finally:
+            self.__outstanding -= 1
+            if not self.__outstanding:
+                self.__idle.set()
+
+    def stats(self):
+        """
+        Returns the batching statistics. messages counts the messages scored
+        in batches, prefiltered those answered by the prefilter.
+        """
+        answered = self.messages + self.prefiltered
+        return {"batches": self.batches, "messages": self.messages,
+                "mean_batch_size": self.messages / self.batches if self.batches else 0.0,
+                "prefiltered": self.prefiltered,
+                "prefiltered_share": self.prefiltered / answered if answered else 0.0,
+                "queued": self.__queue.qsize() if self.__queue else 0}
+
+    # ---- HELPER FUNCTIONS ----
+
+    async def __collect_batches(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self.__queue.get()]
+            deadline = loop.time() + self.max_wait
+
+            while len(batch) < self.max_batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self.__queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            task = asyncio.create_task(self.__score_batch(batch))
+            self.__running.add(task)
+            task.add_done_callback(self.__running.discard)
+
+    async def __score_batch(self, batch):
+        try:
+            scores = await self.__score([message for message, _ in batch])
+        except Exception as e:
+            if len(batch) == 1:
+                scores = [e]
+            else:
+                # Retry one message at a time, so that only the messages that
+                # fail get the error
+                scores = []
+                for message, _ in batch:
+                    try:
+                        scores.extend(await self.__score([message]))
+                    except Exception as item_error:
+                        scores.append(item_error)
+
+        try:
+            for (_, future), score in zip(batch, scores):
+                if future.done():
+                    continue
+                if isinstance(score, Exception):
+                    future.set_exception(score)
+                else:
+                    future.set_result(score)
+        finally:
+            self.batches += 1
+            self.messages += len(batch)
+            for _ in batch:
+                self.__queue.task_done()
+                self.__slots.release()
+
+    async def __score(self, messages):
+        loop = asyncio.get_running_loop()
+        if self.processes > 1:
+            return await loop.run_in_executor(self.__executor, score_chunk, messages)
+        return (await loop.run_in_executor(
+            self.__executor, self.analyzer.evaluate_many, messages)).tolist()
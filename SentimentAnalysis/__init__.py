@@ -1,2 +1,26 @@
-from SentimentAnalysis.v1.analyzer import SentimentAnalyzerV1
-from SentimentAnalysis.v2.analyzer import SentimentAnalyzerV2
\ No newline at end of file
+import importlib
+
+# Public names and the modules they live in. Nothing is imported until a name
+# is first used, so "import SentimentAnalysis" loads neither NumPy nor the
+# vectorizer library; see warmup() to load everything up front.
+_EXPORTS = {
+    "SentimentAnalyzerV1": "SentimentAnalysis.v1.analyzer",
+    "SentimentAnalyzerV2": "SentimentAnalysis.v2.analyzer",
+    "warmup": "SentimentAnalysis.startup",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
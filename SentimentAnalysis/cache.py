@@ -0,0 +1,69 @@
+import threading
+from collections import OrderedDict
+
+
+class ClauseCache:
+    """
+    A bounded, thread-safe LRU cache of clause features, keyed on the
+    normalized clause tokens.
+
+    Entries are also keyed on the LexiconIndex they were computed with, so one
+    cache can be shared by analyzers with different wordsets without ever
+    returning features computed for another wordset. Analyzers that share a
+    wordset share its index, and therefore its entries.
+    """
+
+    def __init__(self, maxsize=65536):
+        if maxsize <= 0:
+            raise ValueError(f"Invalid maxsize: {maxsize}. It must be positive")
+
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.__entries = OrderedDict()
+        self.__lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.__entries)
+
+    def get(self, lexicon, tokens):
+        """
+        Returns the cached features of a clause, or None on a miss.
+        """
+        key = (lexicon, tuple(tokens))
+        with self.__lock:
+            features = self.__entries.get(key)
+            if features is None:
+                self.misses += 1
+                return None
+
+            self.__entries.move_to_end(key)
+            self.hits += 1
+            return features
+
+    def put(self, lexicon, tokens, features):
+        key = (lexicon, tuple(tokens))
+        with self.__lock:
+            self.__entries[key] = features
+            self.__entries.move_to_end(key)
+
+            if len(self.__entries) > self.maxsize:
+                self.__entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self.__lock:
+            self.__entries.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self):
+        """
+        Returns a snapshot of the hit/miss statistics.
+        """
+        with self.__lock:
+            lookups = self.hits + self.misses
+            return {"hits": self.hits, "misses": self.misses,
+                    "evictions": self.evictions, "size": len(self.__entries),
+                    "maxsize": self.maxsize,
+                    "hit_rate": self.hits / lookups if lookups else 0.0}
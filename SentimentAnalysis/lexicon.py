@@ -0,0 +1,530 @@
+import json
+import os
+import struct
+import threading
+from array import array
+
+from SentimentAnalysis.tokenizer import GUARD_PHRASES, PhraseMatcher, canonical_phrase
+
+# Category flags. A token may belong to several categories at once.
+POSITIVE = 1
+NEGATIVE = 2
+NEGATION = 4
+QUANTIFIER = 8
+DIMINISHER = 16
+CONJUNCTION = 32
+
+# Code of a token that belongs to no category
+NO_ENTRY = (0, 1, 1)
+
+# Bundled wordsets, resolved relative to the package instead of the CWD
+ASSETS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                          "LanguageAssets")
+
+# Compiled lexicon layout: magic, positive count, negative count (little-endian
+# uint32), then every word UTF-8 encoded and newline-terminated, positives first
+COMPILED_MAGIC = b"SALEX1\n"
+_COMPILED_HEADER = struct.Struct("<7sII")
+
+
+class LexiconIndex:
+    """
+    Maps every token to a compact (flags, quantifier weight, diminisher weight)
+    code, so scoring a token takes a single dictionary lookup regardless of
+    how many lexicons it is checked against or how large they are.
+
+    Tokens with the same categories and weights share one code object.
+
+    Multi-word entries ("a bit", "due to", "a-lot") are keyed on their
+    hyphenated token, and phrases is the PhraseMatcher that merges them in
+    tokenized text.
+    """
+
+    def __init__(self, positive_words, negative_words, negations=(),
+                 quantifiers=None, diminishers=None, conjunctions=(), key=None):
+        """
+        :param positive_words: Iterable of positive words.
+        :param negative_words: Iterable of negative words.
+        :param negations: Iterable of negation words.
+        :param quantifiers: Mapping of quantifier -> weight.
+        :param diminishers: Mapping of diminisher -> weight.
+        :param conjunctions: Iterable of conjunctions.
+        :param key: Identifies the wordset the index was built from.
+        """
+        self.key = key
+        quantifiers = {canonical_phrase(word): weight for word, weight in (quantifiers or {}).items()}
+        diminishers = {canonical_phrase(word): weight for word, weight in (diminishers or {}).items()}
+
+        flags = {}
+        for category, words in ((POSITIVE, positive_words), (NEGATIVE, negative_words),
+                                (NEGATION, negations), (QUANTIFIER, quantifiers),
+                                (DIMINISHER, diminishers), (CONJUNCTION, conjunctions)):
+            for word in words:
+                word = canonical_phrase(word)
+                flags[word] = flags.get(word, 0) | category
+
+        self.phrases = PhraseMatcher(list(flags) + list(GUARD_PHRASES))
+
+        codes = {}
+        self.__entries = {}
+        for word, word_flags in flags.items():
+            code = (word_flags, quantifiers.get(word, 1), diminishers.get(word, 1))
+            self.__entries[word] = codes.setdefault(code, code)
+
+        self.lookup = self.__entries.get
+
+    def __len__(self):
+        return len(self.__entries)
+
+    def __contains__(self, token):
+        return token in self.__entries
+
+    def code(self, token):
+        """
+        Returns the (flags, quantifier weight, diminisher weight) code of a
+        token, or NO_ENTRY if the token is not in any lexicon.
+        """
+        return self.__entries.get(token, NO_ENTRY)
+
+    def flags(self, token):
+        return self.__entries.get(token, NO_ENTRY)[0]
+
+    def items(self):
+        """
+        Returns the (token, code) pairs of every indexed token.
+        """
+        return self.__entries.items()
+
+
+class OverlayIndex:
+    """
+    The LexiconIndex of an OverlayLexicon.
+
+    Only the codes of the words the overlay adds or removes are stored; every
+    other token is looked up in the shared index of the base wordset. The
+    overlay table holds the vocabulary's str objects and shared code tuples,
+    so it costs a few dozen bytes per custom word.
+    """
+
+    def __init__(self, base_index, overlay, key=None):
+        """
+        :param base_index: LexiconIndex of overlay.base with the same modifier
+                           tables.
+        :param overlay: OverlayLexicon.
+        """
+        self.base = base_index
+        self.key = key
+
+        entries = {}
+        for category, ids, present in ((POSITIVE, overlay.added_positive, True),
+                                       (POSITIVE, overlay.removed_positive, False),
+                                       (NEGATIVE, overlay.added_negative, True),
+                                       (NEGATIVE, overlay.removed_negative, False)):
+            for word in VOCABULARY.words(ids):
+                flags, quantifier, diminisher = entries.get(word) or base_index.code(word)
+                flags = flags | category if present else flags & ~category
+                entries[word] = _shared((flags, quantifier, diminisher))
+
+        self.__entries = entries
+        self.__size = len(base_index) + sum(
+            (code[0] != 0) - (word in base_index) for word, code in entries.items())
+
+        # Phrases only need a trie of their own if the overlay adds some
+        added = [word for word in entries if "-" in word and entries[word][0]]
+        self.phrases = (PhraseMatcher(base_index.phrases.phrases() + added) if added
+                        else base_index.phrases)
+
+        if not entries:
+            self.lookup = base_index.lookup
+            return
+
+        overlay_lookup = entries.get
+        base_lookup = base_index.lookup
+
+        def lookup(token, default=None):
+            code = overlay_lookup(token)
+            if code is None:
+                return base_lookup(token, default)
+            return code
+
+        self.lookup = lookup
+
+    def __len__(self):
+        return self.__size
+
+    def __contains__(self, token):
+        return self.lookup(token, NO_ENTRY)[0] != 0
+
+    def code(self, token):
+        return self.lookup(token, NO_ENTRY)
+
+    def flags(self, token):
+        return self.lookup(token, NO_ENTRY)[0]
+
+    def items(self):
+        """
+        Returns the (token, code) pairs of every indexed token, the
+        overlay's codes replacing the base's.
+        """
+        entries = self.__entries
+        items = [(token, code) for token, code in self.base.items() if token not in entries]
+        items.extend((token, code) for token, code in entries.items() if code[0])
+        return items
+
+    def overlay_items(self):
+        """
+        Returns the (token, code) pairs the overlay stores: the tokens it
+        adds or changes, and those it removes with no flags left.
+        """
+        return self.__entries.items()
+
+
+class Lexicon:
+    """
+    An immutable pair of positive and negative wordsets. Instances are shared
+    by every analyzer that loads the same wordset.
+    """
+
+    def __init__(self, positive_words, negative_words, key=None):
+        self.positive_words = frozenset(positive_words)
+        self.negative_words = frozenset(negative_words)
+        self.key = key
+
+    def save(self, path):
+        """
+        Writes the lexicon in the compiled format read by load_compiled_lexicon.
+        """
+        positive_words = sorted(self.positive_words)
+        negative_words = sorted(self.negative_words)
+        body = "".join(word + "\n" for word in positive_words + negative_words)
+
+        with open(path, "wb") as file:
+            file.write(_COMPILED_HEADER.pack(COMPILED_MAGIC, len(positive_words),
+                                             len(negative_words)))
+            file.write(body.encode("utf-8"))
+
+
+class Vocabulary:
+    """
+    Process-wide table of interned words. Every word gets a small integer ID
+    and its str object is stored once, however many lexicons contain it.
+    """
+
+    def __init__(self):
+        self.__ids = {}
+        self.__words = []
+        self.__lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.__words)
+
+    def intern(self, words):
+        """
+        Returns the sorted IDs of the given words as a compact array of
+        unsigned ints, adding unknown words to the vocabulary.
+        """
+        with self.__lock:
+            ids = self.__ids
+            for word in words:
+                if word not in ids:
+                    ids[word] = len(self.__words)
+                    self.__words.append(word)
+            return array("I", sorted({ids[word] for word in words}))
+
+    def words(self, ids):
+        """
+        Returns the interned str objects of the given IDs.
+        """
+        words = self.__words
+        return [words[i] for i in ids]
+
+
+VOCABULARY = Vocabulary()
+
+
+class OverlayLexicon:
+    """
+    A custom wordset stored as its difference to a shared base Lexicon: four
+    sorted arrays of VOCABULARY IDs holding the words it adds to and removes
+    from the base's positive and negative words.
+
+    Memory scales with the number of words that differ from the base, not
+    with the size of the wordset, so many tenants with mostly-standard
+    wordsets can share one base.
+    """
+
+    def __init__(self, base, positive_words, negative_words, key=None):
+        """
+        :param base: Shared Lexicon of the base wordset.
+        """
+        base_positive, base_negative = _canonical_words(base)
+        positive_words = {canonical_phrase(word) for word in positive_words}
+        negative_words = {canonical_phrase(word) for word in negative_words}
+
+        self.base = base
+        self.added_positive = VOCABULARY.intern(positive_words - base_positive)
+        self.removed_positive = VOCABULARY.intern(base_positive - positive_words)
+        self.added_negative = VOCABULARY.intern(negative_words - base_negative)
+        self.removed_negative = VOCABULARY.intern(base_negative - negative_words)
+        self.key = key
+
+    @property
+    def positive_words(self):
+        """
+        The full positive wordset, built on demand. Multi-word entries are
+        spelled as the tokenizer emits them.
+        """
+        base_positive, _ = _canonical_words(self.base)
+        return ((base_positive - frozenset(VOCABULARY.words(self.removed_positive)))
+                | frozenset(VOCABULARY.words(self.added_positive)))
+
+    @property
+    def negative_words(self):
+        """
+        The full negative wordset, built on demand. Multi-word entries are
+        spelled as the tokenizer emits them.
+        """
+        _, base_negative = _canonical_words(self.base)
+        return ((base_negative - frozenset(VOCABULARY.words(self.removed_negative)))
+                | frozenset(VOCABULARY.words(self.added_negative)))
+
+    @property
+    def nbytes(self):
+        """
+        Bytes held by the ID arrays.
+        """
+        return sum(ids.itemsize * len(ids) for ids in
+                   (self.added_positive, self.removed_positive,
+                    self.added_negative, self.removed_negative))
+
+    def save(self, path):
+        """
+        Writes the full wordset in the compiled format read by
+        load_compiled_lexicon.
+        """
+        Lexicon(self.positive_words, self.negative_words).save(path)
+
+
+# Process-wide caches. Lexicons are keyed by wordset name or by file paths;
+# file-backed entries remember the mtimes they were loaded at and are
+# reloaded when a file changes, which evicts everything derived from the
+# stale lexicon.
+_lexicons = {}
+_indexes = {}
+_canonical = {}
+_shared_values = {}
+_lock = threading.Lock()
+
+# _shared_values only deduplicates; it is emptied when it grows past this
+_SHARED_VALUES_LIMIT = 1 << 16
+
+
+def _read_words(file_path):
+    """
+    Loads a list of LanguageAssets from the given file.
+    """
+    try:
+        with open(file_path, 'r') as file:
+            return [line.strip() for line in file.readlines()]
+    except IOError:
+        raise ValueError(f"Unable to read file at {file_path}")
+
+
+def _shared(value):
+    """
+    Returns the shared instance of an immutable value (a code or a modifier
+    table key), so equal values held by many indexes are stored once.
+    """
+    with _lock:
+        if len(_shared_values) >= _SHARED_VALUES_LIMIT and value not in _shared_values:
+            _shared_values.clear()
+        return _shared_values.setdefault(value, value)
+
+
+def _canonical_words(lexicon):
+    """
+    Returns the positive and negative words of a shared Lexicon, spelled as
+    the tokenizer emits them. Computed once per lexicon.
+    """
+    with _lock:
+        words = _canonical.get(lexicon.key)
+    if words is None:
+        words = (frozenset(canonical_phrase(word) for word in lexicon.positive_words),
+                 frozenset(canonical_phrase(word) for word in lexicon.negative_words))
+        with _lock:
+            words = _canonical.setdefault(lexicon.key, words)
+    return words
+
+
+def _mtime(file_path):
+    try:
+        return os.stat(file_path).st_mtime_ns
+    except OSError:
+        raise ValueError(f"Unable to read file at {file_path}")
+
+
+def _cached(key, stamp, loader):
+    with _lock:
+        entry = _lexicons.get(key)
+        if entry is not None and entry[0] == stamp:
+            return entry[1]
+
+    lexicon = loader()
+    with _lock:
+        entry = _lexicons.get(key)
+        if entry is not None:
+            if entry[0] == stamp:
+                return entry[1]  # Loaded meanwhile by another thread
+            _evict(entry[1].key)
+        _lexicons[key] = (stamp, lexicon)
+    return lexicon
+
+
+def _evict(lexicon_key):
+    """
+    Drops the canonical words and indexes of a lexicon, and the overlays
+    built on it with theirs. Called with _lock held.
+    """
+    _canonical.pop(lexicon_key, None)
+    for key in [key for key in _indexes if key[0] == lexicon_key]:
+        del _indexes[key]
+
+    for key, (_, lexicon) in list(_lexicons.items()):
+        if key[0] == "overlay" and key[1] == lexicon_key:
+            del _lexicons[key]
+            _evict(lexicon.key)
+
+
+def load_wordset(wordset):
+    """
+    Returns the shared Lexicon of a bundled wordset ("standard", "extended").
+    """
+    directory = os.path.join(ASSETS_DIR, wordset)
+    return load_word_files(os.path.join(directory, "positive_words.txt"),
+                           os.path.join(directory, "negative_words.txt"))
+
+
+def load_word_files(positive_words_file, negative_words_file):
+    """
+    Returns the shared Lexicon of a pair of word files, one word per line.
+    """
+    positive_words_file = os.path.abspath(positive_words_file)
+    negative_words_file = os.path.abspath(negative_words_file)
+    key = ("files", positive_words_file, negative_words_file)
+    stamp = (_mtime(positive_words_file), _mtime(negative_words_file))
+
+    return _cached(key, stamp, lambda: Lexicon(_read_words(positive_words_file),
+                                               _read_words(negative_words_file),
+                                               key + stamp))
+
+
+def load_compiled_lexicon(path):
+    """
+    Returns the shared Lexicon stored in a compiled lexicon file (see
+    Lexicon.save). The file is read with a single read call.
+    """
+    path = os.path.abspath(path)
+    key = ("compiled", path)
+    stamp = _mtime(path)
+
+    return _cached(key, stamp, lambda: Lexicon(*_read_compiled(path), key + (stamp,)))
+
+
+def _read_compiled(path):
+    """
+    Returns the positive and negative words of a compiled lexicon file.
+    """
+    try:
+        with open(path, "rb") as file:
+            data = file.read()
+    except IOError:
+        raise ValueError(f"Unable to read file at {path}")
+
+    if len(data) < _COMPILED_HEADER.size or not data.startswith(COMPILED_MAGIC):
+        raise ValueError(f"Not a compiled lexicon: {path}")
+
+    _, positive_count, negative_count = _COMPILED_HEADER.unpack_from(data)
+    words = data[_COMPILED_HEADER.size:].decode("utf-8").split("\n")
+    return words[:positive_count], words[positive_count:positive_count + negative_count]
+
+
+def load_overlay(base_wordset, positive_words_file=None, negative_words_file=None,
+                 lexicon_file=None):
+    """
+    Returns the shared OverlayLexicon of a custom wordset, given as a pair of
+    word files or a compiled lexicon_file, over a bundled base wordset. The
+    full custom wordset is only held while the overlay is built.
+    """
+    base = load_wordset(base_wordset)
+
+    if lexicon_file is not None:
+        paths = (os.path.abspath(lexicon_file),)
+        read = lambda: _read_compiled(paths[0])
+    else:
+        paths = (os.path.abspath(positive_words_file), os.path.abspath(negative_words_file))
+        read = lambda: (_read_words(paths[0]), _read_words(paths[1]))
+
+    key = ("overlay", base.key) + paths
+    stamp = tuple(_mtime(path) for path in paths)
+    return _cached(key, stamp, lambda: OverlayLexicon(base, *read(), key + stamp))
+
+
+def compile_lexicon(positive_words_file, negative_words_file, path):
+    """
+    Compiles a pair of word files into a single compiled lexicon file.
+    """
+    load_word_files(positive_words_file, negative_words_file).save(path)
+
+
+def load_modifier_weights(path):
+    """
+    Loads the quantifier and diminisher weights written by the weight trainer
+    (SentimentTrainer.train_weights.save_weights).
+
+    :return: (quantifiers, diminishers) mappings of term -> weight.
+    """
+    try:
+        with open(path, 'r') as file:
+            weights = json.load(file)
+    except IOError:
+        raise ValueError(f"Unable to read file at {path}")
+
+    try:
+        return (dict(weights["quantifiers"]), dict(weights["diminishers"]))
+    except (KeyError, TypeError, ValueError):
+        raise ValueError(f"Not a weights file: {path}")
+
+
+def get_index(lexicon, negations, quantifiers, diminishers, conjunctions):
+    """
+    Returns the shared LexiconIndex of a lexicon and set of modifier tables,
+    or the OverlayIndex of an OverlayLexicon.
+    """
+    key = (lexicon.key, _shared(frozenset(negations)), _shared(frozenset(quantifiers.items())),
+           _shared(frozenset(diminishers.items())), _shared(frozenset(conjunctions)))
+
+    with _lock:
+        index = _indexes.get(key)
+    if index is None:
+        if isinstance(lexicon, OverlayLexicon):
+            index = OverlayIndex(get_index(lexicon.base, negations, quantifiers,
+                                           diminishers, conjunctions),
+                                 lexicon, key=key)
+        else:
+            index = LexiconIndex(lexicon.positive_words, lexicon.negative_words,
+                                 negations, quantifiers, diminishers, conjunctions,
+                                 key=key)
+        with _lock:
+            index = _indexes.setdefault(key, index)
+    return index
+
+
+def clear_cache():
+    """
+    Drops every cached lexicon and index.
+    """
+    with _lock:
+        _lexicons.clear()
+        _indexes.clear()
+        _canonical.clear()
+        _shared_values.clear()
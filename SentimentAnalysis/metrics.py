@@ -0,0 +1,133 @@
+import threading
+import time
+
+# Vectorizer functions counted by CountingBackend, and whether their first
+# argument is a column whose length is the number of rows processed
+COUNTED_FUNCTIONS = {"s2v": False, "v2s": False, "combine": False,
+                     "combine_into": False, "combine_reduce": False, "free": False,
+                     "v2s_batch": True, "combine_batch": True,
+                     "combine_reduce_batch": True, "momentum_batch": True}
+
+
+class Metrics:
+    """
+    Thread-safe counters and per-stage timers of an analyzer.
+
+    Nothing is recorded unless a Metrics is attached to an analyzer (see
+    SentimentAnalyzerV1.set_metrics); a detached analyzer runs its normal,
+    uninstrumented code. Hooks receive every observation as it happens, e.g.
+    to forward it to a statsd or Prometheus client.
+    """
+
+    def __init__(self):
+        self.counters = {}
+        self.timers = {}
+        self.__hooks = []
+        self.__lock = threading.Lock()
+
+    def add_hook(self, hook):
+        """
+        Registers hook(kind, name, value), called with kind "counter" and the
+        increment, or kind "timer" and the elapsed seconds.
+        """
+        self.__hooks.append(hook)
+
+    def remove_hook(self, hook):
+        self.__hooks.remove(hook)
+
+    def increment(self, name, value=1):
+        with self.__lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+        for hook in self.__hooks:
+            hook("counter", name, value)
+
+    def observe(self, name, seconds):
+        """
+        Records one timing of a stage.
+        """
+        with self.__lock:
+            timer = self.timers.get(name)
+            if timer is None:
+                self.timers[name] = [1, seconds, seconds]
+            else:
+                timer[0] += 1
+                timer[1] += seconds
+                if seconds > timer[2]:
+                    timer[2] = seconds
+        for hook in self.__hooks:
+            hook("timer", name, seconds)
+
+    def timer(self, name):
+        """
+        Returns a context manager that observes the time spent in its block.
+        """
+        return _StageTimer(self, name)
+
+    def reset(self):
+        with self.__lock:
+            self.counters.clear()
+            self.timers.clear()
+
+    def snapshot(self):
+        """
+        Returns a JSON-compatible copy of the counters and timers. Timers are
+        reported as count, total_seconds, mean_us and max_us.
+        """
+        with self.__lock:
+            return {
+                "counters": dict(self.counters),
+                "timers": {name: {"count": count, "total_seconds": total,
+                                  "mean_us": total / count * 1e6, "max_us": longest * 1e6}
+                           for name, (count, total, longest) in self.timers.items()},
+            }
+
+
+class _StageTimer:
+    __slots__ = ("metrics", "name", "start")
+
+    def __init__(self, metrics, name):
+        self.metrics = metrics
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.metrics.observe(self.name, time.perf_counter() - self.start)
+
+
+class CountingBackend:
+    """
+    Wraps a vectorizer backend, counting every call as "vectorizer.<function>"
+    and the rows of batch calls as "vectorizer.<function>.rows". Any other
+    attribute is read from the wrapped backend.
+    """
+
+    def __init__(self, backend, metrics):
+        self.backend = backend
+        self.metrics = metrics
+
+        for name, batched in COUNTED_FUNCTIONS.items():
+            function = getattr(backend, name, None)
+            if function is not None:
+                setattr(self, name, self.__counted(name, function, batched))
+
+    def __getattr__(self, name):
+        return getattr(self.backend, name)
+
+    # ---- HELPER FUNCTIONS ----
+
+    def __counted(self, name, function, batched):
+        metrics = self.metrics
+        counter = "vectorizer." + name
+        rows_counter = counter + ".rows"
+
+        def counted(*args, **kwargs):
+            metrics.increment(counter)
+            if batched:
+                metrics.increment(rows_counter, len(args[0]))
+            return function(*args, **kwargs)
+
+        counted.__name__ = name
+        return counted
@@ -1,5 +1,9 @@
 import re
 from SentimentAnalysis.Exceptions.errors import *
+from SentimentAnalysis.lexicon import (get_index, load_compiled_lexicon,
+                                       load_modifier_weights, load_overlay,
+                                       load_word_files, load_wordset)
+from SentimentAnalysis.tokenizer import GUARD_PHRASES, PhraseMatcher, canonical_phrase, tokenize
 
 
 class SentimentAnalyzerModel:
@@ -26,31 +30,70 @@ class SentimentAnalyzerModel:
                     "neither", "unless", "until", "when", "if", "as",
                     "in-case", "provided-that", "even-though", "so-that"}
 
+    # Multi-word entries of the tables above, merged into single tokens by
+    # clean_message. Analyzers tokenize with the phrases of their lexicon.
+    PHRASES = PhraseMatcher([*NEGATIONS, *QUANTIFIERS, *DIMINISHERS, *CONJUNCTIONS,
+                             *GUARD_PHRASES])
+
     def __init__(self, model, wordset="standard", positive_words_file=None,
-                 negative_words_file=None):
+                 negative_words_file=None, lexicon_file=None, weights_file=None,
+                 base_wordset=None):
         """
         Initializes the SentimentAnalyzer with lists of positive and negative words.
+
+        Wordsets are loaded once per process and shared by every analyzer. A
+        custom wordset is given either as a pair of word files or as a
+        compiled lexicon_file (see SentimentAnalysis.lexicon.compile_lexicon).
+        A weights_file written by the weight trainer replaces the built-in
+        QUANTIFIERS and DIMINISHERS weights of the terms it lists for this
+        analyzer; the other terms keep their built-in weights.
+
+        With a base_wordset ("standard" or "extended"), a custom wordset is
+        kept only as its difference to the shared base wordset (see
+        SentimentAnalysis.lexicon.OverlayLexicon), so that many analyzers with
+        mostly-standard custom wordsets cost memory per custom word only.
         """
 
         # Validate wordset
         if wordset not in ["standard", "extended", "custom"]:
             raise InvalidWordsetError(wordset)
+        if base_wordset not in [None, "standard", "extended"]:
+            raise InvalidWordsetError(base_wordset)
+
+        if wordset != "custom":
+            words = load_wordset(wordset)
+        elif lexicon_file is None and (positive_words_file is None or negative_words_file is None):
+            raise MissingCustomFilesError()
+        elif base_wordset is not None:
+            words = load_overlay(base_wordset, positive_words_file, negative_words_file,
+                                 lexicon_file)
+        elif lexicon_file is not None:
+            words = load_compiled_lexicon(lexicon_file)
         else:
-            if wordset != "custom":
-                positive_words_path = f"LanguageAssets/{wordset}/positive_words.txt"
-                negative_words_path = f"LanguageAssets/{wordset}/negative_words.txt"
-            else:
-                if positive_words_file is None or negative_words_file is None:
-                    raise MissingCustomFilesError()
-                else:
-                    positive_words_path = positive_words_file
-                    negative_words_path = negative_words_file
-
-        self.positive_words = self.__load_words_from_file(positive_words_path)
-        self.negative_words = self.__load_words_from_file(negative_words_path)
+            words = load_word_files(positive_words_file, negative_words_file)
+
+        self.words = words
+
+        if weights_file is not None:
+            # Trained weights replace the built-in ones of the terms they list;
+            # terms the trainer had too few occurrences of keep their defaults
+            quantifiers, diminishers = load_modifier_weights(weights_file)
+            self.QUANTIFIERS = _merge_weights(self.QUANTIFIERS, quantifiers)
+            self.DIMINISHERS = _merge_weights(self.DIMINISHERS, diminishers)
+
+        # One lookup per token covers every lexicon and modifier table
+        self.lexicon = get_index(words, self.NEGATIONS, self.QUANTIFIERS,
+                                 self.DIMINISHERS, self.CONJUNCTIONS)
 
         self.model = model
 
+    @property
+    def positive_words(self):
+        return self.words.positive_words
+
+    @property
+    def negative_words(self):
+        return self.words.negative_words
 
     def evaluate_sentiment(self, message, verbose=False):
         """
@@ -96,47 +139,14 @@ class SentimentAnalyzerModel:
         """
         Cleans the message by removing unwanted characters and converting it to lowercase.
         """
-        message = message.lower()
-
-        contractions = {
-            "wasn't": "wasnt", "can't": "cant", "don't": "dont",
-            "didn't": "didnt", "isn't": "isnt", "won't": "wont",
-            "haven't": "havent", "shouldn't": "shouldnt", "wouldn't": "wouldnt",
-            "couldn't": "couldnt", "you're": "youre", "i'm": "im",
-            "he's": "hes", "she's": "shes", "it's": "its", "they're": "theyre"
-        }
-
-        for contraction, replacement in contractions.items():
-            message = message.replace(contraction, replacement)
-
-        # Replace multi-word quantifiers and diminishers
-        message = re.sub(r'\b(a lot)\b', 'a-lot', message)
-        message = re.sub(r'\b(a little)\b', 'a-little', message)
-        message = re.sub(r'\b(not really)\b', 'not-really', message)
-        message = re.sub(r'\b(kind of)\b', 'kind-of', message)
-        message = re.sub(r'\b(sort of)\b', 'sort-of', message)
-        message = re.sub(r'\b(a bit)\b', 'a-bit', message)
-
-        # Handle conjunctions and 'like a' / 'like an'
-        message = re.sub(r'\b(so that)\b', 'so-that', message)
-        message = re.sub(r'\b(even though)\b', 'even-though', message)
-        message = re.sub(r'\b(provided that)\b', 'provided-that', message)
-        message = re.sub(r'\b(in case)\b', 'in-case', message)
-        message = re.sub(r'\blike a\b', 'like-a', message)
-        message = re.sub(r'\blike an\b', 'like-an', message)
-
-        message = ''.join([char for char in message if char not in ["'","."]])
-        message = ' '.join(message.split())
-
-        return message
+        return ' '.join(tokenize(message, SentimentAnalyzerModel.PHRASES))
 
-    @staticmethod
-    def __load_words_from_file(file_path):
-        """
-        Loads a list of LanguageAssets from the given file.
-        """
-        try:
-            with open(file_path, 'r') as file:
-                return [line.strip() for line in file.readlines()]
-        except IOError:
-            raise ValueError(f"Unable to read file at {file_path}")
+
+def _merge_weights(defaults, trained):
+    """
+    Returns the default modifier weights updated with trained ones, keyed by
+    canonical term so "a bit" and "a-bit" are the same entry.
+    """
+    weights = {canonical_phrase(term): weight for term, weight in defaults.items()}
+    weights.update((canonical_phrase(term), weight) for term, weight in trained.items())
+    return weights
@@ -0,0 +1,27 @@
+import multiprocessing
+from collections import deque
+
+
+def imap_bounded(function, items, processes, max_pending=None, initializer=None, initargs=()):
+    """
+    Applies function to every item on a pool of worker processes and yields
+    the (item, result) pairs in input order.
+
+    Items are submitted as the results are consumed, with at most max_pending
+    (default: two per process) in flight at once, so a long stream is never
+    fully in memory.
+
+    :param initializer: Called with initargs when each worker process starts.
+    """
+    max_pending = max_pending or 2 * processes
+    with multiprocessing.Pool(processes, initializer=initializer, initargs=initargs) as pool:
+        pending = deque()
+        for item in items:
+            pending.append((item, pool.apply_async(function, (item,))))
+            if len(pending) >= max_pending:
+                item, result = pending.popleft()
+                yield item, result.get()
+
+        while pending:
+            item, result = pending.popleft()
+            yield item, result.get()
@@ -0,0 +1,77 @@
+import threading
+import weakref
+
+# Sentence separators become spaces and apostrophes are dropped, so that
+# splitting a whole message yields exactly the words of all its sentences
+# (see SentimentAnalyzerModel.split_sentences and tokenizer.split_words)
+_SEPARATORS = str.maketrans({"'": None, ".": " ", "?": " ", "!": " "})
+
+# Prefilter of every lexicon index in use, built on first use
+_prefilters = weakref.WeakKeyDictionary()
+_lock = threading.Lock()
+
+
+class Prefilter:
+    """
+    Detects messages that contain no token able to change a score.
+
+    The relevant tokens are every token of a lexicon index (sentiment words
+    and modifiers alike) and every word that starts a phrase. A message none
+    of whose words is relevant scores 0.0 on every sentence, so its exact
+    score is known without tokenizing or vectorizing it: see neutral_score.
+    """
+
+    def __init__(self, index):
+        """
+        :param index: LexiconIndex or OverlayIndex. The prefilter of an
+                      OverlayIndex shares the prefilter of its base index and
+                      only holds the tokens the overlay adds. Tokens the
+                      overlay removes stay relevant, which only means their
+                      messages are scored in full.
+        """
+        base_index = getattr(index, "base", None)
+        if base_index is None:
+            self.base = None
+            self.tokens = (frozenset(token for token, _ in index.items())
+                           | frozenset(index.phrases.first_words))
+            return
+
+        self.base = get_prefilter(base_index)
+        added = {token for token, code in index.overlay_items() if code[0]}
+        if index.phrases is not base_index.phrases:
+            added.update(index.phrases.first_words)
+        self.tokens = frozenset(added - self.base.tokens)
+
+    def __len__(self):
+        return len(self.tokens) + (len(self.base) if self.base is not None else 0)
+
+    def skips(self, message):
+        """
+        Returns True if no word of the message is relevant.
+        """
+        words = message.lower().translate(_SEPARATORS).split()
+        if self.base is not None and not self.base.tokens.isdisjoint(words):
+            return False
+        return self.tokens.isdisjoint(words)
+
+    @staticmethod
+    def neutral_score(message):
+        """
+        Returns the score of a message that skips(): 0 if it has no sentences
+        (it is empty or only .?! characters), 0.0 otherwise, as
+        SentimentAnalyzerV1.evaluate_sentiment would.
+        """
+        return 0.0 if message.strip(".?!") else 0
+
+
+def get_prefilter(index):
+    """
+    Returns the shared Prefilter of a lexicon index.
+    """
+    with _lock:
+        prefilter = _prefilters.get(index)
+    if prefilter is None:
+        prefilter = Prefilter(index)
+        with _lock:
+            prefilter = _prefilters.setdefault(index, prefilter)
+    return prefilter
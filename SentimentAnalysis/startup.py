@@ -0,0 +1,39 @@
+from SentimentAnalysis.Exceptions.errors import InvalidModelError
+
+# Scored by warmup, so that every stage of the pipeline runs once
+WARMUP_MESSAGES = [
+    "The plot was not very good, but the cast was really great!",
+    "Order 12345 shipped.",
+    "",
+]
+
+
+def warmup(model="1.0", **analyzer_options):
+    """
+    Loads everything an analyzer needs up front, so that the first request
+    of a worker is not slowed down by it: NumPy, the vectorizer library, the
+    wordset, its lexicon index and prefilter (or token table). A few sample
+    messages are then scored, one by one and as a batch.
+
+    Importing SentimentAnalysis loads none of these; call warmup() where a
+    worker is initialized, e.g. in a process pool initializer or before a
+    serverless handler starts serving.
+
+    :param model: "1.0" for SentimentAnalyzerV1, "2.0" for SentimentAnalyzerV2.
+    :param analyzer_options: Passed to the analyzer.
+    :return: The warmed-up analyzer, which may be used directly.
+    :raises InvalidModelError: If model is neither "1.0" nor "2.0".
+    """
+    if model == "1.0":
+        from SentimentAnalysis.v1.analyzer import SentimentAnalyzerV1 as analyzer_class
+    elif model == "2.0":
+        from SentimentAnalysis.v2.analyzer import SentimentAnalyzerV2 as analyzer_class
+    else:
+        raise InvalidModelError(model)
+
+    analyzer = analyzer_class(**analyzer_options)
+    for message in WARMUP_MESSAGES:
+        analyzer.evaluate_sentiment(message)
+    analyzer.evaluate_many(WARMUP_MESSAGES)
+
+    return analyzer
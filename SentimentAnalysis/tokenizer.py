@@ -0,0 +1,168 @@
+import string
+
+# Characters dropped from every token. Dropping apostrophes also normalizes
+# contractions ("don't" -> "dont").
+_DROPPED_CHARACTERS = str.maketrans("", "", "'.")
+
+# "like" is a positive word, but in "like a" / "like an" it is a comparison.
+# These phrases are merged like lexicon phrases so that "like" is not scored,
+# and belong to no lexicon themselves.
+GUARD_PHRASES = ("like a", "like an")
+
+# Characters stripped from both ends of every token by strip_punctuation
+_EDGE_PUNCTUATION = string.punctuation
+
+# Key marking the end of a phrase in a PhraseMatcher trie node
+_END = None
+
+
+def phrase_words(entry):
+    """
+    Returns the words of a lexicon entry, normalized like tokens. Words may be
+    separated by spaces or hyphens ("a bit", "a-lot", "narrow-minded").
+    """
+    return [word.translate(_DROPPED_CHARACTERS) for word in entry.replace("-", " ").split()]
+
+
+def canonical_phrase(entry):
+    """
+    Spells a lexicon entry the way the tokenizer emits it: multi-word entries
+    become a single hyphenated token ("a bit" -> "a-bit"), single words are
+    returned unchanged.
+    """
+    words = phrase_words(entry)
+    return "-".join(words) if len(words) > 1 else entry
+
+
+class PhraseMatcher:
+    """
+    A token trie of multi-word phrases, built once per lexicon.
+
+    merge() rewrites a token list in one left-to-right pass, replacing every
+    leftmost-longest phrase match by its hyphenated token, so a lexicon may
+    contain phrases of any length and number without a per-phrase cost.
+    """
+
+    def __init__(self, phrases=()):
+        """
+        :param phrases: Iterable of entries; single-word entries are ignored.
+        """
+        self.__root = {}
+        self.__count = 0
+
+        for entry in phrases:
+            words = phrase_words(entry)
+            if len(words) < 2:
+                continue
+
+            node = self.__root
+            for word in words:
+                node = node.setdefault(word, {})
+            if _END not in node:
+                self.__count += 1
+            node[_END] = "-".join(words)
+
+        self.__first_words = self.__root.keys()
+
+    def __len__(self):
+        return self.__count
+
+    def __reduce__(self):
+        return PhraseMatcher, (self.phrases(),)
+
+    def phrases(self):
+        """
+        Returns the hyphenated tokens of every phrase.
+        """
+        found = []
+        nodes = [self.__root]
+        while nodes:
+            node = nodes.pop()
+            for word, child in node.items():
+                if word is _END:
+                    found.append(child)
+                else:
+                    nodes.append(child)
+        return sorted(found)
+
+    @property
+    def first_words(self):
+        """
+        Words that start at least one phrase.
+        """
+        return self.__first_words
+
+    def merge(self, tokens):
+        """
+        Returns tokens with every phrase merged into a single token.
+        """
+        root = self.__root
+        if self.__first_words.isdisjoint(tokens):
+            return tokens
+
+        merged = []
+        append = merged.append
+        i = 0
+        length = len(tokens)
+
+        while i < length:
+            node = root.get(tokens[i])
+            if node is None:
+                append(tokens[i])
+                i += 1
+                continue
+
+            # Walk the trie as far as the tokens allow, remembering the
+            # longest complete phrase
+            match = None
+            j = i + 1
+            while True:
+                if _END in node:
+                    match, end = node[_END], j
+                if j == length:
+                    break
+                node = node.get(tokens[j])
+                if node is None:
+                    break
+                j += 1
+
+            if match is None:
+                append(tokens[i])
+                i += 1
+            else:
+                append(match)
+                i = end
+
+        return merged
+
+
+# Matcher of the guard phrases alone, used when no lexicon is given
+_GUARDS = PhraseMatcher(GUARD_PHRASES)
+
+
+def split_words(message):
+    """
+    Lowercases a message, drops apostrophes and periods and splits it on
+    whitespace, without merging phrases.
+    """
+    return message.lower().translate(_DROPPED_CHARACTERS).split()
+
+
+def strip_punctuation(words):
+    """
+    Strips punctuation from both ends of every word ("good," -> "good",
+    "(great)" -> "great") and drops words that were punctuation only.
+    """
+    stripped = [word.strip(_EDGE_PUNCTUATION) for word in words]
+    return [word for word in stripped if word]
+
+
+def tokenize(message, phrases=None):
+    """
+    Splits a message into normalized tokens: lowercases it, drops apostrophes
+    and periods, splits on whitespace and merges multi-word phrases.
+
+    :param phrases: PhraseMatcher of the lexicon in use, typically
+                    LexiconIndex.phrases. Defaults to the guard phrases only.
+    """
+    return (_GUARDS if phrases is None else phrases).merge(split_words(message))
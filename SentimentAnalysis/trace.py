@@ -0,0 +1,86 @@
+def vector_components(vector):
+    """
+    Returns the (magnitude, polarity, intensity) of a sentiment vector, which
+    may be a SentimentVector value or a pointer to one.
+    """
+    if hasattr(vector, "contents"):
+        vector = vector.contents
+    return vector.magnitude, vector.polarity, vector.intensity
+
+
+class ClauseTrace:
+    """
+    Records how a single clause was scored.
+    """
+    __slots__ = ("tokens", "positive_count", "negative_count", "negation_count",
+                 "quantifier_multiplier", "diminisher_multiplier", "vector", "score")
+
+    def __init__(self, tokens, positive_count, negative_count, negation_count,
+                 quantifier_multiplier, diminisher_multiplier, vector):
+        self.tokens = tokens
+        self.positive_count = positive_count
+        self.negative_count = negative_count
+        self.negation_count = negation_count
+        self.quantifier_multiplier = quantifier_multiplier
+        self.diminisher_multiplier = diminisher_multiplier
+        self.vector = vector
+        self.score = None
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+class SentenceTrace:
+    """
+    Records how a sentence was split into clauses and scored. When the sentence
+    holds conjunctions, vector and score belong to the combined clauses.
+    """
+    __slots__ = ("tokens", "clauses", "vector", "score")
+
+    def __init__(self, tokens):
+        self.tokens = tokens
+        self.clauses = []
+        self.vector = None
+        self.score = None
+
+    def to_dict(self):
+        return {"tokens": self.tokens,
+                "clauses": [clause.to_dict() for clause in self.clauses],
+                "vector": self.vector,
+                "score": self.score}
+
+
+class SentimentTrace:
+    """
+    Structured record of an evaluation: every sentence, every clause and the
+    final momentum-based score. str() renders the verbose log.
+    """
+    __slots__ = ("message", "sentence_parts", "sentences", "score")
+
+    def __init__(self, message, sentence_parts):
+        self.message = message
+        self.sentence_parts = sentence_parts
+        self.sentences = []
+        self.score = None
+
+    def to_dict(self):
+        return {"message": self.message,
+                "sentences": [sentence.to_dict() for sentence in self.sentences],
+                "score": self.score}
+
+    def __str__(self):
+        verbose_log = [f"Proccessing text: '{self.message}'\n",
+                       f"Sentences: {self.sentence_parts}\n"]
+
+        for sentence in self.sentences:
+            verbose_log.append(f"\tCurrent Sentence: {' '.join(sentence.tokens)}\n")
+
+            if len(sentence.clauses) > 1:
+                verbose_log.append(f"\t\tConjunctions present:\t"
+                                   f"{[' '.join(clause.tokens) for clause in sentence.clauses]}\n")
+                verbose_log.append(f"\t\tCombined Score: \t\t{sentence.score}\n")
+            else:
+                verbose_log.append(f"\tSentiment score: {sentence.score}\n")
+
+        verbose_log.append(f"\nfinal score: {self.score}")
+        return "".join(verbose_log)
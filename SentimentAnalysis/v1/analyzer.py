@@ -1,130 +1,393 @@
 from SentimentAnalysis.model import SentimentAnalyzerModel
 from SentimentAnalysis.Algorithms.v1.sentiment_algorithms import *
-from Vectorizer.v1 import vectorizer
+from SentimentAnalysis.lexicon import (NO_ENTRY, POSITIVE, NEGATIVE, NEGATION,
+                                       QUANTIFIER, DIMINISHER, CONJUNCTION)
+from SentimentAnalysis.metrics import CountingBackend
+from SentimentAnalysis.prefilter import get_prefilter
+from SentimentAnalysis.tokenizer import tokenize
+from SentimentAnalysis.v1.conversation import Conversation
+from SentimentAnalysis.trace import (ClauseTrace, SentenceTrace, SentimentTrace,
+                                     vector_components)
+from vectorizer.v1 import vectorizer
 
 
 class SentimentAnalyzerV1(SentimentAnalyzerModel):
     def __init__(self, wordset="standard", positive_words_file=None,
-                 negative_words_file=None):
-        super().__init__("1.0", wordset, positive_words_file, negative_words_file)
+                 negative_words_file=None, lexicon_file=None,
+                 weights_file=None, backend=None,
+                 clause_cache=None, metrics=None, base_wordset=None,
+                 prefilter=True):
+        """
+        :param backend: Vectorizer backend name ("ctypes", "numpy", "python" or
+                        "auto") or backend object. Defaults to the
+                        SENTIMENT_VECTORIZER_BACKEND environment variable.
+        :param clause_cache: Optional ClauseCache memoizing clause features. It
+                             may be shared between analyzers and threads.
+        :param metrics: Optional Metrics to record stage timings and counts
+                        in, see set_metrics.
+        :param base_wordset: Store a custom wordset as an overlay on this
+                             bundled wordset, see SentimentAnalyzerModel.
+        :param prefilter: Score messages that contain no lexicon or modifier
+                          token directly, without the pipeline (see
+                          SentimentAnalysis.prefilter.Prefilter). Scores are
+                          the same either way.
+        """
+        super().__init__("1.0", wordset, positive_words_file, negative_words_file,
+                         lexicon_file, weights_file, base_wordset)
+        self.vectorizer = vectorizer.get_backend(backend)
+        self.clause_cache = clause_cache
+        self.prefilter = get_prefilter(self.lexicon) if prefilter else None
+        self.metrics = None
+        self.set_metrics(metrics)
 
     def evaluate_sentiment(self, message, verbose=False):
         """
         Evaluates the sentiment of the given message.
+
+        :param verbose: Print the trace of the evaluation (see trace_sentiment).
+        """
+        if verbose:
+            trace = self.trace_sentiment(message)
+            print(trace)
+            return trace.score
+
+        if self.metrics is not None:
+            return self.__evaluate_instrumented(message)
+
+        if self.prefilter is not None and self.prefilter.skips(message):
+            return self.prefilter.neutral_score(message)
+
+        sentiment_vectors = [self.__sentence_vector(tokenize(sentence, self.lexicon.phrases))
+                             for sentence in self.split_sentences(message)]
+
+        # Calculate the score for all vectors
+        score = momentum_based_sentiment(sentiment_vectors, backend=self.vectorizer)
+        self.__release(sentiment_vectors)
+        return score
+
+    def set_metrics(self, metrics):
+        """
+        Attaches a Metrics, or detaches it with None.
+
+        While attached, evaluate_sentiment records per-stage timers (prefilter,
+        split_sentences, tokenize, split_conjunctions, clause_features,
+        vectorize, momentum) and message, sentence, token and clause counts,
+        and every vectorizer call is counted. evaluate_sentiment and
+        evaluate_many count the messages the prefilter skipped as
+        "prefiltered". Detached, no instrumentation code runs at all.
+        """
+        if isinstance(self.vectorizer, CountingBackend):
+            self.vectorizer = self.vectorizer.backend
+        if metrics is not None:
+            self.vectorizer = CountingBackend(self.vectorizer, metrics)
+        self.metrics = metrics
+
+    def metrics_snapshot(self):
+        """
+        Returns the snapshot of the attached Metrics, with the share of
+        messages skipped by the prefilter and the clause cache statistics if
+        a cache is set.
+        """
+        if self.metrics is None:
+            raise RuntimeError("No metrics attached; call set_metrics() first")
+
+        snapshot = self.metrics.snapshot()
+        counters = snapshot["counters"]
+        messages = counters.get("messages", 0)
+        snapshot["prefiltered_share"] = (counters.get("prefiltered", 0) / messages
+                                         if messages else 0.0)
+        if self.clause_cache is not None:
+            snapshot["clause_cache"] = self.clause_cache.stats()
+        return snapshot
+
+    def sentence_scores(self, message):
+        """
+        Returns the score of every sentence of the message, in order, before
+        the momentum-based reduction.
+        """
+        sentiment_vectors = [self.__sentence_vector(tokenize(sentence, self.lexicon.phrases))
+                             for sentence in self.split_sentences(message)]
+        scores = [self.vectorizer.v2s(vector) for vector in sentiment_vectors]
+        self.__release(sentiment_vectors)
+        return scores
+
+    def conversation(self, state=None):
+        """
+        Starts, or resumes from a saved state, an incremental scorer for a
+        conversation. Each message added costs O(its own length), instead of
+        re-evaluating the whole transcript.
+        """
+        return Conversation(self, state)
+
+    def trace_sentiment(self, message):
+        """
+        Evaluates the sentiment of the given message and records how it was
+        scored: the tokens, counts, multipliers, vector and score of every
+        clause and sentence. Tracing is opt-in; evaluate_sentiment collects
+        nothing.
+
+        :return: SentimentTrace whose score equals evaluate_sentiment(message).
         """
         sentence_parts = self.split_sentences(message)
+        trace = SentimentTrace(message, sentence_parts)
         sentiment_vectors = []
 
-        # Implementing detailed logging
-        verbose_log = [f"Proccessing text: '{message}'\n",
-                       f"Sentences: {sentence_parts}\n"]
-
         for sentence in sentence_parts:
-            sentence = self.clean_message(sentence)
-
-            # Logging details
-            verbose_log.append(f"\tCurrent Sentence: {sentence}\n")
-
-            # Check if sentence has conjunctions present
-            conjunctions_split = self.__handle_conjunctions(sentence)
-            if len(conjunctions_split) > 1:
-                # Logging details
-                verbose_log.append(f"\t\tConjunctions present:\t"
-                                   f"{conjunctions_split}\n")
-
-                v1 = self.__compute_sentiment(conjunctions_split[0])
-                v2 = self.__compute_sentiment(conjunctions_split[1])
-                combined_score = (vectorizer.combine(v1, v2))
-                sentiment_vectors.append(combined_score)
-
-                # Logging details
-                verbose_log.append(f"\t\tCombined Score: \t\t"
-                                   f"{vectorizer.v2s(combined_score)}\n")
-            else:
-                sentiment_vector = self.__compute_sentiment(sentence)
-                sentiment_vectors.append(sentiment_vector)
-
-                # Logging details
-                verbose_log.append(f"\tSentiment score: "
-                                   f"{vectorizer.v2s(sentiment_vector)}\n")
+            sentence_trace = SentenceTrace(tokenize(sentence, self.lexicon.phrases))
+            sentiment_vector = self.__sentence_vector(sentence_trace.tokens, sentence_trace)
+            sentiment_vectors.append(sentiment_vector)
+
+            sentence_trace.vector = vector_components(sentiment_vector)
+            sentence_trace.score = self.vectorizer.v2s(sentiment_vector)
+            trace.sentences.append(sentence_trace)
 
         # Calculate the score for all vectors
-        score = momentum_based_sentiment(sentiment_vectors)
+        trace.score = momentum_based_sentiment(sentiment_vectors, backend=self.vectorizer)
+        self.__release(sentiment_vectors)
+        return trace
 
-        # Logging details
-        verbose_log.append(f"\nfinal score: {score}")
+    def evaluate_many(self, messages):
+        """
+        Evaluates the sentiment of every message in the given iterable.
 
-        # Print details
-        if verbose:
-            print("".join(verbose_log))
+        The (magnitude, polarity, intensity) triples of all clauses are kept in
+        columnar arrays so that the clause reduction, v2s and the momentum
+        reduction run once per batch instead of once per clause. Messages the
+        prefilter skips add no clauses. Scores match evaluate_sentiment.
 
-        return score
+        :param messages: Iterable of messages to evaluate.
+        :return: NumPy array of float64 scores, one per message.
+        """
+        # Imported on first use, so that importing the analyzer stays light
+        import numpy as np
+
+        clauses = []
+        clause_offsets = [0]
+        offsets = [0]
+        skips = self.prefilter.skips if self.prefilter is not None else None
+        skipped = 0
+
+        for message in messages:
+            if skips is not None and skips(message):
+                # No sentences: the momentum reduction scores it 0.0
+                offsets.append(len(clause_offsets) - 1)
+                skipped += 1
+                continue
+
+            for sentence in self.split_sentences(message):
+                tokens = tokenize(sentence, self.lexicon.phrases)
+                clauses.extend(self.__compute_features(clause)
+                               for clause in self.__sentence_clauses(tokens))
+                clause_offsets.append(len(clauses))
+
+            offsets.append(len(clause_offsets) - 1)
+
+        if self.metrics is not None:
+            self.metrics.increment("messages", len(offsets) - 1)
+            self.metrics.increment("prefiltered", skipped)
+
+        offsets = np.asarray(offsets, dtype=np.int64)
+        if not clauses:
+            return np.zeros(len(offsets) - 1, dtype=np.float64)
+
+        features = np.array(clauses, dtype=np.float64)
+
+        # Reduce the clauses of every sentence to its vector in one pass
+        magnitudes, polarities, intensities = self.vectorizer.combine_reduce_batch(
+            features[:, 0].astype(np.intc), features[:, 1].astype(np.intc),
+            features[:, 2], np.asarray(clause_offsets, dtype=np.int64))
+
+        scores = self.vectorizer.v2s_batch(magnitudes, polarities, intensities)
+        return momentum_based_sentiment_batch(scores, offsets, backend=self.vectorizer)
 
     # ---- HELPER FUNCTIONS ----
 
-    def __compute_sentiment(self, sentence):
+    def __evaluate_instrumented(self, message):
+        """
+        evaluate_sentiment with every stage timed into self.metrics.
+        """
+        metrics = self.metrics
+        timer = metrics.timer
+
+        with timer("evaluate_sentiment"):
+            if self.prefilter is not None:
+                with timer("prefilter"):
+                    skipped = self.prefilter.skips(message)
+                if skipped:
+                    metrics.increment("messages")
+                    metrics.increment("prefiltered")
+                    return self.prefilter.neutral_score(message)
+
+            with timer("split_sentences"):
+                sentences = self.split_sentences(message)
+
+            sentiment_vectors = []
+            for sentence in sentences:
+                with timer("tokenize"):
+                    tokens = tokenize(sentence, self.lexicon.phrases)
+                with timer("split_conjunctions"):
+                    clauses = self.__sentence_clauses(tokens)
+                with timer("clause_features"):
+                    features = [self.__compute_features(clause) for clause in clauses]
+                with timer("vectorize"):
+                    vectors = [self.vectorizer.s2v(*triple) for triple in features]
+                    if len(vectors) > 1:
+                        sentiment_vectors.append(self.vectorizer.combine_reduce(vectors))
+                        self.__release(vectors)
+                    else:
+                        sentiment_vectors.append(vectors[0])
+
+                metrics.increment("tokens", len(tokens))
+                metrics.increment("clauses", len(clauses))
+
+            with timer("momentum"):
+                score = momentum_based_sentiment(sentiment_vectors, backend=self.vectorizer)
+                self.__release(sentiment_vectors)
+
+        metrics.increment("messages")
+        metrics.increment("sentences", len(sentences))
+        return score
+
+    def __sentence_vector(self, tokens, trace=None):
+        """
+        Computes the sentiment vector of a tokenized sentence, combining its
+        clauses if conjunctions are present.
+        """
+        clauses = self.__sentence_clauses(tokens)
+        if len(clauses) > 1:
+            vectors = [self.__compute_sentiment(clause, trace) for clause in clauses]
+            sentiment_vector = self.vectorizer.combine_reduce(vectors)
+            self.__release(vectors)
+            return sentiment_vector
+
+        return self.__compute_sentiment(tokens, trace)
+
+    def __release(self, vectors):
+        """
+        Frees vectors that a heap-mode backend allocated in the library. Values
+        of the other modes and backends are reclaimed by the garbage collector.
+        """
+        if getattr(self.vectorizer, "mode", "value") == "heap":
+            for vector in vectors:
+                self.vectorizer.free(vector)
+
+    def __sentence_clauses(self, tokens):
+        """
+        Splits a tokenized sentence into its clauses. Every clause is kept, so
+        run-on sentences are scored completely: the clause vectors are reduced
+        pairwise, as a balanced tree, by combine_reduce.
+        """
+        conjunctions_split = self.__handle_conjunctions(tokens)
+        return conjunctions_split if len(conjunctions_split) > 1 else [tokens]
+
+    def __compute_sentiment(self, words, trace=None):
         """
-        Computes the sentiment of a sentence, considering positive and negative
-        words, negations, quantifiers, and diminishers.
+        Computes the sentiment vector of a tokenized sentence.
         """
-        words = sentence.split()
-        positive_count = sum(
-            1 for word in words if word in self.positive_words)
-        negative_count = sum(
-            1 for word in words if word in self.negative_words)
-        negation_count = sum(1 for word in words if word in self.NEGATIONS)
+        return self.vectorizer.s2v(*self.__compute_features(words, trace))
+
+    def __compute_features(self, words, trace=None):
+        """
+        Returns the (magnitude, polarity, intensity) triple of a tokenized
+        sentence, from the clause cache if one is set.
+
+        :param trace: SentenceTrace to record the clause in, if any. Traced
+                      clauses bypass the cache.
+        """
+        if self.clause_cache is None or trace is not None:
+            return self.__score_clause(words, trace)
+
+        features = self.clause_cache.get(self.lexicon, words)
+        if features is None:
+            features = self.__score_clause(words)
+            self.clause_cache.put(self.lexicon, words, features)
+        return features
 
+    def __score_clause(self, words, trace=None):
+        """
+        Computes the (magnitude, polarity, intensity) triple of a tokenized
+        sentence, considering positive and negative words, negations,
+        quantifiers, and diminishers.
+
+        :param trace: SentenceTrace to record the clause in, if any.
+        """
+        lookup = self.lexicon.lookup
+
+        positive_count = 0
+        negative_count = 0
+        negation_count = 0
         quantifier_multiplier = 1
         diminisher_multiplier = 1
-        previous_word = None
+        previous_negated = False
 
         for word in words:
-            # Apply quantifiers
-            if word in self.QUANTIFIERS:
-                quantifier_multiplier *= self.__apply_quantifier(word, previous_word)
-            # Apply diminishers
-            if word in self.DIMINISHERS:
-                diminisher_multiplier *= self.__apply_diminisher(word, previous_word)
+            flags, quantifier_value, diminisher_value = lookup(word, NO_ENTRY)
+
+            if flags:
+                if flags & POSITIVE:
+                    positive_count += 1
+                if flags & NEGATIVE:
+                    negative_count += 1
+                if flags & NEGATION:
+                    negation_count += 1
+                # Apply quantifiers
+                if flags & QUANTIFIER:
+                    quantifier_multiplier *= self.__apply_quantifier(quantifier_value,
+                                                                     previous_negated)
+                # Apply diminishers
+                if flags & DIMINISHER:
+                    diminisher_multiplier *= self.__apply_diminisher(diminisher_value,
+                                                                     previous_negated)
 
-            previous_word = word
+            previous_negated = flags & NEGATION
 
         base_sentiment = positive_count - negative_count
         negation_adjustment = self.__adjust_for_negations(base_sentiment, negation_count)
 
-        # Return the sentiment vector
+        # Return the sentiment triple
         intensity = quantifier_multiplier * diminisher_multiplier
-        return vectorizer.s2v(base_sentiment, negation_adjustment, intensity)
+        features = base_sentiment, negation_adjustment, intensity
 
-    def __apply_quantifier(self, word, previous_word):
+        if trace is not None:
+            clause = ClauseTrace(words, positive_count, negative_count, negation_count,
+                                 quantifier_multiplier, diminisher_multiplier, features)
+            vector = self.vectorizer.s2v(*features)
+            clause.score = self.vectorizer.v2s(vector)
+            self.vectorizer.free(vector)
+            trace.clauses.append(clause)
+
+        return features
+
+    @staticmethod
+    def __apply_quantifier(quantifier_value, previous_negated):
         """
         Applies the quantifier adjustment based on the previous word's negation status.
         """
-        quantifier_value = self.QUANTIFIERS[word]
-        if previous_word in self.NEGATIONS:
+        if previous_negated:
             return 1 - (quantifier_value - 1)
         return quantifier_value
 
-    def __apply_diminisher(self, word, previous_word):
+    @staticmethod
+    def __apply_diminisher(diminisher_value, previous_negated):
         """
         Applies the diminisher adjustment based on the previous word's negation status.
         """
-        diminisher_value = self.DIMINISHERS[word]
-        if previous_word in self.NEGATIONS:
+        if previous_negated:
             return 1 + (1 - diminisher_value)
         return diminisher_value
 
-    def __handle_conjunctions(self, message):
-        # Further split each sentence by conjunctions
-        words = message.split()
+    def __handle_conjunctions(self, words):
+        # Further split each tokenized sentence by conjunctions
+        flags = self.lexicon.flags
         conjunction_indices = [0]
 
         for i, w in enumerate(words):
-            if w in self.CONJUNCTIONS:
+            if flags(w) & CONJUNCTION:
                 conjunction_indices.append(i + 1)
 
         conjunction_indices.append(len(words))
 
-        split_sentences = [" ".join(words[conjunction_indices[i] : conjunction_indices[i+1]])for
+        split_sentences = [words[conjunction_indices[i] : conjunction_indices[i+1]] for
                            i in range(len(conjunction_indices) -1)]
 
         return split_sentences
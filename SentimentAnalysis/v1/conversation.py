@@ -0,0 +1,37 @@
+from SentimentAnalysis.Algorithms.v1.sentiment_algorithms import MomentumScorer
+
+
+class Conversation:
+    """
+    Scores a conversation message by message.
+
+    The momentum state carries over from one message to the next, so after
+    adding messages m1..mn, score equals evaluate_sentiment of a transcript
+    holding the sentences of m1..mn in order.
+    """
+
+    def __init__(self, analyzer, state=None):
+        """
+        :param analyzer: SentimentAnalyzerV1 used to score every message.
+        :param state: Dict returned by a previous Conversation's state().
+        """
+        self.analyzer = analyzer
+        self.scorer = MomentumScorer.from_dict(state) if state else MomentumScorer()
+
+    @property
+    def score(self):
+        return self.scorer.score
+
+    def add(self, message):
+        """
+        Adds the next message and returns the score of the conversation so far.
+        """
+        for sentence_score in self.analyzer.sentence_scores(message):
+            self.scorer.update(sentence_score)
+        return self.scorer.score
+
+    def state(self):
+        """
+        Returns the serializable (JSON-compatible) state of the conversation.
+        """
+        return self.scorer.to_dict()
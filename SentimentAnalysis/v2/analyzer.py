@@ -1,81 +1,132 @@
+import numpy as np
+
 from SentimentAnalysis.model import SentimentAnalyzerModel
+from SentimentAnalysis.Algorithms.v2 import sentiment_algorithms
+from SentimentAnalysis.tokenizer import split_words, strip_punctuation
+from vectorizer.v2 import vectorizer
 
 
 class SentimentAnalyzerV2(SentimentAnalyzerModel):
+    """
+    Throughput-first analyzer. Every batch of messages is tokenized once into
+    a flat array of integer token IDs (see
+    SentimentAnalysis.Algorithms.v2.sentiment_algorithms.TokenTable), and the
+    clause features, clause reduction and momentum reduction of the whole
+    batch run in a single call of the native v2 vectorizer. Without the
+    compiled library, the same pipeline runs on NumPy arrays.
+
+    Semantics:
+    - "v2": punctuation is stripped from both ends of every token, so "good,"
+      and "(great)" are scored like "good" and "great".
+    - "v1": tokens are exactly those of SentimentAnalyzerV1, and scores are
+      identical to it.
+    """
+    SEMANTICS = ("v2", "v1")
+
     def __init__(self, wordset="standard", positive_words_file=None,
-                 negative_words_file=None):
-        super().__init__("2.0", wordset, positive_words_file, negative_words_file)
+                 negative_words_file=None, lexicon_file=None,
+                 weights_file=None, base_wordset=None, semantics="v2",
+                 native=None, backend=None):
+        """
+        :param semantics: "v2" (default) or "v1" for SentimentAnalyzerV1
+                          compatible scores.
+        :param native: True to require the native v2 vectorizer, False to
+                       always use the NumPy pipeline. By default the native
+                       vectorizer is used if it loads.
+        :param backend: v1 vectorizer backend name or object the NumPy
+                        pipeline reduces clauses and sentences with.
+        """
+        super().__init__("2.0", wordset, positive_words_file, negative_words_file,
+                         lexicon_file, weights_file, base_wordset)
+
+        if semantics not in self.SEMANTICS:
+            raise ValueError(f"Invalid semantics: {semantics}. Choose from {self.SEMANTICS}")
+        self.semantics = semantics
+
+        self.table = sentiment_algorithms.token_table(self.lexicon)
+        self.native = None
+        if native is not False:
+            try:
+                self.native = vectorizer.load()
+            except OSError:
+                if native:
+                    raise
+        self.backend = backend
 
     def evaluate_sentiment(self, message, verbose=False):
         """
         Evaluates the sentiment of the given message.
+
+        :param verbose: Print the tokens and score of every sentence.
         """
-        sentence_parts = self.split_sentences(message)
-        sentiment_vectors = []
+        if not verbose:
+            return float(self.__score([message])[0])
 
-        # Implementing detailed logging
-        verbose_log = [f"Proccessing text: '{message}'\n",
-                       f"Sentences: {sentence_parts}\n"]
+        sentences = self.split_sentences(message)
+        scores, sentence_scores = self.__score([message], sentence_scores=True)
 
-        return 0
+        # Implementing detailed logging
+        verbose_log = [f"Processing text: '{message}'",
+                       f"Sentences: {sentences}"]
+        for sentence, score in zip(sentences, sentence_scores):
+            verbose_log.append(f"  {self.tokenize(sentence)} -> {score:.4f}")
+        verbose_log.append(f"Score: {scores[0]:.4f}")
+        print("\n".join(verbose_log))
 
-    # ---- HELPER FUNCTIONS ----
+        return float(scores[0])
 
-    def __compute_sentiment(self, sentence):
+    def evaluate_many(self, messages):
         """
-        Computes the sentiment of a sentence, considering positive and negative
-        words, negations, quantifiers, and diminishers.
+        Evaluates the sentiment of every message in the given iterable, in a
+        single vectorizer call.
+
+        :param messages: Iterable of messages to evaluate.
+        :return: NumPy array of float64 scores, one per message.
         """
-        pass
+        return self.__score(messages)
 
-    def __apply_quantifier(self, word, previous_word):
+    def sentence_scores(self, message):
         """
-        Applies the quantifier adjustment based on the previous word's negation status.
+        Returns the score of every sentence of the message, in order, before
+        the momentum-based reduction.
         """
-        quantifier_value = self.QUANTIFIERS[word]
-        if previous_word in self.NEGATIONS:
-            return 1 - (quantifier_value - 1)
-        return quantifier_value
+        return self.__score([message], sentence_scores=True)[1].tolist()
 
-    def __apply_diminisher(self, word, previous_word):
+    def tokenize(self, sentence):
         """
-        Applies the diminisher adjustment based on the previous word's negation status.
+        Returns the tokens of a sentence under the analyzer's semantics.
         """
-        diminisher_value = self.DIMINISHERS[word]
-        if previous_word in self.NEGATIONS:
-            return 1 + (1 - diminisher_value)
-        return diminisher_value
-
-    def __handle_conjunctions(self, message):
-        # Further split each sentence by conjunctions
-        words = message.split()
-        conjunction_indices = [0]
-
-        for i, w in enumerate(words):
-            if w in self.CONJUNCTIONS:
-                conjunction_indices.append(i + 1)
+        words = split_words(sentence)
+        if self.semantics == "v2":
+            words = strip_punctuation(words)
+        return self.lexicon.phrases.merge(words)
 
-        conjunction_indices.append(len(words))
-
-        split_sentences = [" ".join(words[conjunction_indices[i] : conjunction_indices[i+1]])for
-                           i in range(len(conjunction_indices) -1)]
-
-        return split_sentences
+    # ---- HELPER FUNCTIONS ----
 
-    @staticmethod
-    def __adjust_for_negations(base_sentiment, negation_count):
+    def __score(self, messages, sentence_scores=False):
         """
-        Adjusts sentiment based on the number of negations in the sentence.
+        Tokenizes every sentence of every message into one token list, encodes
+        it to IDs in one pass and scores all documents in one call.
         """
-        if negation_count == 0:
-            return 1  # No negation, return positive sentiment
-
-        is_odd_negation = negation_count % 2 == 1
-        if base_sentiment > 0 and is_odd_negation:
-            return -1  # Positive sentiment becomes negative
-        elif base_sentiment < 0 and is_odd_negation:
-            return 0  # Negative sentiment becomes neutral
-        elif base_sentiment == 0:
-            return -1 if is_odd_negation else 1  # Neutral becomes negative if odd negation, else positive
-
-        return 1
+        tokenize = self.tokenize
+        tokens = []
+        sentence_offsets = [0]
+        document_offsets = [0]
+
+        for message in messages:
+            for sentence in self.split_sentences(message):
+                tokens.extend(tokenize(sentence))
+                sentence_offsets.append(len(tokens))
+            document_offsets.append(len(sentence_offsets) - 1)
+
+        token_ids = self.table.encode(tokens)
+        sentence_offsets = np.asarray(sentence_offsets, dtype=np.int64)
+        document_offsets = np.asarray(document_offsets, dtype=np.int64)
+
+        if self.native is not None:
+            return self.native.score_documents(self.table, token_ids, sentence_offsets,
+                                               document_offsets, sentence_scores=sentence_scores)
+        return sentiment_algorithms.score_documents(self.table, token_ids, sentence_offsets,
+                                                    document_offsets,
+                                                    sentence_scores=sentence_scores,
+                                                    backend=self.backend)
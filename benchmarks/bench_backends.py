@@ -0,0 +1,155 @@
+"""
+Parity check and benchmark for the vectorizer backends.
+
+Every backend that loads on this machine is first checked against the python
+backend on random vectors (scalar and batch functions, compared bit-for-bit),
+then timed. The script exits non-zero if any backend disagrees.
+
+Run from the repository root:
+    python -m benchmarks.bench_backends --size 100000
+"""
+import argparse
+import random
+import sys
+import time
+
+import numpy as np
+
+from vectorizer.v1 import vectorizer
+
+REFERENCE = "python"
+
+
+def random_columns(rng, size):
+    """
+    Returns random magnitude, polarity and intensity columns covering every
+    branch of v2s and combine.
+    """
+    magnitudes = rng.integers(-6, 7, size).astype(np.intc)
+    polarities = rng.choice(np.array([-1, 0, 1], dtype=np.intc), size)
+    intensities = rng.choice(np.array([1.0, 0.3, 0.57, 0.8, 1.41, 1.63, 2.4]), size)
+    intensities = intensities * rng.choice(np.array([1.0, 1.53, 0.49]), size)
+    return magnitudes, polarities, intensities
+
+
+def random_offsets(rng, size):
+    lengths = rng.integers(0, 12, max(1, size // 6))
+    return np.concatenate([[0], np.minimum(np.cumsum(lengths), size)]).astype(np.longlong)
+
+
+def check_parity(backend, reference, rng, size):
+    """
+    Returns a list of the functions on which backend differs from reference.
+    """
+    failures = []
+    first, second = random_columns(rng, size), random_columns(rng, size)
+
+    scalar = [backend.v2s(backend.s2v(int(m), int(p), float(i))) for m, p, i in zip(*first)]
+    expected = [reference.v2s(reference.s2v(int(m), int(p), float(i))) for m, p, i in zip(*first)]
+    if scalar != expected:
+        failures.append("v2s")
+
+    combined = [backend.toString(backend.combine(backend.s2v(*a), backend.s2v(*b)))
+                for a, b in zip(zip(*[c.tolist() for c in first]),
+                                zip(*[c.tolist() for c in second]))]
+    expected = [reference.toString(reference.combine(reference.s2v(*a), reference.s2v(*b)))
+                for a, b in zip(zip(*[c.tolist() for c in first]),
+                                zip(*[c.tolist() for c in second]))]
+    if combined != expected:
+        failures.append("combine")
+
+    if not np.array_equal(backend.v2s_batch(*first), reference.v2s_batch(*first)):
+        failures.append("v2s_batch")
+
+    for got, want in zip(backend.combine_batch(*first, *second),
+                         reference.combine_batch(*first, *second)):
+        if not np.array_equal(got, want):
+            failures.append("combine_batch")
+            break
+
+    offsets = random_offsets(rng, size)
+    for got, want in zip(backend.combine_reduce_batch(*first, offsets),
+                         reference.combine_reduce_batch(*first, offsets)):
+        if not np.array_equal(got, want):
+            failures.append("combine_reduce_batch")
+            break
+
+    vectors = [backend.s2v(*triple) for triple in zip(*[c[:7].tolist() for c in first])]
+    expected = reference.combine_reduce([reference.s2v(*triple)
+                                         for triple in zip(*[c[:7].tolist() for c in first])])
+    if backend.toString(backend.combine_reduce(vectors)) != reference.toString(expected):
+        failures.append("combine_reduce")
+
+    scores = reference.v2s_batch(*first)
+    if not np.array_equal(backend.momentum_batch(scores, offsets),
+                          reference.momentum_batch(scores, offsets)):
+        failures.append("momentum_batch")
+
+    return failures
+
+
+def best_of(repeat, function, *args):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function(*args)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def bench(backend, rng, size, repeat):
+    """
+    Returns vectors per second for the scalar and batch functions.
+    """
+    first, second = random_columns(rng, size), random_columns(rng, size)
+    scores = backend.v2s_batch(*first)
+    offsets = random_offsets(rng, size)
+    triples = list(zip(*[c.tolist() for c in first]))
+
+    def scalar_loop():
+        for m, p, i in triples:
+            backend.v2s(backend.s2v(m, p, i))
+
+    return {
+        "s2v+v2s": size / best_of(repeat, scalar_loop),
+        "v2s_batch": size / best_of(repeat, backend.v2s_batch, *first),
+        "combine_batch": size / best_of(repeat, backend.combine_batch, *first, *second),
+        "combine_reduce_batch": size / best_of(repeat, backend.combine_reduce_batch, *first, offsets),
+        "momentum_batch": size / best_of(repeat, backend.momentum_batch, scores, offsets),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--size", type=int, default=100000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    random.seed(args.seed)
+
+    names = vectorizer.available_backends()
+    missing = sorted(set(vectorizer.backend_names()) - set(names))
+    print(f"available backends: {names}" + (f" (not loadable: {missing})" if missing else ""))
+
+    reference = vectorizer.get_backend(REFERENCE)
+    failed = False
+    for name in names:
+        failures = check_parity(vectorizer.get_backend(name), reference, rng, min(args.size, 20000))
+        failed = failed or bool(failures)
+        print(f"parity {name:>8}: {'OK' if not failures else 'MISMATCH in ' + ', '.join(failures)}")
+
+    print()
+    print(f"{'backend':>8} " + " ".join(f"{column:>16}" for column in
+                                       ("s2v+v2s/s", "v2s_batch/s", "combine_batch/s",
+                                        "reduce_batch/s", "momentum_batch/s")))
+    for name in names:
+        result = bench(vectorizer.get_backend(name), rng, args.size, args.repeat)
+        print(f"{name:>8} " + " ".join(f"{value:>16,.0f}" for value in result.values()))
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
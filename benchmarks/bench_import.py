@@ -0,0 +1,91 @@
+"""
+Import time and cold start of the package, checked against a budget.
+
+Every measurement runs in a fresh interpreter, repeat times, and the median
+is kept:
+
+    import          import SentimentAnalysis
+    import class    from SentimentAnalysis import SentimentAnalyzerV1
+    first score     import, construct an analyzer and score one message
+    warmup          import and SentimentAnalysis.warmup()
+
+The script exits non-zero if "import" exceeds --budget-ms, or if importing
+the package loaded any module it must not load eagerly (NumPy, pandas,
+SciPy, the analyzers or a vectorizer backend), so it can gate CI.
+
+Run from the repository root:
+    python -m benchmarks.bench_import --budget-ms 50
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+# Modules that importing the package alone must not load
+EAGER_MODULES = ("numpy", "pandas", "scipy", "SentimentAnalysis.v1.analyzer",
+                 "SentimentAnalysis.v2.analyzer", "vectorizer.v1.backends.ctypes_backend")
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+_PROGRAM = """
+import json, sys, time
+start = time.perf_counter()
+{code}
+elapsed = time.perf_counter() - start
+print(json.dumps({{"ms": elapsed * 1000,
+                   "loaded": [m for m in {eager!r} if m in sys.modules]}}))
+"""
+
+CASES = {
+    "import": "import SentimentAnalysis",
+    "import class": "from SentimentAnalysis import SentimentAnalyzerV1",
+    "first score": ("from SentimentAnalysis import SentimentAnalyzerV1\n"
+                    "SentimentAnalyzerV1().evaluate_sentiment('The cast was really great!')"),
+    "warmup": "import SentimentAnalysis\nSentimentAnalysis.warmup()",
+}
+
+
+def measure(code, repeat):
+    """
+    Runs code in repeat fresh interpreters and returns the median time in
+    milliseconds and the eager modules loaded by the last run.
+    """
+    program = _PROGRAM.format(code=code, eager=EAGER_MODULES)
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [ROOT, os.environ.get("PYTHONPATH")])))
+
+    timings = []
+    for _ in range(repeat):
+        output = subprocess.run([sys.executable, "-c", program], env=env, cwd=ROOT,
+                                capture_output=True, text=True, check=True).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+        timings.append(result["ms"])
+    return statistics.median(timings), result["loaded"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--budget-ms", type=float, default=50.0,
+                        help="import time budget in milliseconds (default: 50)")
+    parser.add_argument("--repeat", type=int, default=7)
+    args = parser.parse_args()
+
+    failures = []
+    for name, code in CASES.items():
+        ms, loaded = measure(code, args.repeat)
+        print(f"{name:<14} {ms:>9.1f} ms" + (f"  loaded: {', '.join(loaded)}" if loaded else ""))
+
+        if name == "import":
+            if ms > args.budget_ms:
+                failures.append(f"import took {ms:.1f} ms, over the {args.budget_ms:.0f} ms budget")
+            if loaded:
+                failures.append(f"import loaded {', '.join(loaded)} eagerly")
+
+    for failure in failures:
+        print(f"FAIL {failure}", file=sys.stderr)
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
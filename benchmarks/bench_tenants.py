@@ -0,0 +1,122 @@
+"""
+Memory per tenant of custom wordsets, stored in full or as overlays.
+
+Every tenant gets a custom wordset made of the standard wordset with a few
+words removed and a few (tenant-specific and shared) words added. The same
+tenants are then loaded twice, each time from a cold cache and measured with
+tracemalloc:
+
+    full     wordset="custom"                          (one full lexicon each)
+    overlay  wordset="custom", base_wordset="standard" (differences only)
+
+Scores of both are compared on a sample of messages for every tenant. The
+script exits non-zero if they disagree.
+
+Run from the repository root:
+    python -m benchmarks.bench_tenants --tenants 200 --added 50 --removed 20
+"""
+import argparse
+import gc
+import os
+import random
+import sys
+import tempfile
+import tracemalloc
+
+from SentimentAnalysis.lexicon import clear_cache, load_wordset
+from SentimentAnalysis.v1.analyzer import SentimentAnalyzerV1
+
+SAMPLE_MESSAGES = [
+    "The plot was brilliant but the acting felt a bit flat.",
+    "I would not recommend it, the ending was awful and too long!",
+    "Really enjoyed it. The music was lovely and the cast superb.",
+]
+
+
+def write_tenants(directory, tenants, added, removed, seed=0):
+    """
+    Writes the word files of every tenant and returns their paths and the
+    words each tenant added, as (positive file, negative file, added words).
+    """
+    rng = random.Random(seed)
+    base = load_wordset("standard")
+    positive_words, negative_words = sorted(base.positive_words), sorted(base.negative_words)
+    shared_words = [f"shared{i}" for i in range(added)]
+
+    files = []
+    for tenant in range(tenants):
+        dropped = set(rng.sample(positive_words, removed // 2)
+                      + rng.sample(negative_words, removed - removed // 2))
+        own_words = [f"tenant{tenant}word{i}" for i in range(added // 2)]
+        extra = own_words + rng.sample(shared_words, added - added // 2)
+
+        positive_file = os.path.join(directory, f"tenant{tenant}_positive.txt")
+        negative_file = os.path.join(directory, f"tenant{tenant}_negative.txt")
+        with open(positive_file, "w") as file:
+            file.write("\n".join([w for w in positive_words if w not in dropped]
+                                 + extra[::2]))
+        with open(negative_file, "w") as file:
+            file.write("\n".join([w for w in negative_words if w not in dropped]
+                                 + extra[1::2]))
+        files.append((positive_file, negative_file, extra))
+
+    return files
+
+
+def load_tenants(files, base_wordset):
+    """
+    Loads every tenant from a cold cache and returns the analyzers and the
+    bytes traced per tenant.
+    """
+    clear_cache()
+    gc.collect()
+
+    # The base wordset is shared by every overlay tenant; load it up front
+    # so only the per-tenant cost is measured
+    SentimentAnalyzerV1("standard", backend="python")
+
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    analyzers = [SentimentAnalyzerV1("custom", positive_file, negative_file,
+                                     base_wordset=base_wordset, backend="python")
+                 for positive_file, negative_file, _ in files]
+    gc.collect()
+    used = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+
+    return analyzers, used / len(files)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--tenants", type=int, default=200)
+    parser.add_argument("--added", type=int, default=50, help="custom words per tenant")
+    parser.add_argument("--removed", type=int, default=20, help="base words removed per tenant")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        files = write_tenants(directory, args.tenants, args.added, args.removed)
+
+        full, full_bytes = load_tenants(files, None)
+        full_scores = [[analyzer.evaluate_sentiment(message + " " + " ".join(extra[:3]))
+                        for message in SAMPLE_MESSAGES]
+                       for analyzer, (_, _, extra) in zip(full, files)]
+        del full
+
+        overlay, overlay_bytes = load_tenants(files, "standard")
+        overlay_scores = [[analyzer.evaluate_sentiment(message + " " + " ".join(extra[:3]))
+                           for message in SAMPLE_MESSAGES]
+                          for analyzer, (_, _, extra) in zip(overlay, files)]
+        id_bytes = sum(analyzer.words.nbytes for analyzer in overlay) / len(overlay)
+
+    mismatches = sum(a != b for a, b in zip(full_scores, overlay_scores))
+    print(f"{args.tenants} tenants, {args.added} words added and {args.removed} removed each")
+    print(f"full:    {full_bytes:>12,.0f} bytes/tenant")
+    print(f"overlay: {overlay_bytes:>12,.0f} bytes/tenant ({id_bytes:,.0f} in ID arrays)")
+    print(f"ratio:   {full_bytes / overlay_bytes:>12.1f}x")
+    print(f"score mismatches: {mismatches}")
+    sys.exit(1 if mismatches else 0)
+
+
+if __name__ == "__main__":
+    main()
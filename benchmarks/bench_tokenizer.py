@@ -0,0 +1,110 @@
+"""
+Benchmark of the tokenizer against the previous clean_message.
+
+The previous implementation (a str.replace per contraction, one re.sub per
+phrase and a per-character filter, followed by split) is kept below as the
+baseline. Both are run on synthetic long reviews and their outputs compared.
+The tokenizer merges the phrases of the built-in modifier tables, so outputs
+differ where the legacy rules missed a phrase ("a bit", "at all", "due to")
+or swallowed one ("like a lot").
+
+Run from the repository root:
+    python -m benchmarks.bench_tokenizer --reviews 2000 --words 400
+"""
+import argparse
+import random
+import re
+import time
+
+from SentimentAnalysis.model import SentimentAnalyzerModel
+from SentimentAnalysis.tokenizer import tokenize
+
+VOCABULARY = (
+    "the movie was really good but the ending felt a bit rushed and kind of "
+    "boring even though i liked the cast it's not really my genre so that "
+    "says a lot i don't think i'd watch it again in case you wonder the "
+    "music was like a dream and the acting sort of worked provided that you "
+    "ignore a little bit of the plot. great! awful? wasn't isn't can't"
+).split()
+
+
+def legacy_clean_message(message):
+    """
+    clean_message as it was before the single-pass tokenizer.
+    """
+    message = message.lower()
+
+    contractions = {
+        "wasn't": "wasnt", "can't": "cant", "don't": "dont",
+        "didn't": "didnt", "isn't": "isnt", "won't": "wont",
+        "haven't": "havent", "shouldn't": "shouldnt", "wouldn't": "wouldnt",
+        "couldn't": "couldnt", "you're": "youre", "i'm": "im",
+        "he's": "hes", "she's": "shes", "it's": "its", "they're": "theyre"
+    }
+
+    for contraction, replacement in contractions.items():
+        message = message.replace(contraction, replacement)
+
+    message = re.sub(r'\b(a lot)\b', 'a-lot', message)
+    message = re.sub(r'\b(a little)\b', 'a-little', message)
+    message = re.sub(r'\b(not really)\b', 'not-really', message)
+    message = re.sub(r'\b(kind of)\b', 'kind-of', message)
+    message = re.sub(r'\b(sort of)\b', 'sort-of', message)
+    message = re.sub(r'\b(a bit)\b', 'a-bit', message)
+    message = re.sub(r'\b(so that)\b', 'so-that', message)
+    message = re.sub(r'\b(even though)\b', 'even-though', message)
+    message = re.sub(r'\b(provided that)\b', 'provided-that', message)
+    message = re.sub(r'\b(in case)\b', 'in-case', message)
+    message = re.sub(r'\blike a\b', 'like-a', message)
+    message = re.sub(r'\blike an\b', 'like-an', message)
+
+    message = ''.join([char for char in message if char not in ["'", "."]])
+    message = ' '.join(message.split())
+
+    return message
+
+
+def legacy_tokenize(message):
+    return legacy_clean_message(message).split()
+
+
+def model_tokenize(message):
+    return tokenize(message, SentimentAnalyzerModel.PHRASES)
+
+
+def synthetic_reviews(count, words, seed=0):
+    rng = random.Random(seed)
+    return [" ".join(rng.choice(VOCABULARY) for _ in range(words)) for _ in range(count)]
+
+
+def best_of(repeat, function, reviews):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for review in reviews:
+            function(review)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--reviews", type=int, default=2000)
+    parser.add_argument("--words", type=int, default=400)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    reviews = synthetic_reviews(args.reviews, args.words)
+    mismatches = sum(model_tokenize(review) != legacy_tokenize(review) for review in reviews)
+
+    legacy = best_of(args.repeat, legacy_tokenize, reviews)
+    current = best_of(args.repeat, model_tokenize, reviews)
+
+    print(f"{args.reviews} reviews x {args.words} words, output mismatches: {mismatches}")
+    print(f"legacy clean_message: {args.reviews / legacy:>12,.0f} reviews/s")
+    print(f"tokenize:             {args.reviews / current:>12,.0f} reviews/s")
+    print(f"speedup:              {legacy / current:>12.2f}x")
+
+
+if __name__ == "__main__":
+    main()
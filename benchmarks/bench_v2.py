@@ -0,0 +1,100 @@
+"""
+Throughput of the v2 engine against the v1 analyzer.
+
+Every corpus of benchmarks.suite is scored, for both wordsets, by:
+
+    v1 evaluate_sentiment   SentimentAnalyzerV1, one message at a time
+    v1 evaluate_many        SentimentAnalyzerV1, columnar batch
+    v2 native               SentimentAnalyzerV2.evaluate_many, compiled vectorizer.cpp
+    v2 numpy                SentimentAnalyzerV2.evaluate_many, NumPy pipeline
+    v2 evaluate_sentiment   SentimentAnalyzerV2, one message at a time
+
+with semantics="v1", whose scores must equal SentimentAnalyzerV1's exactly.
+The script exits non-zero if any score differs. The v2 semantics are then
+timed as well, and the share of messages they score differently reported.
+
+Run from the repository root (build vectorizer/v2/vectorizer.cpp first for
+the native rows):
+    python -m benchmarks.bench_v2 --size 2000
+"""
+import argparse
+import sys
+import time
+
+import numpy as np
+
+from benchmarks.suite import WORDSETS, make_corpora
+from SentimentAnalysis.v1.analyzer import SentimentAnalyzerV1
+from SentimentAnalysis.v2.analyzer import SentimentAnalyzerV2
+
+
+def best_time(function, messages, repeat):
+    """
+    Returns the fastest of repeat runs of function(messages), and its result.
+    """
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function(messages)
+        elapsed = time.perf_counter() - start
+        if best is None or elapsed < best:
+            best = elapsed
+    return best, result
+
+
+def one_by_one(analyzer):
+    return lambda messages: [float(analyzer.evaluate_sentiment(message)) for message in messages]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--size", type=int, default=2000, help="messages per corpus")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--backend", help="v1 vectorizer backend")
+    args = parser.parse_args()
+
+    corpora = make_corpora(args.size, args.seed)
+    mismatches = 0
+
+    print(f"{'benchmark':<44} {'messages/s':>12} {'vs v1':>7}")
+    for wordset in WORDSETS:
+        v1 = SentimentAnalyzerV1(wordset, backend=args.backend)
+        engines = [("v1 evaluate_many", v1.evaluate_many)]
+        try:
+            native = SentimentAnalyzerV2(wordset, semantics="v1", native=True)
+            engines.append(("v2 native", native.evaluate_many))
+        except OSError as e:
+            print(f"{wordset}: v2 native skipped ({e})", file=sys.stderr)
+            native = None
+        fallback = SentimentAnalyzerV2(wordset, semantics="v1", native=False,
+                                       backend=args.backend)
+        engines.append(("v2 numpy", fallback.evaluate_many))
+        engines.append(("v2 evaluate_sentiment", one_by_one(native or fallback)))
+
+        for corpus, messages in corpora.items():
+            v1_seconds, expected = best_time(one_by_one(v1), messages, args.repeat)
+            print(f"{wordset + '/' + corpus + '/v1 evaluate_sentiment':<44} "
+                  f"{len(messages) / v1_seconds:>12,.0f} {1:>6.1f}x")
+
+            for name, function in engines:
+                seconds, scores = best_time(function, messages, args.repeat)
+                differing = int((np.asarray(scores, dtype=np.float64) != expected).sum())
+                mismatches += differing
+                print(f"{wordset + '/' + corpus + '/' + name:<44} "
+                      f"{len(messages) / seconds:>12,.0f} {v1_seconds / seconds:>6.1f}x"
+                      + (f"  {differing} MISMATCHES" if differing else ""))
+
+            v2 = SentimentAnalyzerV2(wordset, native=native is not None, backend=args.backend)
+            seconds, scores = best_time(v2.evaluate_many, messages, args.repeat)
+            changed = float(np.mean(scores != np.asarray(expected)))
+            print(f"{wordset + '/' + corpus + '/v2 semantics':<44} "
+                  f"{len(messages) / seconds:>12,.0f} {v1_seconds / seconds:>6.1f}x"
+                  f"  ({changed:.1%} scored differently)")
+
+    print(f"v1-compatible score mismatches: {mismatches}")
+    sys.exit(1 if mismatches else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Soak benchmark for the vectorizer allocation modes.
+
+Scores the same messages over and over and samples the resident set size of
+the process. In "value" mode the vectors are Python values; in "heap" mode
+every s2v and combine mallocs a vector in the library, which the analyzer
+frees once the message is scored. RSS stays flat in both modes; a growing RSS
+means a vector is not freed.
+
+Run from the repository root:
+    python -m benchmarks.soak_vectorizer --mode value --iterations 200000
+"""
+import argparse
+import os
+import resource
+import time
+
+from SentimentAnalysis import SentimentAnalyzerV1
+from vectorizer.v1 import vectorizer
+
+MESSAGES = [
+    "I really love this movie. It was not bad but the ending was terrible!",
+    "thanks so much",
+    "not good",
+    "The plot was kind of boring and the acting was a bit weak, although the music was great.",
+    "Never again. Absolutely awful service and very rude staff.",
+]
+
+
+def rss_bytes():
+    """
+    Returns the current resident set size of the process.
+    """
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        # Peak RSS is the best approximation available off Linux
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if os.uname().sysname == "Darwin" else peak * 1024
+
+
+def soak(analyzer, iterations, samples):
+    """
+    Scores MESSAGES for the given number of iterations and returns a list of
+    (iteration, rss_bytes) samples.
+    """
+    interval = max(1, iterations // samples)
+    history = [(0, rss_bytes())]
+
+    for i in range(1, iterations + 1):
+        analyzer.evaluate_sentiment(MESSAGES[i % len(MESSAGES)])
+        if i % interval == 0:
+            history.append((i, rss_bytes()))
+
+    return history
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--mode", choices=vectorizer.MODES, default="value")
+    parser.add_argument("--iterations", type=int, default=200000)
+    parser.add_argument("--samples", type=int, default=10)
+    parser.add_argument("--wordset", default="standard")
+    args = parser.parse_args()
+
+    analyzer = SentimentAnalyzerV1(args.wordset, backend=vectorizer.set_mode(args.mode))
+
+    # Warm up allocator pools and caches before the first sample
+    for message in MESSAGES * 100:
+        analyzer.evaluate_sentiment(message)
+
+    start = time.perf_counter()
+    history = soak(analyzer, args.iterations, args.samples)
+    elapsed = time.perf_counter() - start
+
+    print(f"mode={args.mode} iterations={args.iterations} "
+          f"messages/s={args.iterations / elapsed:,.0f}")
+    for iteration, rss in history:
+        print(f"{iteration:>12,}  {rss / 2 ** 20:10.2f} MiB")
+
+    growth = history[-1][1] - history[0][1]
+    print(f"RSS growth: {growth / 2 ** 20:.2f} MiB "
+          f"({growth / args.iterations:.1f} bytes/message)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,343 @@
+"""
+Benchmark suite for every hot path of the analyzer, with regression tracking.
+
+Four synthetic corpora are generated from the bundled lexicon (short chat
+messages, long multi-sentence reviews, conjunction-heavy text and neutral
+IDs, URLs and logistics text without any lexicon word) and each stage is
+timed on each of them, for both wordsets:
+
+    clean_message, split_sentences   per message
+    stage.<stage>                    per call of every stage of evaluate_sentiment
+                                     (prefilter, split_sentences, tokenize,
+                                     split_conjunctions, clause_features,
+                                     vectorize, momentum), timed
+                                     through the analyzer's metrics hooks
+    vectorizer.s2v+v2s / combine     per call, on the selected backend
+    momentum_based_sentiment         per message, on pre-built vectors
+    evaluate_sentiment               per message, end to end
+
+Each result records throughput (items/s), p50/p95/p99 latency per item
+(microseconds) and the tracemalloc peak of one extra, untimed pass. Stages
+are timed inside an instrumented evaluate_sentiment, so they have no peak
+of their own.
+
+Run from the repository root:
+    python -m benchmarks.suite run -o results.json
+    python -m benchmarks.suite compare baseline.json results.json --threshold 0.15
+
+compare exits non-zero if any benchmark's throughput dropped, or its p95
+latency or peak memory grew, by more than the threshold.
+"""
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+
+from SentimentAnalysis.Algorithms.v1.sentiment_algorithms import momentum_based_sentiment
+from SentimentAnalysis.lexicon import load_wordset
+from SentimentAnalysis.metrics import Metrics
+from SentimentAnalysis.model import SentimentAnalyzerModel
+from SentimentAnalysis.v1.analyzer import SentimentAnalyzerV1
+
+WORDSETS = ("standard", "extended")
+
+FILLER = ("the movie plot cast story ending music scene it was is this that i we "
+          "they felt seemed acting director film character really so very").split()
+
+# The model's own modifier and conjunction terms, as written in messages
+# ("a-lot" as "a lot")
+MODIFIERS = tuple(sorted(term.replace("-", " ") for term in [
+    *SentimentAnalyzerModel.NEGATIONS, *SentimentAnalyzerModel.QUANTIFIERS,
+    *SentimentAnalyzerModel.DIMINISHERS]))
+CONJUNCTIONS = tuple(sorted(term.replace("-", " ")
+                            for term in SentimentAnalyzerModel.CONJUNCTIONS))
+NEUTRAL = ("Order {id} shipped via {carrier}, tracking {tracking}. ETA {month}/{day}.",
+           "https://example.com/orders/{id}?ref=email&utm_source={carrier}",
+           "Ticket #{id} assigned to {carrier} team",
+           "{tracking}",
+           "Delivery window {month}/{day} 9:00-12:00, parcel {id}")
+
+# (metric, direction): +1 if larger is better, -1 if smaller is better
+COMPARED_METRICS = (("throughput", 1), ("p95_us", -1), ("peak_memory_bytes", -1))
+
+
+# ---- SYNTHETIC CORPORA ----
+
+def _sentence(rng, sentiment_words, words, conjunctions=0):
+    clauses = []
+    for _ in range(conjunctions + 1):
+        clause = [rng.choice(FILLER) for _ in range(max(1, words // (conjunctions + 1)))]
+        for _ in range(rng.randint(0, 2)):
+            clause.insert(rng.randrange(len(clause) + 1), rng.choice(MODIFIERS))
+        clause.insert(rng.randrange(len(clause) + 1), rng.choice(sentiment_words))
+        clauses.append(" ".join(clause))
+
+    sentence = " ".join(clause + " " + rng.choice(CONJUNCTIONS) for clause in clauses[:-1])
+    return (sentence + " " + clauses[-1]).strip().capitalize() + rng.choice(".!?")
+
+
+def _neutral(rng):
+    return rng.choice(NEUTRAL).format(id=rng.randint(10000, 99999),
+                                      carrier=rng.choice(("UPS", "DHL", "FedEx", "ops")),
+                                      tracking=f"1Z{rng.getrandbits(48):012X}",
+                                      month=rng.randint(1, 12), day=rng.randint(1, 28))
+
+
+def make_corpora(size, seed=0):
+    """
+    Returns {name: list of messages} of the four synthetic corpora, built
+    from words of the standard lexicon so every stage has real work to do
+    (except on the neutral corpus, which the prefilter skips).
+    """
+    rng = random.Random(seed)
+    lexicon = load_wordset("standard")
+    sentiment_words = sorted(lexicon.positive_words | lexicon.negative_words)
+
+    return {
+        "short": [_sentence(rng, sentiment_words, rng.randint(3, 10))
+                  for _ in range(size)],
+        "long": [" ".join(_sentence(rng, sentiment_words, rng.randint(8, 25))
+                          for _ in range(rng.randint(10, 30)))
+                 for _ in range(max(1, size // 10))],
+        "conjunctions": [" ".join(_sentence(rng, sentiment_words, rng.randint(10, 20),
+                                            conjunctions=rng.randint(1, 4))
+                                  for _ in range(rng.randint(1, 4)))
+                         for _ in range(size)],
+        "neutral": [_neutral(rng) for _ in range(size)],
+    }
+
+
+# ---- MEASUREMENT ----
+
+def _percentile(sorted_values, fraction):
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def measure(function, items, repeat=3):
+    """
+    Calls function on every item, timing each call, and keeps the fastest of
+    repeat passes. One more pass runs under tracemalloc for the peak memory.
+
+    :return: Dict of items, seconds, throughput, p50/p95/p99 latency in
+             microseconds and peak_memory_bytes.
+    """
+    clock = time.perf_counter_ns
+    latencies = None
+    for _ in range(repeat):
+        timings = []
+        for item in items:
+            start = clock()
+            function(item)
+            timings.append(clock() - start)
+        if latencies is None or sum(timings) < sum(latencies):
+            latencies = timings
+
+    tracemalloc.start()
+    try:
+        for item in items:
+            function(item)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return _summary(latencies, peak)
+
+
+def measure_stages(analyzer, messages, repeat=3):
+    """
+    Runs evaluate_sentiment on every message with a Metrics attached to the
+    analyzer, and collects every stage timing through a metrics hook. The
+    fastest of repeat passes is kept for each stage.
+
+    :return: {stage: measurement}, without peak memory.
+    """
+    fastest = {}
+    for _ in range(repeat):
+        timings = {}
+
+        def hook(kind, name, value):
+            if kind == "timer" and name != "evaluate_sentiment":
+                timings.setdefault(name, []).append(value * 1e9)
+
+        metrics = Metrics()
+        metrics.add_hook(hook)
+        analyzer.set_metrics(metrics)
+        try:
+            for message in messages:
+                analyzer.evaluate_sentiment(message)
+        finally:
+            analyzer.set_metrics(None)
+
+        for name, latencies in timings.items():
+            if name not in fastest or sum(latencies) < sum(fastest[name]):
+                fastest[name] = latencies
+
+    return {name: _summary(latencies, None) for name, latencies in fastest.items()}
+
+
+def _summary(latencies, peak):
+    total = sum(latencies) / 1e9
+    latencies.sort()
+    return {
+        "items": len(latencies),
+        "seconds": total,
+        "throughput": len(latencies) / total if total else 0.0,
+        "p50_us": _percentile(latencies, 0.50) / 1e3,
+        "p95_us": _percentile(latencies, 0.95) / 1e3,
+        "p99_us": _percentile(latencies, 0.99) / 1e3,
+        "peak_memory_bytes": peak,
+    }
+
+
+def bench_corpus(analyzer, messages, repeat=3):
+    """
+    Returns {stage: measurement} for one analyzer on one corpus.
+    """
+    backend = analyzer.vectorizer
+
+    # Clause features and sentence vectors as the analyzer computes them,
+    # from the traces of the messages
+    traces = [analyzer.trace_sentiment(message) for message in messages]
+    features = [clause.vector for trace in traces for sentence in trace.sentences
+                for clause in sentence.clauses]
+    vectors = [[backend.s2v(*sentence.vector) for sentence in trace.sentences]
+               for trace in traces]
+    pairs = list(zip(features, features[1:]))
+
+    results = {
+        "clean_message": measure(analyzer.clean_message, messages, repeat),
+        "split_sentences": measure(analyzer.split_sentences, messages, repeat),
+    }
+    for stage, result in measure_stages(analyzer, messages, repeat).items():
+        results[f"stage.{stage}"] = result
+    results.update({
+        "vectorizer.s2v+v2s": measure(lambda triple: backend.v2s(backend.s2v(*triple)),
+                                      features, repeat),
+        "vectorizer.combine": measure(
+            lambda pair: backend.v2s(backend.combine(backend.s2v(*pair[0]), backend.s2v(*pair[1]))),
+            pairs, repeat),
+        "momentum_based_sentiment": measure(
+            lambda message_vectors: momentum_based_sentiment(message_vectors, backend=backend),
+            vectors, repeat),
+        "evaluate_sentiment": measure(analyzer.evaluate_sentiment, messages, repeat),
+    })
+
+    for message_vectors in vectors:
+        for vector in message_vectors:
+            backend.free(vector)
+    return results
+
+
+def run(size, seed, backend=None, repeat=3):
+    corpora = make_corpora(size, seed)
+    benchmarks = {}
+
+    for wordset in WORDSETS:
+        analyzer = SentimentAnalyzerV1(wordset, backend=backend)
+        for corpus, messages in corpora.items():
+            for stage, result in bench_corpus(analyzer, messages, repeat).items():
+                benchmarks[f"{wordset}/{corpus}/{stage}"] = result
+
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "backend": type(SentimentAnalyzerV1(backend=backend).vectorizer).__name__,
+            "size": size,
+            "seed": seed,
+            "repeat": repeat,
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        },
+        "benchmarks": benchmarks,
+    }
+
+
+# ---- COMPARISON ----
+
+def compare(baseline, current, threshold):
+    """
+    Compares two result documents.
+
+    :return: List of (benchmark, metric, baseline value, current value,
+             relative change) for every metric that got worse by more than
+             threshold (a fraction, e.g. 0.15 for 15%).
+    """
+    regressions = []
+    for name, before in baseline["benchmarks"].items():
+        after = current["benchmarks"].get(name)
+        if after is None:
+            continue
+
+        for metric, direction in COMPARED_METRICS:
+            old, new = before[metric], after[metric]
+            if not old or new is None:
+                continue
+            change = (new - old) / old
+            if -direction * change > threshold:
+                regressions.append((name, metric, old, new, change))
+
+    return regressions
+
+
+def print_results(results):
+    print(f"{'benchmark':<48} {'items/s':>12} {'p50 us':>9} {'p95 us':>9} {'p99 us':>9} {'peak KiB':>9}")
+    for name, result in results["benchmarks"].items():
+        print(f"{name:<48} {result['throughput']:>12,.0f} {result['p50_us']:>9.2f} "
+              f"{result['p95_us']:>9.2f} {result['p99_us']:>9.2f} "
+              + (f"{result['peak_memory_bytes'] / 1024:>9.1f}"
+                 if result["peak_memory_bytes"] is not None else f"{'-':>9}"))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="run the suite and write JSON results")
+    run_parser.add_argument("-o", "--output", help="results file (default: stdout)")
+    run_parser.add_argument("--size", type=int, default=2000, help="messages per corpus")
+    run_parser.add_argument("--seed", type=int, default=0)
+    run_parser.add_argument("--backend", help="vectorizer backend")
+    run_parser.add_argument("--repeat", type=int, default=3, help="timed passes per benchmark")
+    run_parser.add_argument("--baseline", help="also compare against this results file")
+    run_parser.add_argument("--threshold", type=float, default=0.15)
+
+    compare_parser = commands.add_parser("compare", help="flag regressions against a baseline")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("current")
+    compare_parser.add_argument("--threshold", type=float, default=0.15,
+                                help="allowed relative change (default: 0.15)")
+    args = parser.parse_args()
+
+    if args.command == "run":
+        results = run(args.size, args.seed, args.backend, args.repeat)
+        if args.output:
+            with open(args.output, "w") as file:
+                json.dump(results, file, indent=2)
+            print_results(results)
+        else:
+            json.dump(results, sys.stdout, indent=2)
+            print()
+        if not args.baseline:
+            return
+        with open(args.baseline) as file:
+            baseline = json.load(file)
+    else:
+        with open(args.baseline) as file:
+            baseline = json.load(file)
+        with open(args.current) as file:
+            results = json.load(file)
+
+    regressions = compare(baseline, results, args.threshold)
+    for name, metric, old, new, change in regressions:
+        print(f"REGRESSION {name} {metric}: {old:,.2f} -> {new:,.2f} ({change:+.1%})",
+              file=sys.stderr)
+    print(f"{len(regressions)} regression(s) beyond {args.threshold:.0%}", file=sys.stderr)
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
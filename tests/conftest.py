@@ -0,0 +1,66 @@
+import os
+import random
+import sys
+
+import pytest
+
+# Run from anywhere: the packages live at the repository root
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+MODIFIERS = ["very", "extremely", "really", "too", "not", "no", "never", "dont", "don't",
+             "isn't", "wasn't", "a lot", "a little", "not really", "kind of", "sort of",
+             "a bit", "somewhat", "slightly", "at all", "quite", "much", "like a", "like an",
+             "it's", "I'm"]
+CONJUNCTIONS = ["and", "or", "but", "because", "since", "so", "so that", "even though",
+                "provided that", "in case", "due to", "although", "while", "if", "when"]
+FILLER = ["the", "movie", "was", "i", "it", "this", "plot", "acting", "thing", "we", "a",
+          "an", "of", "to", "https://x.io/a.b", "ID-1234", "order", "#55"]
+PUNCTUATION = [".", "!", "?", ",", ". ", "...", "'"]
+
+EDGE_CASES = ["", ".", "...", "hello", "a lot", "like a lot", "like a little", "O'kind of",
+              "not not good", "good, bad", "Very   good.  Bad!", "good and bad but great "
+              "or awful so lovely because terrible"]
+
+
+def read_words(wordset, polarity):
+    with open(os.path.join(ROOT, "LanguageAssets", wordset, f"{polarity}_words.txt")) as file:
+        return [line.strip() for line in file]
+
+
+def generate_messages(count, seed=7, wordset="extended"):
+    """
+    Returns count random messages mixing lexicon words, modifiers,
+    conjunctions, punctuation and filler, followed by a few edge cases.
+    """
+    rng = random.Random(seed)
+    positive_words = read_words(wordset, "positive")
+    negative_words = read_words(wordset, "negative")
+
+    messages = []
+    for _ in range(count):
+        parts = []
+        for _ in range(rng.randint(0, 40)):
+            r = rng.random()
+            if r < .2:
+                parts.append(rng.choice(positive_words))
+            elif r < .4:
+                parts.append(rng.choice(negative_words))
+            elif r < .6:
+                parts.append(rng.choice(MODIFIERS))
+            elif r < .72:
+                parts.append(rng.choice(CONJUNCTIONS))
+            elif r < .82:
+                parts.append(rng.choice(PUNCTUATION))
+            else:
+                parts.append(rng.choice(FILLER))
+            if rng.random() < .1:
+                parts[-1] = parts[-1].upper()
+        messages.append(rng.choice([" ", " ", "  "]).join(parts))
+
+    return messages + EDGE_CASES
+
+
+@pytest.fixture(scope="session")
+def messages():
+    return generate_messages(1500)
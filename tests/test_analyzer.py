@@ -0,0 +1,134 @@
+import json
+
+import numpy as np
+import pytest
+
+from SentimentAnalysis.cache import ClauseCache
+from SentimentAnalysis.lexicon import DIMINISHER, QUANTIFIER
+from SentimentAnalysis.metrics import Metrics
+from SentimentAnalysis.v1.analyzer import SentimentAnalyzerV1
+from SentimentAnalysis.v2.analyzer import SentimentAnalyzerV2
+from vectorizer.v1 import vectorizer
+from vectorizer.v1.backends.python_backend import components_to_scalar, reduce_components
+
+WORDSETS = ["standard", "extended"]
+
+
+@pytest.fixture(scope="module", params=WORDSETS)
+def analyzer(request):
+    return SentimentAnalyzerV1(request.param)
+
+
+@pytest.fixture(scope="module")
+def expected(analyzer, messages):
+    return [analyzer.evaluate_sentiment(message) for message in messages]
+
+
+def test_evaluate_many_matches_evaluate_sentiment(analyzer, messages, expected):
+    assert analyzer.evaluate_many(messages).tolist() == expected
+    assert analyzer.evaluate_many(iter(messages[:50])).tolist() == expected[:50]
+    assert analyzer.evaluate_many([]).tolist() == []
+
+
+def test_trace_sentiment_matches_evaluate_sentiment(analyzer, messages, expected):
+    assert [analyzer.trace_sentiment(message).score for message in messages] == expected
+
+
+def test_verbose_matches_evaluate_sentiment(analyzer, messages, expected, capsys):
+    assert [analyzer.evaluate_sentiment(message, verbose=True)
+            for message in messages[:100]] == expected[:100]
+    assert "Proccessing text" in capsys.readouterr().out
+
+
+@pytest.mark.parametrize("backend", ["numpy", "ctypes"])
+def test_backends_give_identical_scores(messages, backend):
+    try:
+        vectorizer.get_backend(backend)
+    except (OSError, ImportError) as e:
+        pytest.skip(f"{backend} backend not available: {e}")
+
+    reference = SentimentAnalyzerV1("extended", backend="python")
+    analyzer = SentimentAnalyzerV1("extended", backend=backend)
+
+    expected = [reference.evaluate_sentiment(message) for message in messages]
+    assert [analyzer.evaluate_sentiment(message) for message in messages] == expected
+    assert analyzer.evaluate_many(messages).tolist() == expected
+    assert reference.evaluate_many(messages).tolist() == expected
+
+
+def test_options_do_not_change_scores(messages):
+    reference = SentimentAnalyzerV1("extended")
+    expected = [reference.evaluate_sentiment(message) for message in messages]
+
+    for analyzer in (SentimentAnalyzerV1("extended", prefilter=False),
+                     SentimentAnalyzerV1("extended", clause_cache=ClauseCache()),
+                     SentimentAnalyzerV1("extended", metrics=Metrics())):
+        assert [analyzer.evaluate_sentiment(message) for message in messages] == expected
+        assert analyzer.evaluate_many(messages).tolist() == expected
+
+
+@pytest.mark.parametrize("native", [True, False])
+@pytest.mark.parametrize("backend", [None, "python", "numpy"])
+def test_v2_v1_semantics_match_v1(messages, native, backend):
+    if native and backend is not None:
+        pytest.skip("the backend only applies to the NumPy pipeline")
+
+    for wordset in WORDSETS:
+        v1 = SentimentAnalyzerV1(wordset)
+        try:
+            v2 = SentimentAnalyzerV2(wordset, semantics="v1", native=native, backend=backend)
+        except OSError as e:
+            pytest.skip(f"native v2 vectorizer not available: {e}")
+
+        expected = [float(v1.evaluate_sentiment(message)) for message in messages]
+        assert v2.evaluate_many(messages).tolist() == expected
+        assert [v2.evaluate_sentiment(message) for message in messages[:300]] == expected[:300]
+        assert all(v2.sentence_scores(message) == v1.sentence_scores(message)
+                   for message in messages[:300])
+
+
+def test_every_conjunction_clause_is_scored():
+    analyzer = SentimentAnalyzerV1(backend="python")
+    message = "the plot was good and the cast was great but the ending was awful or long"
+
+    sentence = analyzer.trace_sentiment(message).sentences[0]
+    assert len(sentence.clauses) == 4
+
+    reduced = reduce_components([clause.vector for clause in sentence.clauses])
+    assert sentence.vector == reduced
+    assert analyzer.evaluate_sentiment(message) == components_to_scalar(*reduced)
+
+    # The last clause changes the score, so it is not dropped
+    assert (analyzer.evaluate_sentiment(message)
+            != analyzer.evaluate_sentiment(message.replace("awful", "lovely")))
+
+
+def test_trace_records_every_clause():
+    analyzer = SentimentAnalyzerV1(backend="python")
+    trace = analyzer.trace_sentiment("It was not very good, but I liked it. Bad!")
+
+    assert len(trace.sentences) == 2
+    first = trace.sentences[0]
+    assert [clause.tokens for clause in first.clauses] == [
+        ["it", "was", "not", "very", "good,", "but"], ["i", "liked", "it"]]
+    assert first.clauses[0].negation_count == 1
+    assert first.clauses[0].quantifier_multiplier == pytest.approx(1 - (1.41 - 1))
+    assert trace.to_dict()["score"] == trace.score
+    assert np.isfinite(trace.score)
+
+
+def test_partial_weights_file_keeps_the_other_modifiers(tmp_path):
+    weights_file = tmp_path / "weights.json"
+    weights_file.write_text(json.dumps({"quantifiers": {"very": 1.2},
+                                        "diminishers": {"a-bit": 0.6}}))
+    default = SentimentAnalyzerV1()
+    trained = SentimentAnalyzerV1(weights_file=str(weights_file))
+
+    for token in ("extremely", "a-lot", "not-really", "kind-of"):
+        assert trained.lexicon.code(token) == default.lexicon.code(token)
+    assert trained.lexicon.code("very") == (QUANTIFIER, 1.2, 1)
+    assert trained.lexicon.code("a-bit") == (DIMINISHER, 1, 0.6)
+
+    for message in ("not really good", "extremely good", "a lot of fun, kind of great"):
+        assert trained.evaluate_sentiment(message) == default.evaluate_sentiment(message)
+    assert trained.evaluate_sentiment("very good") != default.evaluate_sentiment("very good")
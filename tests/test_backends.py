@@ -0,0 +1,326 @@
+import ctypes
+import os
+import subprocess
+import sys
+
+import numpy as np
+import pytest
+
+from SentimentAnalysis.metrics import Metrics
+from SentimentAnalysis.v1.analyzer import SentimentAnalyzerV1
+from benchmarks.soak_vectorizer import rss_bytes
+from vectorizer.v1 import vectorizer
+from vectorizer.v1.backends.python_backend import reduce_components
+from vectorizer.v1.sentiment_vector import SentimentVector
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+REFERENCE = "python"
+SIZE = 5000
+
+
+def load_backend(name):
+    try:
+        return vectorizer.get_backend(name)
+    except (OSError, ImportError) as e:
+        pytest.skip(f"{name} backend not available: {e}")
+
+
+@pytest.fixture(params=["ctypes", "numpy"])
+def backend(request):
+    return load_backend(request.param)
+
+
+@pytest.fixture
+def reference():
+    return vectorizer.get_backend(REFERENCE)
+
+
+@pytest.fixture
+def columns():
+    """
+    Two sets of random magnitude, polarity and intensity columns covering
+    every branch of v2s and combine, and clause offsets into them.
+    """
+    rng = np.random.default_rng(0)
+
+    def random_columns():
+        magnitudes = rng.integers(-6, 7, SIZE).astype(np.intc)
+        polarities = rng.choice(np.array([-1, 0, 1], dtype=np.intc), SIZE)
+        intensities = rng.choice(np.array([1.0, 0.3, 0.57, 0.8, 1.41, 1.63, 2.4]), SIZE)
+        intensities = intensities * rng.choice(np.array([1.0, 1.53, 0.49]), SIZE)
+        return magnitudes, polarities, intensities
+
+    lengths = rng.integers(0, 12, SIZE // 6)
+    offsets = np.concatenate([[0], np.minimum(np.cumsum(lengths), SIZE)]).astype(np.longlong)
+    return random_columns(), random_columns(), offsets
+
+
+def triples(columns):
+    return list(zip(*[column.tolist() for column in columns]))
+
+
+def components(backend, vector):
+    vector = vector.contents if hasattr(vector, "contents") else vector
+    return vector.magnitude, vector.polarity, vector.intensity
+
+
+def test_v2s(backend, reference, columns):
+    first, _, _ = columns
+    assert ([backend.v2s(backend.s2v(*triple)) for triple in triples(first)]
+            == [reference.v2s(reference.s2v(*triple)) for triple in triples(first)])
+
+
+def test_combine(backend, reference, columns):
+    first, second, _ = columns
+    for a, b in zip(triples(first), triples(second)):
+        assert (components(backend, backend.combine(backend.s2v(*a), backend.s2v(*b)))
+                == components(reference, reference.combine(reference.s2v(*a), reference.s2v(*b))))
+
+
+def test_combine_into(backend, reference, columns):
+    first, second, _ = columns
+    out = SentimentVector()
+    for a, b in zip(triples(first)[:500], triples(second)[:500]):
+        backend.combine_into(backend.s2v(*a), backend.s2v(*b), out)
+        assert (components(backend, out)
+                == components(reference, reference.combine(reference.s2v(*a), reference.s2v(*b))))
+
+
+@pytest.mark.parametrize("count", [1, 2, 3, 7, 8, 33])
+def test_combine_reduce(backend, reference, columns, count):
+    first, _, _ = columns
+    for start in range(0, 400, count):
+        chunk = triples(first)[start:start + count]
+        expected = reference.combine_reduce([reference.s2v(*triple) for triple in chunk])
+        got = backend.combine_reduce([backend.s2v(*triple) for triple in chunk])
+        assert components(backend, got) == components(reference, expected)
+
+
+def test_combine_reduce_is_a_pairwise_tree(reference, columns):
+    first, _, _ = columns
+    chunk = triples(first)[:5]
+
+    # ((v0 v1) (v2 v3)) v4, not a left fold
+    pairs = [reference.combine(reference.s2v(*chunk[k]), reference.s2v(*chunk[k + 1]))
+             for k in (0, 2)]
+    expected = reference.combine(reference.combine(*pairs), reference.s2v(*chunk[4]))
+
+    assert components(reference, reference.combine_reduce(
+        [reference.s2v(*triple) for triple in chunk])) == components(reference, expected)
+    assert reduce_components(chunk) == components(reference, expected)
+
+
+def test_v2s_batch(backend, reference, columns):
+    first, _, _ = columns
+    assert np.array_equal(backend.v2s_batch(*first), reference.v2s_batch(*first))
+
+    # Scalar and batch functions agree too
+    assert (reference.v2s_batch(*first).tolist()
+            == [reference.v2s(reference.s2v(*triple)) for triple in triples(first)])
+
+
+def test_combine_batch(backend, reference, columns):
+    first, second, _ = columns
+    for got, expected in zip(backend.combine_batch(*first, *second),
+                             reference.combine_batch(*first, *second)):
+        assert np.array_equal(got, expected)
+
+
+def test_combine_reduce_batch(backend, reference, columns):
+    first, _, offsets = columns
+    got = backend.combine_reduce_batch(*first, offsets)
+    expected = reference.combine_reduce_batch(*first, offsets)
+    for got_column, expected_column in zip(got, expected):
+        assert np.array_equal(got_column, expected_column)
+
+    # Every segment reduces like combine_reduce on its vectors
+    vectors = triples(first)
+    for k in range(len(offsets) - 1):
+        segment = vectors[offsets[k]:offsets[k + 1]]
+        assert (tuple(column[k] for column in expected)
+                == reduce_components(segment))
+
+
+def test_momentum_batch(backend, reference, columns):
+    first, _, offsets = columns
+    scores = reference.v2s_batch(*first)
+    assert np.array_equal(backend.momentum_batch(scores, offsets),
+                          reference.momentum_batch(scores, offsets))
+    assert np.array_equal(backend.momentum_batch(scores, offsets, 0.3, 0.8),
+                          reference.momentum_batch(scores, offsets, 0.3, 0.8))
+
+
+def test_ctypes_heap_mode(reference, columns):
+    load_backend("ctypes")
+    from vectorizer.v1.backends.ctypes_backend import CtypesBackend
+
+    backend = CtypesBackend(mode="heap")
+    first, second, _ = columns
+    for a, b in zip(triples(first)[:500], triples(second)[:500]):
+        v1, v2 = backend.s2v(*a), backend.s2v(*b)
+        combined = backend.combine(v1, v2)
+        assert (components(backend, combined)
+                == components(reference, reference.combine(reference.s2v(*a), reference.s2v(*b))))
+        assert backend.v2s(v1) == reference.v2s(reference.s2v(*a))
+        for vector in (v1, v2, combined):
+            backend.free(vector)
+
+
+class LiveVectors:
+    """
+    Heap-mode ctypes backend counting the vectors allocated in the library
+    and not freed yet.
+    """
+
+    def __init__(self, backend):
+        self.backend = backend
+        self.live = 0
+
+    def __getattr__(self, name):
+        return getattr(self.backend, name)
+
+    def s2v(self, magnitude, polarity, intensity):
+        self.live += 1
+        return self.backend.s2v(magnitude, polarity, intensity)
+
+    def combine_reduce(self, vectors):
+        self.live += 1
+        return self.backend.combine_reduce(vectors)
+
+    def free(self, vector):
+        self.live -= 1
+        self.backend.free(vector)
+
+
+def test_heap_mode_analyzer_frees_its_vectors(messages):
+    load_backend("ctypes")
+    from vectorizer.v1.backends.ctypes_backend import CtypesBackend
+
+    backend = LiveVectors(CtypesBackend(mode="heap"))
+    heap = SentimentAnalyzerV1("extended", backend=backend)
+    value = SentimentAnalyzerV1("extended", backend=CtypesBackend(mode="value"))
+
+    for message in messages:
+        assert heap.evaluate_sentiment(message) == value.evaluate_sentiment(message)
+        assert heap.sentence_scores(message) == value.sentence_scores(message)
+        assert heap.trace_sentiment(message).score == value.trace_sentiment(message).score
+    heap.set_metrics(Metrics())
+    for message in messages[:100]:
+        heap.evaluate_sentiment(message)
+    assert backend.live == 0
+
+
+@pytest.mark.skipif(not os.path.exists("/proc/self/statm"), reason="needs /proc/self/statm")
+def test_heap_mode_memory_stays_flat(messages):
+    load_backend("ctypes")
+    from vectorizer.v1.backends.ctypes_backend import CtypesBackend
+
+    analyzer = SentimentAnalyzerV1("extended", backend=CtypesBackend(mode="heap"))
+    for message in messages:
+        analyzer.evaluate_sentiment(message)
+
+    # A leak of one vector per message would grow RSS by several MiB
+    before = rss_bytes()
+    for _ in range(20):
+        for message in messages:
+            analyzer.evaluate_sentiment(message)
+    assert rss_bytes() - before < 2 ** 20
+
+
+def test_set_mode_keeps_the_shared_backends():
+    shared = load_backend("ctypes")
+    previous = vectorizer.current_backend()
+    try:
+        vectorizer.use_backend("ctypes")
+        heap = vectorizer.set_mode("heap")
+        assert heap is not shared and heap.mode == "heap"
+        assert vectorizer.get_mode() == "heap"
+        assert shared.mode == "value"
+        assert SentimentAnalyzerV1(backend="ctypes").vectorizer.mode == "value"
+
+        vectorizer.set_mode("value")
+        assert vectorizer.get_mode() == "value"
+    finally:
+        vectorizer.use_backend(previous)
+
+    with pytest.raises(ValueError):
+        vectorizer.set_mode("stack")
+
+
+def test_free_ignores_python_owned_vectors(reference):
+    for backend in (load_backend("ctypes"), reference):
+        vector = backend.s2v(2, 1, 0.8)
+        backend.free(vector)
+        assert backend.v2s(vector) == reference.v2s(reference.s2v(2, 1, 0.8))
+
+
+def test_vector_arena(reference, columns):
+    arena = vectorizer.VectorArena(block_size=64, backend="python")
+    first, second, _ = columns
+    pairs = list(zip(triples(first), triples(second)))[:200]
+
+    addresses = None
+    for _ in range(3):
+        vectors = []
+        for a, b in pairs:
+            v1, v2 = arena.s2v(*a), arena.s2v(*b)
+            combined = arena.combine(v1, v2)
+            assert (components(reference, combined)
+                    == components(reference, reference.combine(reference.s2v(*a),
+                                                               reference.s2v(*b))))
+            vectors.append(combined)
+        assert len(arena) == 3 * len(pairs)
+
+        # After a reset the same slots are handed out again: nothing is allocated
+        current = [ctypes.addressof(vector) for vector in vectors]
+        assert addresses is None or current == addresses
+        addresses = current
+        arena.reset()
+        assert len(arena) == 0
+
+
+def test_get_backend():
+    assert vectorizer.get_backend("python").name == "python"
+    assert vectorizer.get_backend("auto").name in vectorizer.available_backends()
+
+    backend = vectorizer.get_backend("python")
+    assert vectorizer.get_backend(backend) is backend
+
+    with pytest.raises(ValueError):
+        vectorizer.get_backend("fortran")
+
+
+def test_auto_warns_when_falling_back(monkeypatch):
+    def broken():
+        raise OSError("library missing")
+
+    monkeypatch.setitem(vectorizer._BACKENDS, "broken", broken)
+    monkeypatch.setattr(vectorizer, "AUTO_ORDER", ("broken", "python"))
+
+    with pytest.warns(RuntimeWarning, match="broken: library missing"):
+        assert vectorizer.get_backend("auto").name == "python"
+
+
+def test_python_backend_works_without_numpy():
+    # A fresh interpreter in which importing numpy fails
+    program = """
+import sys
+sys.modules["numpy"] = None
+from vectorizer.v1 import vectorizer
+from SentimentAnalysis.metrics import Metrics
+from SentimentAnalysis.v1.analyzer import SentimentAnalyzerV1
+
+assert "python" in vectorizer.available_backends()
+assert "numpy" not in vectorizer.available_backends()
+message = "The plot was not very good, but the cast was really great!"
+analyzer = SentimentAnalyzerV1(backend="python")
+print(analyzer.evaluate_sentiment(message), analyzer.trace_sentiment(message).score,
+      SentimentAnalyzerV1(backend="auto").evaluate_sentiment(message))
+"""
+    output = subprocess.run([sys.executable, "-c", program], cwd=ROOT, capture_output=True,
+                            text=True, check=True).stdout.split()
+
+    expected = SentimentAnalyzerV1(backend="python").evaluate_sentiment(
+        "The plot was not very good, but the cast was really great!")
+    assert [float(score) for score in output] == [expected] * 3
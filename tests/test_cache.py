@@ -0,0 +1,69 @@
+import pytest
+
+from SentimentAnalysis.cache import ClauseCache
+from SentimentAnalysis.v1.analyzer import SentimentAnalyzerV1
+
+MESSAGE = "The cast was really great, but the plot was not very good and the ending dragged."
+
+
+def test_evicts_the_least_recently_used_entry():
+    cache = ClauseCache(maxsize=2)
+    cache.put("lexicon", ["a"], (1, 1, 1.0))
+    cache.put("lexicon", ["b"], (2, 1, 1.0))
+    assert cache.get("lexicon", ["a"]) == (1, 1, 1.0)  # "b" is now the oldest
+
+    cache.put("lexicon", ["c"], (3, 1, 1.0))
+    assert len(cache) == 2
+    assert cache.get("lexicon", ["b"]) is None
+    assert cache.get("lexicon", ("a",)) == (1, 1, 1.0)
+    assert cache.get("lexicon", ["c"]) == (3, 1, 1.0)
+    assert cache.get("other lexicon", ["c"]) is None
+    assert cache.evictions == 1
+
+    with pytest.raises(ValueError):
+        ClauseCache(maxsize=0)
+
+
+def test_stats():
+    cache = ClauseCache(maxsize=8)
+    assert cache.stats()["hit_rate"] == 0.0
+
+    cache.get("lexicon", ["a"])
+    cache.put("lexicon", ["a"], (1, 1, 1.0))
+    cache.get("lexicon", ["a"])
+    cache.get("lexicon", ["a"])
+    assert cache.stats() == {"hits": 2, "misses": 1, "evictions": 0, "size": 1,
+                             "maxsize": 8, "hit_rate": 2 / 3}
+
+    cache.clear()
+    assert len(cache) == 0
+    assert cache.stats()["hits"] == cache.stats()["misses"] == 0
+
+
+def test_hits_score_like_misses(messages):
+    reference = SentimentAnalyzerV1("extended")
+    cache = ClauseCache()
+    analyzer = SentimentAnalyzerV1("extended", clause_cache=cache)
+
+    # Three clauses: every lookup misses first, then hits
+    miss = analyzer.evaluate_sentiment(MESSAGE)
+    assert (cache.stats()["hits"], cache.stats()["misses"]) == (0, 3)
+    hit = analyzer.evaluate_sentiment(MESSAGE)
+    assert (cache.stats()["hits"], cache.stats()["misses"]) == (3, 3)
+    assert hit == miss == reference.evaluate_sentiment(MESSAGE)
+
+    expected = [reference.evaluate_sentiment(message) for message in messages]
+    for _ in range(2):
+        assert [analyzer.evaluate_sentiment(message) for message in messages] == expected
+    assert cache.stats()["hits"] > cache.stats()["misses"]
+
+
+def test_shared_cache_keeps_wordsets_apart(messages):
+    # A tiny cache evicts constantly; entries of one wordset never serve the other
+    cache = ClauseCache(maxsize=4)
+    for wordset in ("standard", "extended", "standard"):
+        reference = SentimentAnalyzerV1(wordset)
+        analyzer = SentimentAnalyzerV1(wordset, clause_cache=cache)
+        assert ([analyzer.evaluate_sentiment(message) for message in messages[:300]]
+                == [reference.evaluate_sentiment(message) for message in messages[:300]])
+    assert len(cache) == 4 and cache.evictions > 0
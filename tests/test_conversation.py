@@ -0,0 +1,74 @@
+import json
+
+import pytest
+
+from SentimentAnalysis.Algorithms.v1.sentiment_algorithms import (MomentumScorer,
+                                                                   momentum_based_sentiment)
+from SentimentAnalysis.v1.analyzer import SentimentAnalyzerV1
+
+TURNS = ["The cast was really great! I loved the music.",
+         "But the plot was not very good.",
+         "The ending was terrible, and the acting was awful.",
+         "Still, the photography was lovely.",
+         "Never again."]
+
+
+@pytest.fixture(scope="module")
+def analyzer():
+    return SentimentAnalyzerV1("extended")
+
+
+def test_momentum_scorer_decays_across_turns():
+    scorer = MomentumScorer()
+    assert scorer.score == 0
+
+    # A positive turn followed by neutral ones: the score falls away from it,
+    # overshooting below zero as the momentum carries it on
+    assert [scorer.update(score) for score in (1.0, 0.0, 0.0, 0.0)] == [1.0, 0.25, -0.0625,
+                                                                        -0.109375]
+    assert scorer.to_dict() == {"alpha": 0.5, "beta": 0.5, "prev_score": -0.109375,
+                                "momentum": -0.15625, "count": 4}
+
+
+def test_momentum_scorer_matches_momentum_based_sentiment(analyzer):
+    vectors = [analyzer.vectorizer.s2v(*triple)
+               for triple in [(3, 1, 1.41), (2, -1, 0.8), (0, 0, 1.0), (5, 1, 0.49)]]
+
+    for alpha, beta in [(0.5, 0.5), (0.3, 0.8)]:
+        scorer = MomentumScorer(alpha, beta)
+        for vector in vectors:
+            scorer.update(analyzer.vectorizer.v2s(vector))
+        assert scorer.score == momentum_based_sentiment(vectors, alpha, beta,
+                                                        backend=analyzer.vectorizer)
+
+
+def test_conversation_matches_the_transcript(analyzer):
+    conversation = analyzer.conversation()
+    scores = [conversation.add(turn) for turn in TURNS]
+
+    assert scores == [analyzer.evaluate_sentiment(" ".join(TURNS[:n + 1]))
+                      for n in range(len(TURNS))]
+    # The negative turns drag the score of the conversation down
+    assert scores[0] > 0 > scores[2]
+
+
+def test_conversation_resumes_from_its_state(analyzer):
+    uninterrupted = analyzer.conversation()
+    for turn in TURNS:
+        uninterrupted.add(turn)
+
+    for split in range(len(TURNS) + 1):
+        conversation = analyzer.conversation()
+        for turn in TURNS[:split]:
+            conversation.add(turn)
+
+        # The state survives a JSON round trip without losing precision
+        state = json.loads(json.dumps(conversation.state()))
+        assert MomentumScorer.from_dict(state).to_dict() == conversation.state()
+
+        resumed = analyzer.conversation(state)
+        assert resumed.score == conversation.score
+        for turn in TURNS[split:]:
+            resumed.add(turn)
+        assert resumed.score == uninterrupted.score
+        assert resumed.state() == uninterrupted.state()
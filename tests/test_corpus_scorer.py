@@ -0,0 +1,155 @@
+import os
+import signal
+import subprocess
+import sys
+
+import numpy as np
+import pytest
+
+from SentimentAnalysis.CorpusScorer.offline import CHECKPOINT_SUFFIX, score_offline
+from SentimentAnalysis.CorpusScorer.scorer import read_messages, score_corpus
+from SentimentAnalysis.parallel import imap_bounded
+from SentimentAnalysis.v1.analyzer import SentimentAnalyzerV1
+
+MESSAGES = ["The cast was really great!", "Order 12345 shipped.", "",
+            "The plot was not very good, but the ending was lovely."] * 5
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Scores argv[1] into argv[2] and is killed right after its third checkpoint
+KILLED_RUN = """
+import os, signal, sys
+from SentimentAnalysis.CorpusScorer import offline
+
+write_checkpoint = offline.write_checkpoint
+written = []
+
+def write_then_die(*args):
+    write_checkpoint(*args)
+    written.append(args)
+    if len(written) == 3:
+        os.kill(os.getpid(), signal.SIGKILL)
+
+offline.write_checkpoint = write_then_die
+offline.score_offline(sys.argv[1], sys.argv[2], chunk_size=3)
+"""
+
+
+def read_scores(path):
+    return np.load(path) if path.endswith(".npy") else np.fromfile(path, dtype=np.float64)
+
+
+def test_score_corpus_matches_evaluate_sentiment():
+    analyzer = SentimentAnalyzerV1()
+    expected = [analyzer.evaluate_sentiment(message) for message in MESSAGES]
+
+    assert list(score_corpus(MESSAGES, processes=1, chunk_size=3)) == expected
+    assert list(score_corpus(MESSAGES, processes=2, chunk_size=3)) == expected
+    assert list(score_corpus(MESSAGES, processes=2, chunk_size=3, max_pending=1)) == expected
+
+
+def test_imap_bounded_keeps_order_and_bounds_the_items_in_flight():
+    submitted = []
+
+    def items():
+        for item in range(-20, 0):
+            submitted.append(item)
+            yield item
+
+    for i, (item, result) in enumerate(imap_bounded(abs, items(), processes=2, max_pending=3)):
+        assert (item, result) == (i - 20, 20 - i)
+        assert len(submitted) <= i + 3
+
+
+def test_read_messages_reads_missing_values_as_empty(tmp_path):
+    csv_path = tmp_path / "reviews.csv"
+    csv_path.write_text("id,review\n1,Really great!\n2\n3,\n")
+    jsonl_path = tmp_path / "reviews.jsonl"
+    jsonl_path.write_text('{"text": "Really great!"}\n{"text": null}\n\n{"text": ""}\n')
+
+    assert list(read_messages(str(csv_path))) == ["Really great!", "", ""]
+    assert list(read_messages(str(jsonl_path))) == ["Really great!", "", ""]
+    assert list(score_corpus(read_messages(str(jsonl_path)), processes=1)) == [
+        SentimentAnalyzerV1().evaluate_sentiment("Really great!"), 0.0, 0.0]
+
+
+@pytest.mark.parametrize("processes", [1, 2])
+def test_score_corpus_rejects_invalid_options(processes):
+    with pytest.raises(ValueError):
+        list(score_corpus(MESSAGES, processes=processes, weights_file="/nonexistent.json"))
+
+
+@pytest.mark.parametrize("processes", [1, 2])
+def test_score_offline_rejects_invalid_options(tmp_path, processes):
+    input_path = tmp_path / "messages.txt"
+    input_path.write_text("\n".join(MESSAGES))
+    with pytest.raises(ValueError):
+        score_offline(str(input_path), str(tmp_path / "scores.npy"), processes=processes,
+                      weights_file="/nonexistent.json")
+
+
+def test_score_offline_matches_evaluate_sentiment(tmp_path):
+    input_path = tmp_path / "messages.txt"
+    input_path.write_text("\n".join(MESSAGES))
+    output_path = str(tmp_path / "scores.npy")
+
+    stats = score_offline(str(input_path), output_path, chunk_size=3, processes=2)
+
+    analyzer = SentimentAnalyzerV1()
+    assert stats.messages == len(MESSAGES)
+    assert np.load(output_path).tolist() == [analyzer.evaluate_sentiment(m) for m in MESSAGES]
+
+
+@pytest.mark.skipif(not hasattr(signal, "SIGKILL"), reason="needs SIGKILL")
+@pytest.mark.parametrize("extension", [".npy", ".f64"])
+def test_score_offline_resumes_after_a_kill(tmp_path, extension):
+    input_path = tmp_path / "messages.txt"
+    input_path.write_text("\n".join(MESSAGES))
+    clean_path = str(tmp_path / f"clean{extension}")
+    output_path = str(tmp_path / f"scores{extension}")
+    score_offline(str(input_path), clean_path, chunk_size=3)
+
+    killed = subprocess.run([sys.executable, "-c", KILLED_RUN, str(input_path), output_path],
+                            cwd=ROOT)
+    assert killed.returncode == -signal.SIGKILL
+    assert os.path.exists(output_path + CHECKPOINT_SUFFIX)
+
+    stats = score_offline(str(input_path), output_path, chunk_size=3, resume=True)
+    assert stats.messages == len(MESSAGES) - 9
+    assert read_scores(output_path).tolist() == read_scores(clean_path).tolist()
+
+
+def test_score_offline_from_start_offset(tmp_path):
+    input_path = tmp_path / "messages.txt"
+    input_path.write_text("\n".join(MESSAGES))
+    output_path = str(tmp_path / "scores.f64")
+    score_offline(str(input_path), output_path, chunk_size=3)
+    expected = read_scores(output_path).tolist()
+
+    # Clobber the scores from line 5 on, then rescore only those lines
+    scores = np.memmap(output_path, dtype=np.float64, mode="r+")
+    scores[5:] = np.nan
+    scores.flush()
+    del scores
+
+    start_offset = len("\n".join(MESSAGES[:5]).encode()) + 1
+    stats = score_offline(str(input_path), output_path, start_offset=start_offset)
+    assert stats.messages == len(MESSAGES) - 5
+    assert read_scores(output_path).tolist() == expected
+
+    with pytest.raises(ValueError):
+        score_offline(str(input_path), output_path, start_offset=start_offset + 1)
+
+
+def test_score_offline_resumes_an_empty_raw_output(tmp_path):
+    input_path = tmp_path / "messages.txt"
+    input_path.write_text("\n".join(MESSAGES))
+    output_path = tmp_path / "scores.f64"
+    output_path.write_bytes(b"")
+
+    stats = score_offline(str(input_path), str(output_path), resume=True)
+
+    analyzer = SentimentAnalyzerV1()
+    assert stats.messages == len(MESSAGES)
+    assert read_scores(str(output_path)).tolist() == [analyzer.evaluate_sentiment(m)
+                                                     for m in MESSAGES]
@@ -0,0 +1,154 @@
+import os
+
+import pytest
+
+from SentimentAnalysis import lexicon as cache
+from SentimentAnalysis.lexicon import (ASSETS_DIR, CONJUNCTION, DIMINISHER, NEGATION, NEGATIVE,
+                                       NO_ENTRY, POSITIVE, QUANTIFIER, LexiconIndex,
+                                       compile_lexicon, load_wordset)
+from SentimentAnalysis.model import SentimentAnalyzerModel
+from SentimentAnalysis.tokenizer import canonical_phrase
+from SentimentAnalysis.v1.analyzer import SentimentAnalyzerV1
+
+Model = SentimentAnalyzerModel
+
+
+def naive_code(token, positive_words, negative_words):
+    """
+    The code of a token by list membership, as the analyzer computed it
+    before the index.
+    """
+    quantifiers = {canonical_phrase(word): weight for word, weight in Model.QUANTIFIERS.items()}
+    diminishers = {canonical_phrase(word): weight for word, weight in Model.DIMINISHERS.items()}
+
+    flags = 0
+    for category, words in ((POSITIVE, positive_words), (NEGATIVE, negative_words),
+                            (NEGATION, Model.NEGATIONS), (QUANTIFIER, quantifiers),
+                            (DIMINISHER, diminishers), (CONJUNCTION, Model.CONJUNCTIONS)):
+        if token in [canonical_phrase(word) for word in words]:
+            flags |= category
+    return flags, quantifiers.get(token, 1), diminishers.get(token, 1)
+
+
+@pytest.mark.parametrize("wordset", ["standard", "extended"])
+def test_index_matches_list_membership(wordset):
+    lexicon = load_wordset(wordset)
+    positive_words, negative_words = list(lexicon.positive_words), list(lexicon.negative_words)
+    index = SentimentAnalyzerV1(wordset).lexicon
+
+    tokens = ({canonical_phrase(word) for word in positive_words[::7] + negative_words[::7]}
+              | {canonical_phrase(word) for word in Model.QUANTIFIERS}
+              | {canonical_phrase(word) for word in Model.DIMINISHERS}
+              | {canonical_phrase(word) for word in Model.NEGATIONS | Model.CONJUNCTIONS}
+              | {"movie", "the", "zorblax", ""})
+    for token in tokens:
+        assert index.code(token) == naive_code(token, positive_words, negative_words), token
+
+    assert index.code("zorblax") == NO_ENTRY
+    assert "zorblax" not in index
+
+
+def test_index_scales_to_large_custom_lexicons():
+    positive_words = [f"good{i}" for i in range(100000)]
+    negative_words = [f"bad{i}" for i in range(100000)] + ["good5"]
+    index = LexiconIndex(positive_words, negative_words, Model.NEGATIONS, Model.QUANTIFIERS,
+                         Model.DIMINISHERS, Model.CONJUNCTIONS)
+
+    assert index.flags("good99999") == POSITIVE
+    assert index.flags("bad0") == NEGATIVE
+    assert index.flags("good5") == POSITIVE | NEGATIVE
+    assert index.code("a-lot") == (QUANTIFIER, 1.55, 1)
+    assert len(index) > 200000
+
+
+def test_overlay_index_matches_full_index(tmp_path):
+    base = load_wordset("standard")
+    positive_file = tmp_path / "positive.txt"
+    negative_file = tmp_path / "negative.txt"
+    positive_file.write_text("\n".join(sorted(base.positive_words)[5:] + ["zorblax", "top notch"]))
+    negative_file.write_text("\n".join(sorted(base.negative_words)[5:] + ["great"]))
+
+    full = SentimentAnalyzerV1("custom", str(positive_file), str(negative_file)).lexicon
+    overlay = SentimentAnalyzerV1("custom", str(positive_file), str(negative_file),
+                                  base_wordset="standard").lexicon
+
+    assert sorted(overlay.items()) == sorted(full.items())
+    assert len(overlay) == len(full)
+    assert sorted(overlay.phrases.phrases()) == sorted(full.phrases.phrases())
+
+
+def test_reloading_a_changed_wordset_evicts_the_stale_entries(tmp_path):
+    base = load_wordset("standard")
+    positive_file = tmp_path / "positive.txt"
+    negative_file = tmp_path / "negative.txt"
+    positive_file.write_text("\n".join(sorted(base.positive_words)[1:]))
+    negative_file.write_text("\n".join(sorted(base.negative_words)))
+    files = (str(positive_file), str(negative_file))
+
+    def load():
+        SentimentAnalyzerV1("custom", *files)
+        SentimentAnalyzerV1("custom", *files, base_wordset="standard")
+        return len(cache._lexicons), len(cache._indexes), len(cache._canonical)
+
+    sizes = load()
+    for version in range(1, 4):
+        stat = os.stat(positive_file)
+        os.utime(positive_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + version * 10**9))
+        analyzer = SentimentAnalyzerV1("custom", *files)
+        assert load() == sizes
+
+    # The reloaded lexicon is the one in use
+    assert analyzer.lexicon is SentimentAnalyzerV1("custom", *files).lexicon
+
+
+def test_compiled_lexicon_scores_like_its_word_files(tmp_path, messages):
+    word_files = (os.path.join(ASSETS_DIR, "extended", "positive_words.txt"),
+                  os.path.join(ASSETS_DIR, "extended", "negative_words.txt"))
+    lexicon_file = str(tmp_path / "extended.lex")
+    compile_lexicon(*word_files, lexicon_file)
+
+    reference = SentimentAnalyzerV1("extended")
+    expected = [reference.evaluate_sentiment(message) for message in messages]
+    for analyzer in (SentimentAnalyzerV1("custom", *word_files),
+                     SentimentAnalyzerV1("custom", lexicon_file=lexicon_file),
+                     SentimentAnalyzerV1("custom", lexicon_file=lexicon_file,
+                                         base_wordset="standard")):
+        assert sorted(analyzer.lexicon.items()) == sorted(reference.lexicon.items())
+        assert [analyzer.evaluate_sentiment(message) for message in messages] == expected
+
+    not_compiled = tmp_path / "words.txt"
+    not_compiled.write_text("good\nbad")
+    with pytest.raises(ValueError):
+        SentimentAnalyzerV1("custom", lexicon_file=str(not_compiled))
+
+
+def test_a_recompiled_lexicon_is_reloaded(tmp_path):
+    base = load_wordset("standard")
+    positive_file = tmp_path / "positive.txt"
+    negative_file = tmp_path / "negative.txt"
+    positive_file.write_text("\n".join(sorted(base.positive_words)))
+    negative_file.write_text("\n".join(sorted(base.negative_words)))
+    lexicon_file = str(tmp_path / "custom.lex")
+    compile_lexicon(str(positive_file), str(negative_file), lexicon_file)
+
+    message = "The ending was lovely"
+    stale = SentimentAnalyzerV1("custom", lexicon_file=lexicon_file)
+    assert stale.evaluate_sentiment(message) > 0
+    sizes = len(cache._lexicons), len(cache._indexes), len(cache._canonical)
+
+    # "lovely" turns negative; the rebuilt file gets a later mtime
+    positive_file.write_text("\n".join(sorted(base.positive_words - {"lovely"})))
+    negative_file.write_text("\n".join(sorted(base.negative_words | {"lovely"})))
+    stat = os.stat(lexicon_file)
+    compile_lexicon(str(positive_file), str(negative_file), lexicon_file)
+    os.utime(lexicon_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+    fresh = SentimentAnalyzerV1("custom", lexicon_file=lexicon_file)
+    assert fresh.lexicon is not stale.lexicon
+    # The stale entries were evicted, not kept next to the new ones
+    assert (len(cache._lexicons), len(cache._indexes), len(cache._canonical)) == sizes
+
+    assert fresh.evaluate_sentiment(message) < 0
+    assert fresh.evaluate_sentiment(message) == SentimentAnalyzerV1(
+        "custom", str(positive_file), str(negative_file)).evaluate_sentiment(message)
+    assert stale.evaluate_sentiment(message) > 0  # Analyzers keep the lexicon they loaded
@@ -0,0 +1,77 @@
+import pytest
+
+from SentimentAnalysis.metrics import CountingBackend, Metrics
+from SentimentAnalysis.v1.analyzer import SentimentAnalyzerV1
+from vectorizer.v1 import vectorizer
+
+# Two sentences: three clauses (12 tokens) and one clause (3 tokens)
+MESSAGE = "The cast was really great, but the plot was not very good. I loved it!"
+NEUTRAL = "Order 12345 shipped."
+
+STAGES = {"evaluate_sentiment": 1, "prefilter": 1, "split_sentences": 1, "tokenize": 2,
+          "split_conjunctions": 2, "clause_features": 2, "vectorize": 2, "momentum": 1}
+
+
+def test_metrics_snapshot_counts_a_known_message():
+    analyzer = SentimentAnalyzerV1("extended", backend="python", metrics=Metrics())
+    assert analyzer.evaluate_sentiment(MESSAGE) == SentimentAnalyzerV1(
+        "extended", backend="python").evaluate_sentiment(MESSAGE)
+
+    snapshot = analyzer.metrics_snapshot()
+    assert snapshot["counters"] == {"messages": 1, "sentences": 2, "clauses": 3, "tokens": 15,
+                                    "vectorizer.s2v": 3, "vectorizer.combine_reduce": 1,
+                                    "vectorizer.v2s": 2}
+    assert snapshot["prefiltered_share"] == 0.0
+
+    assert {name: timer["count"] for name, timer in snapshot["timers"].items()} == STAGES
+    for timer in snapshot["timers"].values():
+        assert set(timer) == {"count", "total_seconds", "mean_us", "max_us"}
+        assert 0 < timer["mean_us"] <= timer["max_us"]
+        assert timer["total_seconds"] == pytest.approx(timer["mean_us"] * timer["count"] / 1e6)
+
+    analyzer.evaluate_sentiment(NEUTRAL)
+    snapshot = analyzer.metrics_snapshot()
+    assert snapshot["counters"]["prefiltered"] == 1
+    assert snapshot["prefiltered_share"] == 0.5
+    assert snapshot["timers"]["evaluate_sentiment"]["count"] == 2
+    assert snapshot["timers"]["tokenize"]["count"] == 2
+
+
+def test_evaluate_many_counts_batch_rows():
+    metrics = Metrics()
+    observed = []
+    metrics.add_hook(lambda kind, name, value: observed.append((kind, name, value)))
+    analyzer = SentimentAnalyzerV1("extended", backend="python", metrics=metrics)
+
+    analyzer.evaluate_many([MESSAGE, NEUTRAL])
+    assert metrics.snapshot()["counters"] == {
+        "messages": 2, "prefiltered": 1,
+        "vectorizer.combine_reduce_batch": 1, "vectorizer.combine_reduce_batch.rows": 3,
+        "vectorizer.v2s_batch": 1, "vectorizer.v2s_batch.rows": 2,
+        "vectorizer.momentum_batch": 1, "vectorizer.momentum_batch.rows": 2}
+    assert ("counter", "vectorizer.v2s_batch.rows", 2) in observed
+
+
+def test_counting_backend():
+    backend = vectorizer.get_backend("python")
+    metrics = Metrics()
+    counting = CountingBackend(backend, metrics)
+
+    vector = counting.combine(counting.s2v(2, 1, 0.8), counting.s2v(1, -1, 1.0))
+    assert counting.v2s(vector) == backend.v2s(backend.combine(backend.s2v(2, 1, 0.8),
+                                                               backend.s2v(1, -1, 1.0)))
+    assert counting.name == "python"
+    assert metrics.counters == {"vectorizer.s2v": 2, "vectorizer.combine": 1,
+                                "vectorizer.v2s": 1}
+
+
+def test_detached_analyzer_records_nothing():
+    metrics = Metrics()
+    analyzer = SentimentAnalyzerV1("extended", metrics=metrics)
+    analyzer.set_metrics(None)
+
+    analyzer.evaluate_sentiment(MESSAGE)
+    assert not isinstance(analyzer.vectorizer, CountingBackend)
+    assert metrics.snapshot() == {"counters": {}, "timers": {}}
+    with pytest.raises(RuntimeError):
+        analyzer.metrics_snapshot()
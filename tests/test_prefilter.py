@@ -0,0 +1,55 @@
+from SentimentAnalysis.lexicon import load_wordset
+from SentimentAnalysis.v1.analyzer import SentimentAnalyzerV1
+
+MESSAGES = [
+    "",
+    "...",
+    "Order 12345 shipped.",
+    "The cast was really great!",
+    "The plot was not very good, but the cast was really great!",
+    "What a zorblax evening. Truly zorblax!",
+    "It felt dull. Dull and long.",
+    "The hot dog was a bit cold",
+]
+
+
+def write_tenant(directory):
+    """
+    Writes a custom wordset: the standard one without "great" and "dull",
+    with "zorblax" added as a positive word.
+    """
+    base = load_wordset("standard")
+    removed = {"great", "dull"}
+    positive_file = directory / "positive.txt"
+    negative_file = directory / "negative.txt"
+    positive_file.write_text("\n".join([w for w in base.positive_words if w not in removed]
+                                       + ["zorblax"]))
+    negative_file.write_text("\n".join(w for w in base.negative_words if w not in removed))
+    return str(positive_file), str(negative_file)
+
+
+def scores(analyzer):
+    return [repr(analyzer.evaluate_sentiment(message)) for message in MESSAGES]
+
+
+def test_prefilter_does_not_change_scores():
+    assert (scores(SentimentAnalyzerV1(backend="python"))
+            == scores(SentimentAnalyzerV1(backend="python", prefilter=False)))
+
+
+def test_overlay_prefilter_does_not_change_scores(tmp_path):
+    files = write_tenant(tmp_path)
+    full = SentimentAnalyzerV1("custom", *files, backend="python", prefilter=False)
+    overlay = SentimentAnalyzerV1("custom", *files, backend="python", base_wordset="standard")
+
+    assert scores(overlay) == scores(full)
+    assert overlay.evaluate_sentiment("What a zorblax evening.") != 0.0
+
+
+def test_overlay_prefilter_shares_the_base_prefilter(tmp_path):
+    base = SentimentAnalyzerV1(backend="python")
+    overlay = SentimentAnalyzerV1("custom", *write_tenant(tmp_path), backend="python",
+                                  base_wordset="standard")
+
+    assert overlay.prefilter.base is base.prefilter
+    assert overlay.prefilter.tokens == {"zorblax"}
@@ -0,0 +1,54 @@
+import asyncio
+
+import pytest
+
+from SentimentAnalysis.Service.service import AsyncSentimentService
+from SentimentAnalysis.v1.analyzer import SentimentAnalyzerV1
+
+MESSAGES = ["The cast was really great!", "Order 12345 shipped.",
+            "The plot was not very good, but the ending was lovely.", ""]
+
+
+def run(coroutine):
+    return asyncio.run(coroutine)
+
+
+def test_scores_match_evaluate_many():
+    analyzer = SentimentAnalyzerV1()
+
+    async def score():
+        async with AsyncSentimentService(analyzer, max_batch_size=3) as service:
+            return await asyncio.gather(*(service.evaluate(m) for m in MESSAGES * 5))
+
+    assert run(score()) == analyzer.evaluate_many(MESSAGES * 5).tolist()
+
+
+def test_bad_message_only_fails_its_own_call():
+    # Without the prefilter every message, even a bad one, joins a batch
+    analyzer = SentimentAnalyzerV1(prefilter=False)
+
+    async def score():
+        async with AsyncSentimentService(analyzer, max_batch_size=64, max_wait=0.05) as service:
+            results = await asyncio.gather(*(service.evaluate(m) for m in MESSAGES + [None]),
+                                           return_exceptions=True)
+            return results, service.stats()
+
+    results, stats = run(score())
+    assert results[:-1] == analyzer.evaluate_many(MESSAGES).tolist()
+    assert isinstance(results[-1], TypeError)
+    assert stats["batches"] == 1 and stats["messages"] == len(MESSAGES) + 1
+
+
+def test_invalid_options_raise_on_start():
+    async def start():
+        service = AsyncSentimentService(processes=2, weights_file="/nonexistent.json")
+        await service.start()
+
+    with pytest.raises(ValueError):
+        run(start())
+
+
+def test_analyzer_with_processes_raises():
+    # The workers would score with analyzer_options, not with this analyzer
+    with pytest.raises(ValueError):
+        AsyncSentimentService(SentimentAnalyzerV1(wordset="extended"), processes=2)
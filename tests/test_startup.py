@@ -0,0 +1,32 @@
+import pytest
+
+from SentimentAnalysis.Exceptions.errors import InvalidModelError
+from SentimentAnalysis.startup import warmup
+from SentimentAnalysis.v1.analyzer import SentimentAnalyzerV1
+from SentimentAnalysis.v2.analyzer import SentimentAnalyzerV2
+from benchmarks.bench_import import CASES, measure
+
+MESSAGE = "The plot was not very good, but the cast was really great!"
+
+
+def test_import_loads_nothing_eagerly():
+    # Each case runs in a fresh interpreter
+    assert measure(CASES["import"], repeat=1)[1] == []
+
+    loaded = measure(CASES["import class"], repeat=1)[1]
+    assert "numpy" not in loaded
+    assert "vectorizer.v1.backends.ctypes_backend" not in loaded
+
+    # Scoring a message loads the vectorizer backend, but still not NumPy
+    assert "numpy" not in measure(CASES["first score"], repeat=1)[1]
+
+
+def test_warmup():
+    analyzer = warmup(wordset="extended")
+    assert isinstance(analyzer, SentimentAnalyzerV1)
+    assert analyzer.evaluate_sentiment(MESSAGE) == SentimentAnalyzerV1(
+        "extended").evaluate_sentiment(MESSAGE)
+    assert isinstance(warmup("2.0"), SentimentAnalyzerV2)
+
+    with pytest.raises(InvalidModelError):
+        warmup("3.0")
@@ -0,0 +1,106 @@
+import random
+import re
+
+import pytest
+
+from SentimentAnalysis.model import SentimentAnalyzerModel
+from SentimentAnalysis.tokenizer import GUARD_PHRASES, PhraseMatcher, canonical_phrase, tokenize
+
+# Phrases the substitution chain of the original clean_message merged
+LEGACY_PHRASES = ["a lot", "a little", "not really", "kind of", "sort of", "a bit", "so that",
+                  "even though", "provided that", "in case", *GUARD_PHRASES]
+
+LEGACY_CONTRACTIONS = {
+    "wasn't": "wasnt", "can't": "cant", "don't": "dont", "didn't": "didnt", "isn't": "isnt",
+    "won't": "wont", "haven't": "havent", "shouldn't": "shouldnt", "wouldn't": "wouldnt",
+    "couldn't": "couldnt", "you're": "youre", "i'm": "im", "he's": "hes", "she's": "shes",
+    "it's": "its", "they're": "theyre"
+}
+
+
+def legacy_clean_message(message):
+    """
+    The original SentimentAnalyzerModel.clean_message.
+    """
+    message = message.lower()
+    for contraction, replacement in LEGACY_CONTRACTIONS.items():
+        message = message.replace(contraction, replacement)
+    for phrase in LEGACY_PHRASES:
+        message = re.sub(r'\b(' + phrase + r')\b', phrase.replace(" ", "-"), message)
+    message = ''.join([char for char in message if char not in ["'", "."]])
+    return ' '.join(message.split())
+
+
+def naive_merge(tokens, phrases):
+    """
+    Merges the leftmost-longest phrase at every position by trying every
+    phrase, longest first.
+    """
+    phrases = sorted({tuple(canonical_phrase(p).split("-")) for p in phrases if " " in p
+                      or "-" in p}, key=len, reverse=True)
+    merged = []
+    i = 0
+    while i < len(tokens):
+        for phrase in phrases:
+            if tuple(tokens[i:i + len(phrase)]) == phrase:
+                merged.append("-".join(phrase))
+                i += len(phrase)
+                break
+        else:
+            merged.append(tokens[i])
+            i += 1
+    return merged
+
+
+def test_tokenize_matches_legacy_clean_message():
+    # Words joined by single spaces, so every legacy regex applies; "like" is
+    # left out because the chain also merged "like a lot" into "like-a-lot"
+    words = ("a lot little bit not really kind of sort so that even though provided in "
+             "case an i'm it's don't can't won't wasn't they're , - x A Lot good GREAT "
+             "movie. Bad!").split()
+    phrases = PhraseMatcher(LEGACY_PHRASES)
+    rng = random.Random(1)
+
+    for _ in range(20000):
+        message = " ".join(rng.choice(words) for _ in range(rng.randint(0, 10)))
+        assert " ".join(tokenize(message, phrases)) == legacy_clean_message(message), message
+
+
+def test_tokenize_normalizes_what_the_legacy_chain_missed():
+    phrases = PhraseMatcher(LEGACY_PHRASES)
+
+    # Phrases are merged whatever whitespace separates their words
+    assert tokenize("it was a  lot\tbetter", phrases) == ["it", "was", "a-lot", "better"]
+    # Phrases are merged once, not chained
+    assert tokenize("like a lot", phrases) == ["like-a", "lot"]
+    assert legacy_clean_message("like a lot") == "like-a-lot"
+
+
+def test_clean_message_uses_the_model_phrases():
+    assert (SentimentAnalyzerModel.clean_message("I don't like a bit of it, due to  the plot.")
+            == "i dont like-a bit of it, due-to the plot")
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_phrase_matcher_matches_naive_merge(seed):
+    rng = random.Random(seed)
+    vocabulary = ["a", "b", "c", "d", "e"]
+    entries = {" ".join(rng.choice(vocabulary) for _ in range(rng.randint(2, 6)))
+               for _ in range(40)}
+    matcher = PhraseMatcher(entries)
+
+    assert len(matcher) == len(entries)
+    for _ in range(2000):
+        tokens = [rng.choice(vocabulary + ["x"]) for _ in range(rng.randint(0, 20))]
+        assert matcher.merge(tokens) == naive_merge(tokens, entries), tokens
+
+
+def test_phrase_matcher_takes_the_longest_match():
+    matcher = PhraseMatcher(["not really", "not really that good", "due to", "a-lot"])
+
+    assert matcher.merge("it is not really that good".split()) == ["it", "is",
+                                                                  "not-really-that-good"]
+    assert matcher.merge("not really that bad".split()) == ["not-really", "that", "bad"]
+    assert matcher.merge("due".split()) == ["due"]
+    assert matcher.merge("a lot".split()) == ["a-lot"]
+    assert sorted(matcher.first_words) == ["a", "due", "not"]
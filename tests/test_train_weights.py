@@ -0,0 +1,47 @@
+import numpy as np
+import pytest
+
+pytest.importorskip("pandas")
+pytest.importorskip("scipy")
+
+from SentimentAnalysis.SentimentTrainer.train_weights import (accumulate_counts, count_terms,
+                                                              iter_dataset)
+
+DATASET = ('review,sentiment\n'
+           '"It was very good, a lot of fun",positive\n'
+           ',negative\n'
+           '"   ",positive\n'
+           '"Hardly good, very slow",negative\n'
+           '"Not rated",unknown\n')
+
+
+def write_dataset(tmp_path):
+    path = tmp_path / "reviews.csv"
+    path.write_text(DATASET)
+    return str(path)
+
+
+def test_iter_dataset_reads_blank_reviews_as_empty(tmp_path):
+    chunks = list(iter_dataset(write_dataset(tmp_path), chunksize=2))
+
+    reviews = [review for chunk_reviews, _ in chunks for review in chunk_reviews]
+    labels = [label for _, chunk_labels in chunks for label in chunk_labels]
+    assert reviews == ["It was very good, a lot of fun", "", "   ", "Hardly good, very slow"]
+    assert labels == [1, 0, 1, 0]
+
+
+@pytest.mark.parametrize("shards", [1, 2])
+def test_accumulate_counts_skips_blank_reviews(tmp_path, shards):
+    counts = accumulate_counts(iter_dataset(write_dataset(tmp_path), chunksize=2),
+                               ["very", "a-lot", "hardly", "nan"], shards, max_pending=1)
+
+    assert counts.tolist() == [[1, 1], [0, 1], [1, 0], [0, 0]]
+    assert counts.dtype == np.int64
+
+
+def test_count_terms_counts_every_occurrence():
+    term_ids = {"very": 0, "a-lot": 1, "good": 2}
+    counts = count_terms(["very very good", "a lot of good", "", "nothing here"],
+                         [1, 0, 1, 0], term_ids)
+
+    assert counts.tolist() == [[0, 2], [1, 0], [1, 1]]
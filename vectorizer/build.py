@@ -0,0 +1,108 @@
+"""
+Builds the native vectorizer libraries for the current platform.
+
+    v1  vectorizer/v1/vectorizer.c    -> vectorizer/v1/<os>/vectorizer.{so,dll}
+    v2  vectorizer/v2/vectorizer.cpp  -> vectorizer/v2/<os>/vectorizer.{so,dll}
+
+<os> is linux, macOS or windows, where the ctypes backend and the v2
+vectorizer look for their library. The compilers are taken from the CC and
+CXX environment variables (default: gcc and g++; on Windows, the MinGW-w64
+gcc and g++). Every library is loaded after it is built and checked for all
+the functions the Python bindings use, so a stale build fails here rather
+than falling back to a slower backend at run time.
+
+Run from the repository root:
+    python -m vectorizer.build            # both libraries
+    python -m vectorizer.build v1 --dry-run
+"""
+import argparse
+import os
+import platform
+import shlex
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+# Library file of each platform, relative to the v1 and v2 directories
+PLATFORM_LIBRARIES = {"Linux": os.path.join("linux", "vectorizer.so"),
+                      "Darwin": os.path.join("macOS", "vectorizer.so"),
+                      "Windows": os.path.join("windows", "vectorizer.dll")}
+
+# Flags producing a shared library on each platform
+SHARED_FLAGS = {"Linux": ["-shared", "-fPIC"],
+                "Darwin": ["-dynamiclib"],
+                "Windows": ["-shared", "-static-libgcc"]}
+
+TARGETS = {
+    "v1": {"source": os.path.join("v1", "vectorizer.c"), "compiler": ("CC", "gcc"),
+           "flags": ["-O2", "-Wall"], "libraries": ["-lm"]},
+    "v2": {"source": os.path.join("v2", "vectorizer.cpp"), "compiler": ("CXX", "g++"),
+           "flags": ["-O2", "-Wall", "-std=c++11"], "libraries": []},
+}
+
+
+def build_command(target, system=None):
+    """
+    Returns the compiler command line building a target ("v1" or "v2") and
+    the path of the library it writes.
+    """
+    system = system or platform.system()
+    if system not in PLATFORM_LIBRARIES:
+        raise OSError(f"Unsupported operating system: {system}")
+
+    spec = TARGETS[target]
+    variable, default = spec["compiler"]
+    if system == "Windows" and variable == "CXX":
+        spec = dict(spec, flags=spec["flags"] + ["-static-libstdc++"])
+
+    output = os.path.join(ROOT, target, PLATFORM_LIBRARIES[system])
+    command = (shlex.split(os.environ.get(variable, default)) + spec["flags"]
+               + SHARED_FLAGS[system] + ["-o", output, os.path.join(ROOT, spec["source"])]
+               + spec["libraries"])
+    return command, output
+
+
+def check_library(target, path):
+    """
+    Loads a built library through its Python bindings.
+
+    :raises OSError: If it does not load or lacks a function.
+    """
+    if target == "v1":
+        from vectorizer.v1.backends.ctypes_backend import CtypesBackend
+        CtypesBackend(path)
+    else:
+        from vectorizer.v2.vectorizer import DocumentVectorizer
+        DocumentVectorizer(path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("targets", nargs="*", metavar="TARGET",
+                        help=f"library to build, one of {', '.join(TARGETS)} (default: all)")
+    parser.add_argument("--dry-run", action="store_true", help="print the commands only")
+    args = parser.parse_args()
+
+    for target in args.targets:
+        if target not in TARGETS:
+            parser.error(f"invalid target: {target}. Choose from {', '.join(TARGETS)}")
+
+    for target in args.targets or TARGETS:
+        command, output = build_command(target)
+        print(" ".join(shlex.quote(part) for part in command))
+        if args.dry_run:
+            continue
+
+        os.makedirs(os.path.dirname(output), exist_ok=True)
+        try:
+            subprocess.run(command, check=True)
+            check_library(target, output)
+        except (OSError, subprocess.CalledProcessError) as e:
+            print(f"FAIL {target}: {e}", file=sys.stderr)
+            sys.exit(1)
+        print(f"built {os.path.relpath(output)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,234 @@
+import copy
+import ctypes
+import os
+import platform
+
+from vectorizer.v1.sentiment_vector import SentimentVector
+
+# Overrides the location of the shared library
+LIBRARY_ENV = "SENTIMENT_VECTORIZER_LIBRARY"
+
+# Directory holding the per-platform builds of vectorizer.c
+_V1_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Batch functions take the addresses of NumPy buffers, without copying. The
+# buffers are checked by _ints, _doubles and _offsets rather than by ndpointer
+# argtypes, so that the library binds (and the scalar functions run) without
+# NumPy installed.
+_int_array = ctypes.c_void_p
+_double_array = ctypes.c_void_p
+_offset_array = ctypes.c_void_p
+
+_vector_pointer = ctypes.POINTER(SentimentVector)
+
+
+def default_library_path():
+    """
+    Returns the path of the prebuilt library for the current OS, resolved
+    relative to this package rather than the working directory.
+    """
+    # Determine the OS and set the shared library path
+    if platform.system() == "Windows":
+        return os.path.join(_V1_DIR, "windows", "vectorizer.dll")
+    elif platform.system() == "Darwin":
+        return os.path.join(_V1_DIR, "macOS", "vectorizer.so")
+    elif platform.system() == "Linux":
+        return os.path.join(_V1_DIR, "linux", "vectorizer.so")
+    else:
+        raise OSError("Unsupported operating system")
+
+
+def _bind(v):
+    # Set return types for functions
+    v.create.restype = _vector_pointer
+    v.s2v.restype = _vector_pointer
+    v.v2s.restype = ctypes.c_double
+    v.combine.restype = _vector_pointer
+    v.combine_into.restype = None
+    v.combine_reduce.restype = None
+    v.destroy.restype = None
+    v.toString.restype = ctypes.c_char_p
+    v.v2s_batch.restype = None
+    v.combine_batch.restype = None
+    v.combine_reduce_batch.restype = None
+    v.momentum_batch.restype = None
+
+    # Set argument types for functions
+    v.create.argtypes = [ctypes.c_int, ctypes.c_int, ctypes.c_double]
+    v.s2v.argtypes = [ctypes.c_int, ctypes.c_int, ctypes.c_double]
+    v.v2s.argtypes = [_vector_pointer]
+    v.combine.argtypes = [_vector_pointer, _vector_pointer]
+    v.combine_into.argtypes = [_vector_pointer, _vector_pointer, _vector_pointer]
+    v.combine_reduce.argtypes = [_vector_pointer, ctypes.c_size_t, _vector_pointer]
+    v.destroy.argtypes = [_vector_pointer]
+    v.toString.argtypes = [_vector_pointer]
+
+    v.v2s_batch.argtypes = [_int_array, _int_array, _double_array, _double_array,
+                            ctypes.c_size_t]
+    v.combine_batch.argtypes = [_int_array, _int_array, _double_array,
+                                _int_array, _int_array, _double_array,
+                                _int_array, _int_array, _double_array,
+                                ctypes.c_size_t]
+    v.combine_reduce_batch.argtypes = [_int_array, _int_array, _double_array,
+                                       _offset_array, ctypes.c_size_t,
+                                       _int_array, _int_array, _double_array]
+    v.momentum_batch.argtypes = [_double_array, _offset_array, ctypes.c_size_t,
+                                 ctypes.c_double, ctypes.c_double, _double_array]
+
+
+def _ints(array):
+    import numpy as np
+    return np.ascontiguousarray(array, dtype=np.intc)
+
+
+def _doubles(array):
+    import numpy as np
+    return np.ascontiguousarray(array, dtype=np.float64)
+
+
+def _offsets(array):
+    import numpy as np
+    return np.ascontiguousarray(array, dtype=np.longlong)
+
+
+def _empty(n, ints=False):
+    import numpy as np
+    return np.empty(n, dtype=np.intc if ints else np.float64)
+
+
+class CtypesBackend:
+    """
+    Runs the vector math in the compiled vectorizer library through ctypes.
+
+    Allocation modes:
+    - "value": s2v and combine return Python-owned SentimentVector values that
+      are reclaimed by the garbage collector. Nothing is allocated by the library.
+    - "heap":  s2v and combine return pointers malloc'ed by the library, which
+      the caller must release with free().
+    """
+    name = "ctypes"
+    MODES = ("value", "heap")
+
+    def __init__(self, library_path=None, mode="value"):
+        library_path = (library_path or os.environ.get(LIBRARY_ENV)
+                        or default_library_path())
+        try:
+            self.library = ctypes.CDLL(library_path)
+        except OSError as e:
+            raise OSError(f"Unable to load the vectorizer library at "
+                          f"{library_path}: {e}") from e
+
+        try:
+            _bind(self.library)
+        except AttributeError as e:
+            raise OSError(f"The vectorizer library at {library_path} is out of "
+                          f"date; rebuild it with python -m vectorizer.build ({e})") from e
+
+        self.library_path = library_path
+        self.mode = None
+        self.set_mode(mode)
+
+    def set_mode(self, mode):
+        if mode not in self.MODES:
+            raise ValueError(f"Invalid mode: {mode}. Choose from {self.MODES}")
+        self.mode = mode
+
+    def with_mode(self, mode):
+        """
+        Returns a backend on the same library in the given mode, leaving this
+        one (and everything sharing it) in its current mode.
+        """
+        backend = copy.copy(self)
+        backend.set_mode(mode)
+        return backend
+
+    def s2v(self, magnitude, polarity, intensity):
+        if self.mode == "heap":
+            return self.library.create(magnitude, polarity, intensity)
+        return SentimentVector(magnitude, polarity, intensity)
+
+    def v2s(self, sentiment_vector):
+        return self.library.v2s(sentiment_vector)
+
+    def combine(self, v1, v2):
+        if self.mode == "heap":
+            return self.library.combine(v1, v2)
+        result = SentimentVector()
+        self.library.combine_into(v1, v2, ctypes.byref(result))
+        return result
+
+    def combine_into(self, v1, v2, out):
+        self.library.combine_into(v1, v2, ctypes.byref(out))
+
+    def combine_reduce(self, vectors):
+        """
+        Combines any number of vectors pairwise as a balanced tree, in a
+        single library call on one scratch array.
+        """
+        scratch = (SentimentVector * len(vectors))(
+            *[vector if isinstance(vector, SentimentVector) else vector.contents
+              for vector in vectors])
+
+        result = SentimentVector()
+        self.library.combine_reduce(scratch, len(vectors), ctypes.byref(result))
+        if self.mode == "heap":
+            return self.library.create(result.magnitude, result.polarity, result.intensity)
+        return result
+
+    def free(self, vector):
+        # Python-owned values are reclaimed by the garbage collector
+        if isinstance(vector, SentimentVector):
+            return
+        self.library.destroy(vector)
+
+    def toString(self, vector):
+        # Convert C string to Python string
+        c_str = self.library.toString(vector)
+        return c_str.decode('utf-8')
+
+    # ---- BATCH FUNCTIONS ----
+    # Arrays that are already C-contiguous with the native dtype (intc for
+    # magnitudes and polarities, float64 for intensities) are handed to the
+    # library without a copy.
+
+    def v2s_batch(self, magnitudes, polarities, intensities):
+        magnitudes, polarities = _ints(magnitudes), _ints(polarities)
+        intensities = _doubles(intensities)
+
+        scores = _empty(len(magnitudes))
+        self.library.v2s_batch(magnitudes.ctypes.data, polarities.ctypes.data,
+                               intensities.ctypes.data, scores.ctypes.data, len(scores))
+        return scores
+
+    def combine_batch(self, magnitudes1, polarities1, intensities1,
+                      magnitudes2, polarities2, intensities2):
+        columns = (_ints(magnitudes1), _ints(polarities1), _doubles(intensities1),
+                   _ints(magnitudes2), _ints(polarities2), _doubles(intensities2))
+
+        n = len(columns[0])
+        out = (_empty(n, ints=True), _empty(n, ints=True), _empty(n))
+        self.library.combine_batch(*[column.ctypes.data for column in columns + out], n)
+        return out
+
+    def combine_reduce_batch(self, magnitudes, polarities, intensities, offsets):
+        import numpy as np
+
+        # The library reduces in place, so always work on copies
+        columns = (np.array(magnitudes, dtype=np.intc), np.array(polarities, dtype=np.intc),
+                   np.array(intensities, dtype=np.float64))
+        offsets = _offsets(offsets)
+
+        n = len(offsets) - 1
+        out = (_empty(n, ints=True), _empty(n, ints=True), _empty(n))
+        self.library.combine_reduce_batch(*[column.ctypes.data for column in columns],
+                                          offsets.ctypes.data, n,
+                                          *[column.ctypes.data for column in out])
+        return out
+
+    def momentum_batch(self, scores, offsets, alpha=0.5, beta=0.5):
+        scores, offsets = _doubles(scores), _offsets(offsets)
+
+        out = _empty(len(offsets) - 1)
+        self.library.momentum_batch(scores.ctypes.data, offsets.ctypes.data, len(out),
+                                    alpha, beta, out.ctypes.data)
+        return out
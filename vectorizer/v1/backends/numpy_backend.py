@@ -0,0 +1,140 @@
+import math
+
+import numpy as np
+
+from vectorizer.v1.backends.python_backend import PythonBackend
+
+
+class NumpyBackend(PythonBackend):
+    """
+    Pure-Python scalar functions with NumPy-vectorized batch functions. Needs
+    no compiled library.
+    """
+    name = "numpy"
+
+    # ---- BATCH FUNCTIONS ----
+
+    def v2s_batch(self, magnitudes, polarities, intensities):
+        magnitudes = np.asarray(magnitudes)
+        intensities = np.asarray(intensities, dtype=np.float64)
+
+        # Adjust for base-sentiment
+        base_sentiment = np.where((magnitudes == 0) & (intensities != 1),
+                                  np.fabs(1 - intensities), magnitudes)
+
+        score = base_sentiment * np.asarray(polarities) * intensities
+
+        # np.arctan may differ from the C library's atan in the last bit, so use
+        # math.atan over the (few) distinct raw scores to stay bit-for-bit with v2s
+        distinct, inverse = np.unique(score, return_inverse=True)
+        arctan = np.array([math.atan(x) for x in distinct.tolist()], dtype=np.float64)
+        return arctan[inverse.reshape(score.shape)] * 0.636
+
+    def combine_batch(self, magnitudes1, polarities1, intensities1,
+                      magnitudes2, polarities2, intensities2):
+        m1, p1 = np.asarray(magnitudes1), np.asarray(polarities1)
+        m2, p2 = np.asarray(magnitudes2), np.asarray(polarities2)
+        i1 = np.asarray(intensities1, dtype=np.float64)
+        i2 = np.asarray(intensities2, dtype=np.float64)
+
+        # Calculate effective intensities
+        eff_intensity1 = np.where(i1 >= 1, i1 - 1, 1 - i1)
+        eff_intensity2 = np.where(i2 >= 1, i2 - 1, 1 - i2)
+        first_stronger = eff_intensity1 > eff_intensity2
+
+        new_intensity = np.where(first_stronger, i1, i2)
+
+        polarity_product = p1 * p2
+        magnitude_product = m1 * m2
+        same_polarity = polarity_product == 1
+        opposite_polarity = polarity_product == -1
+
+        new_magnitude = np.where(same_polarity, m1 + m2,
+                                 np.where(opposite_polarity, np.abs(m1) + np.abs(m2),
+                                          np.abs(m1 + m2)))
+
+        opposite_result = np.where(magnitude_product > 0, 1,
+                                   np.where(magnitude_product < 0, -1,
+                                            np.where(first_stronger, p1, p2)))
+        new_polarity = np.where(same_polarity, p1,
+                                np.where(opposite_polarity, opposite_result, p1 + p2))
+
+        return (new_magnitude.astype(np.intc), new_polarity.astype(np.intc),
+                new_intensity)
+
+    def combine_reduce_batch(self, magnitudes, polarities, intensities, offsets):
+        offsets = np.asarray(offsets, dtype=np.int64)
+        starts = offsets[:-1]
+        lengths = offsets[1:] - starts
+
+        # Segments without vectors reduce to the neutral vector
+        out_magnitudes = np.zeros(len(lengths), dtype=np.intc)
+        out_polarities = np.ones(len(lengths), dtype=np.intc)
+        out_intensities = np.ones(len(lengths), dtype=np.float64)
+
+        # Working copies of the elements covered by the segments, with the
+        # segment and the position within the segment of every element
+        first, last = (offsets[0], offsets[-1]) if len(offsets) else (0, 0)
+        magnitudes = np.array(magnitudes[first:last], dtype=np.intc)
+        polarities = np.array(polarities[first:last], dtype=np.intc)
+        intensities = np.array(intensities[first:last], dtype=np.float64)
+        segments = np.repeat(np.arange(len(lengths)), lengths)
+        positions = np.arange(len(segments)) - np.repeat(starts - first, lengths)
+
+        # Each level of the tree is a single combine_batch over the pairs of
+        # every segment. Elements of a segment stay contiguous and in order.
+        while segments.size:
+            segment_lengths = lengths[segments]
+            done = segment_lengths == 1
+            out_magnitudes[segments[done]] = magnitudes[done]
+            out_polarities[segments[done]] = polarities[done]
+            out_intensities[segments[done]] = intensities[done]
+
+            even = positions % 2 == 0
+            heads = np.flatnonzero(even & (positions + 1 < segment_lengths))
+            tails = heads + 1
+            (magnitudes[heads], polarities[heads], intensities[heads]) = self.combine_batch(
+                magnitudes[heads], polarities[heads], intensities[heads],
+                magnitudes[tails], polarities[tails], intensities[tails])
+
+            # Pair heads now hold their pair; odd elements at the end of a
+            # segment are carried over unchanged
+            keep = even & ~done
+            segments, positions = segments[keep], positions[keep] // 2
+            magnitudes, polarities = magnitudes[keep], polarities[keep]
+            intensities = intensities[keep]
+            lengths = (lengths + 1) // 2
+
+        return out_magnitudes, out_polarities, out_intensities
+
+    def momentum_batch(self, scores, offsets, alpha=0.5, beta=0.5):
+        scores = np.asarray(scores, dtype=np.float64)
+        offsets = np.asarray(offsets, dtype=np.int64)
+
+        starts = offsets[:-1]
+        lengths = offsets[1:] - starts
+        out = np.zeros(len(lengths), dtype=np.float64)  # Default value if no input
+
+        # Each momentum step is applied to every segment that is still long
+        # enough, so the loop runs once per position instead of once per score
+        active = np.flatnonzero(lengths > 0)
+        prev_score = scores[starts[active]]
+        momentum = np.zeros(len(active), dtype=np.float64)
+
+        step = 1
+        while active.size:
+            still_active = lengths[active] > step
+            out[active[~still_active]] = prev_score[~still_active]
+
+            active = active[still_active]
+            prev_score = prev_score[still_active]
+            momentum = momentum[still_active]
+
+            current_score = scores[starts[active] + step]
+            sentiment_change = current_score - prev_score
+
+            momentum = beta * momentum + (1 - beta) * sentiment_change
+            prev_score = alpha * current_score + (1 - alpha) * (prev_score + momentum)
+            step += 1
+
+        return out
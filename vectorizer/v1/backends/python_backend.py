@@ -0,0 +1,181 @@
+import math
+
+from vectorizer.v1.sentiment_vector import SentimentVector
+
+
+def components_to_scalar(magnitude, polarity, intensity):
+    """
+    Mirrors v2s in vectorizer.c for the components of a sentiment vector.
+    """
+    # Adjust for base-sentiment
+    if magnitude == 0 and intensity != 1:
+        base_sentiment = math.fabs(1 - intensity)
+    else:
+        base_sentiment = float(magnitude)
+
+    # Calculate score
+    score = base_sentiment * polarity * intensity
+    return math.atan(score) * 0.636
+
+
+def effective_intensity(intensity):
+    """
+    Mirrors compute_effective_intensity in vectorizer.c.
+    """
+    return (intensity - 1) if intensity >= 1 else (1 - intensity)
+
+
+def combine_components(magnitude1, polarity1, intensity1,
+                       magnitude2, polarity2, intensity2):
+    """
+    Mirrors combine in vectorizer.c and returns the components of the result.
+    """
+    # Calculate effective intensities
+    eff_intensity1 = effective_intensity(intensity1)
+    eff_intensity2 = effective_intensity(intensity2)
+
+    new_intensity = intensity1 if eff_intensity1 > eff_intensity2 else intensity2
+
+    # Case 1: Same polarity
+    if polarity1 * polarity2 == 1:
+        new_magnitude = magnitude1 + magnitude2
+        new_polarity = polarity1
+    # Case 2: Opposite polarity
+    elif polarity1 * polarity2 == -1:
+        new_magnitude = abs(magnitude1) + abs(magnitude2)
+
+        # Determine the resulting polarity
+        if magnitude1 * magnitude2 > 0:
+            new_polarity = 1
+        elif magnitude1 * magnitude2 < 0:
+            new_polarity = -1
+        else:
+            new_polarity = polarity1 if eff_intensity1 > eff_intensity2 else polarity2
+    # Case 3: One or both polarities are zero
+    else:
+        new_magnitude = abs(magnitude1 + magnitude2)
+        new_polarity = polarity1 + polarity2
+
+    return new_magnitude, new_polarity, new_intensity
+
+
+def reduce_components(components):
+    """
+    Mirrors combine_reduce in vectorizer.c: combines a list of (magnitude,
+    polarity, intensity) triples pairwise, level by level, carrying an odd
+    triple at the end of a level to the next one.
+    """
+    if not components:
+        return 0, 1, 1.0
+
+    while len(components) > 1:
+        reduced = [combine_components(*components[k], *components[k + 1])
+                   for k in range(0, len(components) - 1, 2)]
+        if len(components) % 2:
+            reduced.append(components[-1])
+        components = reduced
+
+    return components[0]
+
+
+class PythonBackend:
+    """
+    Pure-Python implementation of the vectorizer. Needs no compiled library
+    and produces the same results as the ctypes backend.
+    """
+    name = "python"
+
+    def s2v(self, magnitude, polarity, intensity):
+        return SentimentVector(magnitude, polarity, intensity)
+
+    def v2s(self, sentiment_vector):
+        return components_to_scalar(sentiment_vector.magnitude,
+                                    sentiment_vector.polarity,
+                                    sentiment_vector.intensity)
+
+    def combine(self, v1, v2):
+        return SentimentVector(*combine_components(
+            v1.magnitude, v1.polarity, v1.intensity,
+            v2.magnitude, v2.polarity, v2.intensity))
+
+    def combine_into(self, v1, v2, out):
+        out.magnitude, out.polarity, out.intensity = combine_components(
+            v1.magnitude, v1.polarity, v1.intensity,
+            v2.magnitude, v2.polarity, v2.intensity)
+
+    def combine_reduce(self, vectors):
+        return SentimentVector(*reduce_components(
+            [(v.magnitude, v.polarity, v.intensity) for v in vectors]))
+
+    def free(self, vector):
+        # Vectors are Python-owned and reclaimed by the garbage collector
+        pass
+
+    def toString(self, vector):
+        return (f"SentimentVector: [magnitude: {vector.magnitude}, "
+                f"polarity: {vector.polarity}, intensity: {vector.intensity:.4f}]\n")
+
+    # ---- BATCH FUNCTIONS ----
+    # They take and return NumPy arrays. NumPy is imported on first use, so
+    # the scalar functions work without it.
+
+    def v2s_batch(self, magnitudes, polarities, intensities):
+        import numpy as np
+
+        return np.array([components_to_scalar(m, p, i) for m, p, i in
+                         zip(np.asarray(magnitudes).tolist(),
+                             np.asarray(polarities).tolist(),
+                             np.asarray(intensities, dtype=np.float64).tolist())],
+                        dtype=np.float64)
+
+    def combine_batch(self, magnitudes1, polarities1, intensities1,
+                      magnitudes2, polarities2, intensities2):
+        import numpy as np
+
+        columns = [np.asarray(column).tolist() for column in
+                   (magnitudes1, polarities1, intensities1,
+                    magnitudes2, polarities2, intensities2)]
+        combined = [combine_components(*components) for components in zip(*columns)]
+
+        new_magnitudes = np.array([c[0] for c in combined], dtype=np.intc)
+        new_polarities = np.array([c[1] for c in combined], dtype=np.intc)
+        new_intensities = np.array([c[2] for c in combined], dtype=np.float64)
+        return new_magnitudes, new_polarities, new_intensities
+
+    def combine_reduce_batch(self, magnitudes, polarities, intensities, offsets):
+        import numpy as np
+
+        components = list(zip(np.asarray(magnitudes).tolist(),
+                              np.asarray(polarities).tolist(),
+                              np.asarray(intensities, dtype=np.float64).tolist()))
+        offsets = np.asarray(offsets).tolist()
+        reduced = [reduce_components(components[offsets[k]:offsets[k + 1]])
+                   for k in range(len(offsets) - 1)]
+
+        new_magnitudes = np.array([r[0] for r in reduced], dtype=np.intc)
+        new_polarities = np.array([r[1] for r in reduced], dtype=np.intc)
+        new_intensities = np.array([r[2] for r in reduced], dtype=np.float64)
+        return new_magnitudes, new_polarities, new_intensities
+
+    def momentum_batch(self, scores, offsets, alpha=0.5, beta=0.5):
+        import numpy as np
+
+        scores = np.asarray(scores, dtype=np.float64).tolist()
+        offsets = np.asarray(offsets).tolist()
+        out = np.zeros(len(offsets) - 1, dtype=np.float64)
+
+        for k in range(len(offsets) - 1):
+            start, end = offsets[k], offsets[k + 1]
+            if start >= end:
+                continue  # Default value if no input
+
+            prev_score = scores[start]
+            momentum = 0
+            for current_score in scores[start + 1:end]:
+                sentiment_change = current_score - prev_score
+                momentum = beta * momentum + (1 - beta) * sentiment_change
+                prev_score = alpha * current_score + (1 - alpha) * (prev_score + momentum)
+
+            out[k] = prev_score
+
+        return out
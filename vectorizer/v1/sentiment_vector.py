@@ -0,0 +1,10 @@
+import ctypes
+
+
+# Define the SentimentVector structure, shared by every backend. It mirrors
+# struct SentimentVector in vectorizer.h so values can be passed to the library
+# by reference without conversion.
+class SentimentVector(ctypes.Structure):
+    _fields_ = [("magnitude", ctypes.c_int),
+                ("polarity", ctypes.c_int),
+                ("intensity", ctypes.c_double)]
@@ -17,72 +17,119 @@ struct SentimentVector* create(int magnitude, int polarity, double intensity) {
     return v;
 }
 
+// A function to free a sentiment vector returned by create, s2v or combine
+void destroy(struct SentimentVector* v) {
+    free(v);
+}
+
 // A function to convert a scalar to sentiment vector
 struct SentimentVector* s2v(int bs, int neg, double mult) {
     return create(bs, neg, mult);
 }
 
-// A function to convert a sentiment vector to scalar
-double v2s(struct SentimentVector* v) {
+// A function to convert the components of a sentiment vector to scalar
+static double components_to_scalar(int magnitude, int polarity, double intensity) {
     double base_sentiment;
 
     // Adjust for base-sentiment
-    if (v->magnitude == 0 && v->intensity != 1) {
-        base_sentiment = fabs(1 - v->intensity);
+    if (magnitude == 0 && intensity != 1) {
+        base_sentiment = fabs(1 - intensity);
     } else {
-        base_sentiment = v->magnitude;
+        base_sentiment = magnitude;
     }
 
     // Calculate score
-    double score = base_sentiment * v->polarity * v->intensity;
+    double score = base_sentiment * polarity * intensity;
     return atan(score) * 0.636;
 }
 
+// A function to convert a sentiment vector to scalar
+double v2s(struct SentimentVector* v) {
+    return components_to_scalar(v->magnitude, v->polarity, v->intensity);
+}
 
-// A function to combine 2 sentiment vectors
-struct SentimentVector* combine(struct SentimentVector* v1, struct SentimentVector* v2) {
-    if (!v1 || !v2) return NULL; // Safety check
 
-    int new_magnitude;
-    int new_polarity;
-    double new_intensity;
+// A function to combine 2 sentiment vectors by value
+static struct SentimentVector combine_values(struct SentimentVector v1, struct SentimentVector v2) {
+    struct SentimentVector result;
 
     // Calculate effective intensities
-    double eff_intensity1 = compute_effective_intensity(v1);
-    double eff_intensity2 = compute_effective_intensity(v2);
+    double eff_intensity1 = compute_effective_intensity(&v1);
+    double eff_intensity2 = compute_effective_intensity(&v2);
 
-    new_intensity = (eff_intensity1 > eff_intensity2) ? v1->intensity : v2->intensity;
+    result.intensity = (eff_intensity1 > eff_intensity2) ? v1.intensity : v2.intensity;
 
     // Case 1: Same polarity
-    if (v1->polarity * v2->polarity == 1) {
-        new_magnitude = v1->magnitude + v2->magnitude;
-        new_polarity = v1->polarity; // Same as input polarities
+    if (v1.polarity * v2.polarity == 1) {
+        result.magnitude = v1.magnitude + v2.magnitude;
+        result.polarity = v1.polarity; // Same as input polarities
     }
     // Case 2: Opposite polarity
-    else if (v1->polarity * v2->polarity == -1) {
+    else if (v1.polarity * v2.polarity == -1) {
         // Calculate the net magnitude
-        new_magnitude = abs(v1->magnitude) + abs(v2->magnitude);
+        result.magnitude = abs(v1.magnitude) + abs(v2.magnitude);
 
         // Determine the resulting polarity
-        if (v1->magnitude * v2->magnitude > 0) {
-            new_polarity = 1; // Positive
-        } else if (v1->magnitude * v2->magnitude < 0) {
-            new_polarity = -1; // Negative
+        if (v1.magnitude * v2.magnitude > 0) {
+            result.polarity = 1; // Positive
+        } else if (v1.magnitude * v2.magnitude < 0) {
+            result.polarity = -1; // Negative
         } else {
-            new_polarity = (eff_intensity1 > eff_intensity2) ? v1->polarity : v2->polarity;
+            result.polarity = (eff_intensity1 > eff_intensity2) ? v1.polarity : v2.polarity;
         }
     }
     // Case 3: One or both polarities are zero
     else {
         // Combine magnitudes (considering their signs and polarities)
-        new_magnitude = v1->magnitude + v2->magnitude;
-        new_polarity =  v1->polarity + v2->polarity;
-        
-        // Take the absolute value of the net magnitude
-        new_magnitude = abs(new_magnitude);
+        // and take the absolute value of the net magnitude
+        result.magnitude = abs(v1.magnitude + v2.magnitude);
+        result.polarity = v1.polarity + v2.polarity;
+    }
+
+    return result;
+}
+
+// A function to combine 2 sentiment vectors
+struct SentimentVector* combine(struct SentimentVector* v1, struct SentimentVector* v2) {
+    if (!v1 || !v2) return NULL; // Safety check
+
+    struct SentimentVector result = combine_values(*v1, *v2);
+    return create(result.magnitude, result.polarity, result.intensity);
+}
+
+// A function to combine 2 sentiment vectors into a caller-owned vector
+void combine_into(struct SentimentVector* v1, struct SentimentVector* v2, struct SentimentVector* out) {
+    if (!v1 || !v2 || !out) return; // Safety check
+
+    *out = combine_values(*v1, *v2);
+}
+
+// A function to combine n sentiment vectors into a caller-owned vector.
+// Adjacent pairs are combined level by level (a balanced tree), and an odd
+// vector at the end of a level is carried to the next one. The vectors array
+// is used as scratch space and is overwritten. No vectors: the neutral (0, 1, 1).
+void combine_reduce(struct SentimentVector* vectors, size_t n, struct SentimentVector* out) {
+    if (!out) return; // Safety check
+
+    if (!vectors || n == 0) {
+        out->magnitude = 0;
+        out->polarity = 1;
+        out->intensity = 1;
+        return;
+    }
+
+    while (n > 1) {
+        size_t half = n / 2;
+        for (size_t k = 0; k < half; k++) {
+            vectors[k] = combine_values(vectors[2 * k], vectors[2 * k + 1]);
+        }
+        if (n % 2) {
+            vectors[half] = vectors[n - 1];
+        }
+        n = half + n % 2;
     }
 
-    return create(new_magnitude, new_polarity, new_intensity);
+    *out = vectors[0];
 }
 
 // Function to compute effective strength (magnitude × effective intensity)
@@ -99,3 +146,106 @@ char* toString(struct SentimentVector* v) {
 
     return result;
 }
+
+
+// ---- BATCH FUNCTIONS ----
+// These work on caller-owned struct-of-arrays buffers: element i of the
+// magnitudes, polarities and intensities arrays together form one vector.
+// Nothing is allocated.
+
+// A function to convert n sentiment vectors to scalars
+void v2s_batch(const int* magnitudes, const int* polarities, const double* intensities,
+               double* scores, size_t n) {
+    for (size_t i = 0; i < n; i++) {
+        scores[i] = components_to_scalar(magnitudes[i], polarities[i], intensities[i]);
+    }
+}
+
+// A function to combine n pairs of sentiment vectors. The output buffers may
+// alias the first or second input buffers.
+void combine_batch(const int* magnitudes1, const int* polarities1, const double* intensities1,
+                   const int* magnitudes2, const int* polarities2, const double* intensities2,
+                   int* out_magnitudes, int* out_polarities, double* out_intensities, size_t n) {
+    for (size_t i = 0; i < n; i++) {
+        struct SentimentVector v1 = {magnitudes1[i], polarities1[i], intensities1[i]};
+        struct SentimentVector v2 = {magnitudes2[i], polarities2[i], intensities2[i]};
+        struct SentimentVector result = combine_values(v1, v2);
+
+        out_magnitudes[i] = result.magnitude;
+        out_polarities[i] = result.polarity;
+        out_intensities[i] = result.intensity;
+    }
+}
+
+// A function to combine the vectors of every segment as combine_reduce does.
+// Segment k owns elements offsets[k] .. offsets[k + 1] - 1 of the input
+// arrays, which are used as scratch space and are overwritten.
+void combine_reduce_batch(int* magnitudes, int* polarities, double* intensities,
+                          const long long* offsets, size_t n_segments,
+                          int* out_magnitudes, int* out_polarities, double* out_intensities) {
+    for (size_t s = 0; s < n_segments; s++) {
+        long long start = offsets[s];
+        size_t n = (offsets[s + 1] > start) ? (size_t)(offsets[s + 1] - start) : 0;
+        int* m = magnitudes + start;
+        int* p = polarities + start;
+        double* in = intensities + start;
+
+        if (n == 0) {
+            out_magnitudes[s] = 0;
+            out_polarities[s] = 1;
+            out_intensities[s] = 1;
+            continue;
+        }
+
+        while (n > 1) {
+            size_t half = n / 2;
+            for (size_t k = 0; k < half; k++) {
+                struct SentimentVector v1 = {m[2 * k], p[2 * k], in[2 * k]};
+                struct SentimentVector v2 = {m[2 * k + 1], p[2 * k + 1], in[2 * k + 1]};
+                struct SentimentVector result = combine_values(v1, v2);
+
+                m[k] = result.magnitude;
+                p[k] = result.polarity;
+                in[k] = result.intensity;
+            }
+            if (n % 2) {
+                m[half] = m[n - 1];
+                p[half] = p[n - 1];
+                in[half] = in[n - 1];
+            }
+            n = half + n % 2;
+        }
+
+        out_magnitudes[s] = m[0];
+        out_polarities[s] = p[0];
+        out_intensities[s] = in[0];
+    }
+}
+
+// A function to apply the momentum-based reduction to segmented scores.
+// Segment k owns scores[offsets[k]] .. scores[offsets[k + 1] - 1].
+void momentum_batch(const double* scores, const long long* offsets, size_t n_segments,
+                    double alpha, double beta, double* out) {
+    for (size_t k = 0; k < n_segments; k++) {
+        long long start = offsets[k];
+        long long end = offsets[k + 1];
+
+        if (start >= end) {
+            out[k] = 0; // Default value if no input
+            continue;
+        }
+
+        double prev_score = scores[start];
+        double momentum = 0;
+
+        for (long long i = start + 1; i < end; i++) {
+            double current_score = scores[i];
+            double sentiment_change = current_score - prev_score;
+
+            momentum = beta * momentum + (1 - beta) * sentiment_change;
+            prev_score = alpha * current_score + (1 - alpha) * (prev_score + momentum);
+        }
+
+        out[k] = prev_score;
+    }
+}
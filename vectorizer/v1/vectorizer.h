@@ -21,6 +21,9 @@ struct SentimentVector {
 // A function to create a sentiment vector
 struct SentimentVector* create(int magnitutde, int polarity, double intensity);
 
+// A function to free a sentiment vector returned by create, s2v or combine
+void destroy(struct SentimentVector* v);
+
 // A function to convert a scalar to sentiment vector
 struct SentimentVector* s2v(int bs, int neg, double mult);
 
@@ -30,10 +33,34 @@ double v2s(struct SentimentVector* v);
 // A function to combine 2 sentiment vectors
 struct SentimentVector* combine(struct SentimentVector* v1, struct SentimentVector* v2);
 
+// A function to combine 2 sentiment vectors into a caller-owned vector
+void combine_into(struct SentimentVector* v1, struct SentimentVector* v2, struct SentimentVector* out);
+
+// A function to combine n sentiment vectors pairwise, as a balanced tree
+void combine_reduce(struct SentimentVector* vectors, size_t n, struct SentimentVector* out);
+
 // A function to compute the effective intensity
 double compute_effective_intensity(struct SentimentVector* v);
 
 // A function to print details about Sentiment Vector
 char* toString(struct SentimentVector* v);
 
+// A function to convert n sentiment vectors, given as arrays, to scalars
+void v2s_batch(const int* magnitudes, const int* polarities, const double* intensities,
+               double* scores, size_t n);
+
+// A function to combine n pairs of sentiment vectors, given as arrays
+void combine_batch(const int* magnitudes1, const int* polarities1, const double* intensities1,
+                   const int* magnitudes2, const int* polarities2, const double* intensities2,
+                   int* out_magnitudes, int* out_polarities, double* out_intensities, size_t n);
+
+// A function to combine the vectors of every segment, given as arrays, pairwise
+void combine_reduce_batch(int* magnitudes, int* polarities, double* intensities,
+                          const long long* offsets, size_t n_segments,
+                          int* out_magnitudes, int* out_polarities, double* out_intensities);
+
+// A function to apply the momentum-based reduction to segmented scores
+void momentum_batch(const double* scores, const long long* offsets, size_t n_segments,
+                    double alpha, double beta, double* out);
+
 #endif
\ No newline at end of file
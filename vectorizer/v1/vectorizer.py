@@ -1,52 +1,247 @@
-import ctypes
-import platform
-
-# Determine the OS and set the shared library path
-if platform.system() == "Windows":
-    # For Windows, load the .dll file
-    v = ctypes.CDLL("Vectorizer\\v1\\windows\\vectorizer.dll")
-elif platform.system() == "Darwin":
-    # For macOS, load the .so file
-    v = ctypes.CDLL("Vectorizer/v1/macOS/vectorizer.so")
-elif platform.system() == "Linux":
-    # For Linux, load the .so file
-    v = ctypes.CDLL("Vectorizer/v1/linux/vectorizer.so")
-else:
-    raise OSError("Unsupported operating system")
-
-# Define the SentimentVector structure
-class SentimentVector(ctypes.Structure):
-    _fields_ = [("magnitude", ctypes.c_int),
-                ("polarity", ctypes.c_int),
-                ("intensity", ctypes.c_double)]
-
-# Set return types for functions
-v.create.restype = ctypes.POINTER(SentimentVector)
-v.s2v.restype = ctypes.POINTER(SentimentVector)
-v.v2s.restype = ctypes.c_double
-v.combine.restype = ctypes.POINTER(SentimentVector)
-v.toString.restype = ctypes.c_char_p
-
-# Set argument types for functions
-v.create.argtypes = [ctypes.c_int, ctypes.c_int, ctypes.c_double]
-v.s2v.argtypes = [ctypes.c_int, ctypes.c_int, ctypes.c_double]
-v.v2s.argtypes = [ctypes.POINTER(SentimentVector)]
-v.combine.argtypes = [ctypes.POINTER(SentimentVector), ctypes.POINTER(SentimentVector)]
-v.toString.argtypes = [ctypes.POINTER(SentimentVector)]
-
-def _create(magnitude, polarity, intensity):
-    return v.create(magnitude, polarity, intensity)
+import importlib
+import os
+import warnings
+
+from vectorizer.v1.sentiment_vector import SentimentVector
+
+# Selects the default backend when none is requested explicitly
+BACKEND_ENV = "SENTIMENT_VECTORIZER_BACKEND"
+
+# Registered backends: name -> factory returning a backend instance. Backend
+# modules are only imported when a backend is first requested.
+_BACKENDS = {}
+
+# Order in which "auto" tries the backends. ctypes comes first for its batch
+# and reduce functions; on the scalar path every call pays the FFI overhead,
+# so the backends are on par there and pure Python often wins. Vectors per
+# second from python -m benchmarks.bench_backends (x86-64 Linux, 3 runs):
+#
+#            s2v+v2s     v2s_batch   combine_batch   reduce_batch
+#   ctypes   0.9-1.4M    43-61M      27-33M          27-35M
+#   numpy    1.2-1.6M    14-21M      13-18M          5-6M
+#   python   1.2-1.4M    2.4-4.1M    0.8-1.2M        0.8-1.1M
+AUTO_ORDER = ("ctypes", "numpy", "python")
+
+_instances = {}
+
+
+def register_backend(name, factory):
+    """
+    Registers a backend factory under the given name. The factory is called
+    with no arguments the first time the backend is requested and must raise
+    OSError or ImportError if the backend cannot be loaded.
+    """
+    _BACKENDS[name] = factory
+    _instances.pop(name, None)
+
+
+def _lazy_factory(module_name, class_name):
+    def factory():
+        return getattr(importlib.import_module(module_name), class_name)()
+    return factory
+
+
+register_backend("ctypes", _lazy_factory("vectorizer.v1.backends.ctypes_backend",
+                                         "CtypesBackend"))
+register_backend("python", _lazy_factory("vectorizer.v1.backends.python_backend",
+                                         "PythonBackend"))
+register_backend("numpy", _lazy_factory("vectorizer.v1.backends.numpy_backend",
+                                        "NumpyBackend"))
+
+
+def backend_names():
+    return list(_BACKENDS)
+
+
+def get_backend(name=None):
+    """
+    Returns the backend registered under the given name, loading it on first
+    use. Without a name, the SENTIMENT_VECTORIZER_BACKEND environment variable
+    is used, and "auto" (the default) picks the first backend in AUTO_ORDER
+    that loads, with a RuntimeWarning if an earlier one did not. Backend
+    objects are returned unchanged.
+    """
+    if name is not None and not isinstance(name, str):
+        return name
+
+    name = name or os.environ.get(BACKEND_ENV) or "auto"
+    if name == "auto":
+        errors = []
+        for candidate in AUTO_ORDER:
+            try:
+                backend = get_backend(candidate)
+            except (OSError, ImportError) as e:
+                errors.append(f"{candidate}: {e}")
+                continue
+            if errors:
+                # Falling back past the native library is slower; say why
+                warnings.warn(f"Using the {candidate} vectorizer backend ({'; '.join(errors)}). "
+                              f"Build the native library with: python -m vectorizer.build",
+                              RuntimeWarning, stacklevel=2)
+            return backend
+        raise OSError("No vectorizer backend could be loaded:\n" + "\n".join(errors))
+
+    if name not in _BACKENDS:
+        raise ValueError(f"Invalid backend: {name}. Choose from {backend_names()}")
+
+    if name not in _instances:
+        _instances[name] = _BACKENDS[name]()
+    return _instances[name]
+
+
+def available_backends():
+    """
+    Returns the names of the backends that load on this machine.
+    """
+    names = []
+    for name in _BACKENDS:
+        try:
+            get_backend(name)
+        except (OSError, ImportError):
+            continue
+        names.append(name)
+    return names
+
+
+# The backend behind the module-level functions below. It is loaded on
+# first use, so importing this module never loads a library.
+_backend = None
+
+
+def use_backend(name):
+    """
+    Sets the backend used by the module-level functions and returns it.
+    """
+    global _backend
+    _backend = get_backend(name)
+    return _backend
+
+
+def current_backend():
+    """
+    Returns the backend used by the module-level functions, loading the
+    default one (see get_backend) on first use.
+    """
+    global _backend
+    if _backend is None:
+        _backend = get_backend()
+    return _backend
+
+
+# Allocation modes of the ctypes backend:
+# - "value": s2v and combine return Python-owned SentimentVector values that are
+#   reclaimed by the garbage collector. Nothing is allocated by the library.
+# - "heap":  s2v and combine return pointers malloc'ed by the library, which the
+#   caller must release with free().
+# The other backends always work on Python-owned values.
+MODES = ("value", "heap")
+
+
+def set_mode(mode):
+    """
+    Sets the allocation mode of the module-level functions and returns their
+    backend. The mode belongs to that backend instance only: the shared
+    backends handed out by get_backend, and so every analyzer, keep theirs.
+    """
+    if mode not in MODES:
+        raise ValueError(f"Invalid mode: {mode}. Choose from {MODES}")
+    global _backend
+    backend = current_backend()
+    if getattr(backend, "mode", "value") == mode:
+        return backend
+    if not hasattr(backend, "with_mode"):
+        raise ValueError(f"The {backend.name} backend only supports the value mode")
+    _backend = backend.with_mode(mode)
+    return _backend
+
+
+def get_mode():
+    return getattr(current_backend(), "mode", "value")
+
 
 def s2v(magnitude, polarity, intensity):
-    return _create(magnitude, polarity, intensity)
+    return current_backend().s2v(magnitude, polarity, intensity)
 
 def v2s(sentiment_vector):
-    return v.v2s(sentiment_vector)
+    return current_backend().v2s(sentiment_vector)
 
 def combine(v1, v2):
-    return v.combine(v1, v2)
+    return current_backend().combine(v1, v2)
+
+def combine_reduce(vectors):
+    return current_backend().combine_reduce(vectors)
+
+def free(vector):
+    current_backend().free(vector)
 
 def toString(vector):
-    # Convert C string to Python string
-    c_str = v.toString(vector)
-    return c_str.decode('utf-8')
\ No newline at end of file
+    return current_backend().toString(vector)
+
+
+class VectorArena:
+    """
+    A reusable pool of SentimentVector slots for callers that keep pointers.
+
+    Vectors handed out by the arena stay valid until reset() is called, after
+    which their slots are reused. Memory is only allocated when the arena
+    grows past its current capacity, one block at a time.
+    """
+
+    def __init__(self, block_size=1024, backend=None):
+        self.block_size = block_size
+        self.backend = get_backend(backend) if backend is not None else current_backend()
+        self.__blocks = [(SentimentVector * block_size)()]
+        self.__block = 0
+        self.__used = 0
+
+    def __len__(self):
+        return self.__block * self.block_size + self.__used
+
+    def s2v(self, magnitude, polarity, intensity):
+        vector = self.__next_slot()
+        vector.magnitude = magnitude
+        vector.polarity = polarity
+        vector.intensity = intensity
+        return vector
+
+    def combine(self, v1, v2):
+        vector = self.__next_slot()
+        self.backend.combine_into(v1, v2, vector)
+        return vector
+
+    def reset(self):
+        """
+        Releases every vector handed out so far. Blocks are kept for reuse.
+        """
+        self.__block = 0
+        self.__used = 0
+
+    def __next_slot(self):
+        if self.__used == self.block_size:
+            self.__block += 1
+            self.__used = 0
+            if self.__block == len(self.__blocks):
+                self.__blocks.append((SentimentVector * self.block_size)())
+
+        vector = self.__blocks[self.__block][self.__used]
+        self.__used += 1
+        return vector
+
+
+# ---- BATCH FUNCTIONS ----
+# Columnar counterparts of v2s and combine. Each argument is an array holding
+# one component of many sentiment vectors.
+
+def v2s_batch(magnitudes, polarities, intensities):
+    return current_backend().v2s_batch(magnitudes, polarities, intensities)
+
+def combine_batch(magnitudes1, polarities1, intensities1,
+                  magnitudes2, polarities2, intensities2):
+    return current_backend().combine_batch(magnitudes1, polarities1, intensities1,
+                                  magnitudes2, polarities2, intensities2)
+
+def combine_reduce_batch(magnitudes, polarities, intensities, offsets):
+    return current_backend().combine_reduce_batch(magnitudes, polarities, intensities, offsets)
+
+def momentum_batch(scores, offsets, alpha=0.5, beta=0.5):
+    return current_backend().momentum_batch(scores, offsets, alpha, beta)
@@ -0,0 +1,208 @@
+#include "vectorizer.h"
+
+#include <cmath>
+#include <cstdlib>
+#include <vector>
+
+namespace vectorizer {
+namespace {
+
+// Converts the components of a sentiment vector to a scalar (v2s in v1)
+double to_scalar(const SentimentVector& v) {
+    // Adjust for base-sentiment
+    double base_sentiment = (v.magnitude == 0 && v.intensity != 1)
+        ? std::fabs(1 - v.intensity) : v.magnitude;
+
+    return std::atan(base_sentiment * v.polarity * v.intensity) * 0.636;
+}
+
+double effective_intensity(const SentimentVector& v) {
+    return (v.intensity >= 1) ? (v.intensity - 1) : (1 - v.intensity);
+}
+
+// Combines 2 sentiment vectors exactly as combine in v1
+SentimentVector combine(const SentimentVector& v1, const SentimentVector& v2) {
+    SentimentVector result;
+    double eff_intensity1 = effective_intensity(v1);
+    double eff_intensity2 = effective_intensity(v2);
+
+    result.intensity = (eff_intensity1 > eff_intensity2) ? v1.intensity : v2.intensity;
+
+    if (v1.polarity * v2.polarity == 1) {
+        // Same polarity
+        result.magnitude = v1.magnitude + v2.magnitude;
+        result.polarity = v1.polarity;
+    } else if (v1.polarity * v2.polarity == -1) {
+        // Opposite polarity
+        result.magnitude = std::abs(v1.magnitude) + std::abs(v2.magnitude);
+        if (v1.magnitude * v2.magnitude > 0) {
+            result.polarity = 1;
+        } else if (v1.magnitude * v2.magnitude < 0) {
+            result.polarity = -1;
+        } else {
+            result.polarity = (eff_intensity1 > eff_intensity2) ? v1.polarity : v2.polarity;
+        }
+    } else {
+        // One or both polarities are zero
+        result.magnitude = std::abs(v1.magnitude + v2.magnitude);
+        result.polarity = v1.polarity + v2.polarity;
+    }
+
+    return result;
+}
+
+// Adjusts the polarity for the number of negations in a clause
+int adjust_for_negations(int base_sentiment, int negation_count) {
+    if (negation_count == 0) {
+        return 1;
+    }
+
+    bool is_odd_negation = negation_count % 2 == 1;
+    if (base_sentiment > 0 && is_odd_negation) {
+        return -1;
+    } else if (base_sentiment < 0 && is_odd_negation) {
+        return 0;
+    } else if (base_sentiment == 0) {
+        return is_odd_negation ? -1 : 1;
+    }
+    return 1;
+}
+
+// Scores one clause, tokens [begin, end), as __score_clause in v1
+SentimentVector score_clause(const TokenTable& table, const int32_t* begin, const int32_t* end) {
+    int positive_count = 0;
+    int negative_count = 0;
+    int negation_count = 0;
+    double quantifier_multiplier = 1;
+    double diminisher_multiplier = 1;
+    bool previous_negated = false;
+
+    for (const int32_t* token = begin; token != end; ++token) {
+        size_t id = (*token > 0 && static_cast<size_t>(*token) < table.size) ? *token : 0;
+        int32_t flags = table.flags[id];
+
+        if (flags) {
+            positive_count += (flags & POSITIVE) != 0;
+            negative_count += (flags & NEGATIVE) != 0;
+            negation_count += (flags & NEGATION) != 0;
+
+            if (flags & QUANTIFIER) {
+                double value = table.quantifiers[id];
+                quantifier_multiplier *= previous_negated ? 1 - (value - 1) : value;
+            }
+            if (flags & DIMINISHER) {
+                double value = table.diminishers[id];
+                diminisher_multiplier *= previous_negated ? 1 + (1 - value) : value;
+            }
+        }
+
+        previous_negated = (flags & NEGATION) != 0;
+    }
+
+    int base_sentiment = positive_count - negative_count;
+    return {base_sentiment, adjust_for_negations(base_sentiment, negation_count),
+            quantifier_multiplier * diminisher_multiplier};
+}
+
+// Reduces the clause vectors pairwise, as a balanced tree (combine_reduce in
+// v1). The vectors are used as scratch space.
+SentimentVector reduce(std::vector<SentimentVector>& vectors) {
+    size_t n = vectors.size();
+    while (n > 1) {
+        size_t half = n / 2;
+        for (size_t k = 0; k < half; k++) {
+            vectors[k] = combine(vectors[2 * k], vectors[2 * k + 1]);
+        }
+        if (n % 2) {
+            vectors[half] = vectors[n - 1];
+        }
+        n = half + n % 2;
+    }
+    return vectors[0];
+}
+
+// Scores one sentence, tokens [begin, end): one clause per conjunction plus
+// one, the last possibly empty
+double score_sentence(const TokenTable& table, const int32_t* begin, const int32_t* end,
+                      std::vector<SentimentVector>& clauses) {
+    clauses.clear();
+    const int32_t* clause_begin = begin;
+
+    for (const int32_t* token = begin; token != end; ++token) {
+        size_t id = (*token > 0 && static_cast<size_t>(*token) < table.size) ? *token : 0;
+        if (table.flags[id] & CONJUNCTION) {
+            clauses.push_back(score_clause(table, clause_begin, token + 1));
+            clause_begin = token + 1;
+        }
+    }
+    clauses.push_back(score_clause(table, clause_begin, end));
+
+    return to_scalar(reduce(clauses));
+}
+
+}  // namespace
+}  // namespace vectorizer
+
+extern "C" long long score_documents(const int32_t* flags, const double* quantifiers,
+                                     const double* diminishers, size_t table_size,
+                                     const int32_t* token_ids, const long long* sentence_offsets,
+                                     size_t n_sentences, const long long* document_offsets,
+                                     size_t n_documents, double alpha, double beta,
+                                     double* scores, double* sentence_scores) {
+    using namespace vectorizer;
+
+    // ID 0 must exist: it is what unknown and out-of-range IDs resolve to
+    if (table_size == 0) {
+        return -1;
+    }
+    for (size_t k = 0; k < n_sentences; k++) {
+        if (sentence_offsets[k + 1] < sentence_offsets[k]) {
+            return -1;
+        }
+    }
+    for (size_t d = 0; d < n_documents; d++) {
+        if (document_offsets[d + 1] < document_offsets[d]
+                || static_cast<size_t>(document_offsets[d + 1]) > n_sentences) {
+            return -1;
+        }
+    }
+
+    TokenTable table = {flags, quantifiers, diminishers, table_size};
+    std::vector<SentimentVector> clauses;
+    long long scored = 0;
+
+    for (size_t d = 0; d < n_documents; d++) {
+        long long start = document_offsets[d];
+        long long end = document_offsets[d + 1];
+
+        if (start == end) {
+            scores[d] = 0; // Default value if no input
+            continue;
+        }
+
+        // Momentum-based reduction of the sentence scores, as momentum_batch in v1
+        double prev_score = 0;
+        double momentum = 0;
+
+        for (long long k = start; k < end; k++) {
+            double current_score = score_sentence(table, token_ids + sentence_offsets[k],
+                                                  token_ids + sentence_offsets[k + 1], clauses);
+            if (sentence_scores) {
+                sentence_scores[k] = current_score;
+            }
+
+            if (k == start) {
+                prev_score = current_score;
+            } else {
+                double sentiment_change = current_score - prev_score;
+                momentum = beta * momentum + (1 - beta) * sentiment_change;
+                prev_score = alpha * current_score + (1 - alpha) * (prev_score + momentum);
+            }
+            scored++;
+        }
+
+        scores[d] = prev_score;
+    }
+
+    return scored;
+}
@@ -1 +1,71 @@
-// C++ implementation for Sentiment Vectors
\ No newline at end of file
+// C++ implementation for Sentiment Vectors
+#ifndef VECTORIZER_V2_H
+#define VECTORIZER_V2_H
+
+#include <cstddef>
+#include <cstdint>
+
+namespace vectorizer {
+
+/**
+ * A 3-Dimensional representation of a sentiment, as in vectorizer/v1.
+ * - Magnitude: Represents the strength or weight of the sentiment.
+ * - Polarity: Indicates the direction of the sentiment (positive, negative, or neutral).
+ * - Intensity: Represents the degree of emphasis applied to the sentiment.
+ */
+struct SentimentVector {
+    int magnitude;
+    int polarity;
+    double intensity;
+};
+
+// Category flags of a token, as in SentimentAnalysis.lexicon
+enum Flags : int32_t {
+    POSITIVE = 1,
+    NEGATIVE = 2,
+    NEGATION = 4,
+    QUANTIFIER = 8,
+    DIMINISHER = 16,
+    CONJUNCTION = 32,
+};
+
+/**
+ * Per-lexicon token table. Token ID i has flags[i], quantifier weight
+ * quantifiers[i] and diminisher weight diminishers[i]; ID 0 is reserved for
+ * tokens that belong to no lexicon.
+ */
+struct TokenTable {
+    const int32_t* flags;
+    const double* quantifiers;
+    const double* diminishers;
+    size_t size;
+};
+
+}  // namespace vectorizer
+
+extern "C" {
+
+/**
+ * Scores whole documents given as token IDs, in a single call.
+ *
+ * Sentence k owns token_ids[sentence_offsets[k]] .. token_ids[sentence_offsets[k + 1] - 1]
+ * and document d owns sentences document_offsets[d] .. document_offsets[d + 1] - 1.
+ * Every sentence is split into clauses after each conjunction, the clause
+ * features are reduced pairwise as a balanced tree (combine_reduce in v1),
+ * and the sentence scores are reduced with the momentum-based algorithm.
+ *
+ * Token IDs outside the table are treated as ID 0. If sentence_scores is not
+ * NULL it receives the score of every sentence. Returns the number of
+ * sentences scored, or -1 if the table is empty or an offset array is
+ * decreasing or out of range.
+ */
+long long score_documents(const int32_t* flags, const double* quantifiers,
+                          const double* diminishers, size_t table_size,
+                          const int32_t* token_ids, const long long* sentence_offsets,
+                          size_t n_sentences, const long long* document_offsets,
+                          size_t n_documents, double alpha, double beta,
+                          double* scores, double* sentence_scores);
+
+}
+
+#endif
@@ -0,0 +1,122 @@
+import ctypes
+import os
+import platform
+import threading
+
+import numpy as np
+
+# Overrides the location of the shared library
+LIBRARY_ENV = "SENTIMENT_VECTORIZER_V2_LIBRARY"
+
+# Directory holding the per-platform builds of vectorizer.cpp
+_V2_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Arrays are handed to the library as raw addresses, after score_documents
+# made them C-contiguous with the native dtype. Checking them with ndpointer
+# argtypes would cost more than scoring a short message.
+_pointer = ctypes.c_void_p
+
+_instance = None
+_lock = threading.Lock()
+
+
+def default_library_path():
+    """
+    Returns the path of the prebuilt library for the current OS, resolved
+    relative to this package rather than the working directory.
+    """
+    if platform.system() == "Windows":
+        return os.path.join(_V2_DIR, "windows", "vectorizer.dll")
+    elif platform.system() == "Darwin":
+        return os.path.join(_V2_DIR, "macOS", "vectorizer.so")
+    elif platform.system() == "Linux":
+        return os.path.join(_V2_DIR, "linux", "vectorizer.so")
+    else:
+        raise OSError("Unsupported operating system")
+
+
+def _bind(v):
+    v.score_documents.restype = ctypes.c_longlong
+    v.score_documents.argtypes = [_pointer, _pointer, _pointer, ctypes.c_size_t,
+                                  _pointer, _pointer, ctypes.c_size_t,
+                                  _pointer, ctypes.c_size_t,
+                                  ctypes.c_double, ctypes.c_double,
+                                  _pointer, _pointer]
+
+
+class DocumentVectorizer:
+    """
+    Runs the whole v2 scoring pipeline (clause features, clause reduction,
+    v2s and the momentum-based reduction) in the compiled vectorizer.cpp
+    library, one call per batch of documents.
+    """
+
+    def __init__(self, library_path=None):
+        library_path = (library_path or os.environ.get(LIBRARY_ENV)
+                        or default_library_path())
+        try:
+            self.library = ctypes.CDLL(library_path)
+        except OSError as e:
+            raise OSError(f"Unable to load the v2 vectorizer library at "
+                          f"{library_path}: {e}") from e
+
+        try:
+            _bind(self.library)
+        except AttributeError as e:
+            raise OSError(f"The v2 vectorizer library at {library_path} is out of "
+                          f"date; rebuild it with python -m vectorizer.build ({e})") from e
+
+        self.library_path = library_path
+
+    def score_documents(self, table, token_ids, sentence_offsets, document_offsets,
+                        alpha=0.5, beta=0.5, sentence_scores=False):
+        """
+        Scores every document of a batch.
+
+        :param table: TokenTable the token IDs were encoded with.
+        :param token_ids: int32 array of the token IDs of every sentence, back
+                          to back.
+        :param sentence_offsets: Array of n_sentences + 1 boundaries into token_ids.
+        :param document_offsets: Array of n_documents + 1 boundaries into the
+                                 sentences.
+        :param sentence_scores: Also return the score of every sentence.
+        :return: float64 array of document scores, or (document scores,
+                 sentence scores) if sentence_scores is set.
+        """
+        token_ids = np.ascontiguousarray(token_ids, dtype=np.int32)
+        sentence_offsets = np.ascontiguousarray(sentence_offsets, dtype=np.longlong)
+        document_offsets = np.ascontiguousarray(document_offsets, dtype=np.longlong)
+
+        n_sentences = len(sentence_offsets) - 1
+        n_documents = len(document_offsets) - 1
+        scores = np.empty(n_documents, dtype=np.float64)
+        per_sentence = np.empty(n_sentences, dtype=np.float64) if sentence_scores else None
+
+        flags, quantifiers, diminishers = table.pointers
+        scored = self.library.score_documents(
+            flags, quantifiers, diminishers, len(table),
+            token_ids.ctypes.data, sentence_offsets.ctypes.data, n_sentences,
+            document_offsets.ctypes.data, n_documents, alpha, beta, scores.ctypes.data,
+            per_sentence.ctypes.data if sentence_scores else None)
+        if scored < 0:
+            raise ValueError("Invalid token table or offsets")
+
+        if sentence_scores:
+            return scores, per_sentence
+        return scores
+
+
+def load(library_path=None):
+    """
+    Returns the shared DocumentVectorizer, loading the library on first use.
+
+    :raises OSError: If the library is missing or out of date.
+    """
+    global _instance
+    if library_path is not None:
+        return DocumentVectorizer(library_path)
+
+    with _lock:
+        if _instance is None:
+            _instance = DocumentVectorizer()
+        return _instance